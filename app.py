@@ -2,103 +2,134 @@
 # Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
 # SPDX-License-Identifier: MIT-0
 import os
+import functools
 import aws_cdk as cdk
-from cdk_nag import AwsSolutionsChecks, NagSuppressions
+from constructs import Construct
+from cdk_nag import NagSuppressions
 
 from lib.pipeline_stack import PipelineStack
 from lib.empty_stack import EmptyStack
 from lib.code_commit_stack import CodeCommitStack
+from lib.endpoint_hub_stack import EndpointHubStack
 from lib.configuration import (
     ACCOUNT_ID, CODECOMMIT_MIRROR_REPOSITORY_NAME, DEPLOYMENT, DEV, TEST, PROD, REGION, CODE_BRANCH,
+    PIPELINE_TOPOLOGY, PIPELINE_TOPOLOGY_PER_ENVIRONMENT, PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT,
+    DEPLOY_WAVES, DEFAULT_DEPLOY_WAVES, ENDPOINT_HUB_VPC_CIDR,
     get_logical_id_prefix, get_all_configurations
 )
+from lib.stack_registry import StackRegistry
+from lib.nag_runner import apply_nag_checks
+from lib.profiling import start_profiling, synth_phase, write_profile_report
 from lib.tagging import tag
 
 app = cdk.App()
-
-# Enable CDK Nag for the Mirror repository, Pipeline, and related stacks
-# Environment stacks must be enabled on the Stage resource
-cdk.Aspects.of(app).add(AwsSolutionsChecks())
+start_profiling(app)
 
 if bool(os.environ.get('IS_BOOTSTRAP')):
     EmptyStack(app, 'StackStub')
 else:
-    raw_mappings = get_all_configurations()
+    with synth_phase('configuration'):
+        raw_mappings = get_all_configurations()
 
-    deployment_account = raw_mappings[DEPLOYMENT][ACCOUNT_ID]
-    deployment_region = raw_mappings[DEPLOYMENT][REGION]
-    deployment_aws_env = {
-        'account': deployment_account,
-        'region': deployment_region,
-    }
-    logical_id_prefix = get_logical_id_prefix()
+        deployment_account = raw_mappings[DEPLOYMENT][ACCOUNT_ID]
+        deployment_region = raw_mappings[DEPLOYMENT][REGION]
+        deployment_aws_env = {
+            'account': deployment_account,
+            'region': deployment_region,
+        }
+        logical_id_prefix = get_logical_id_prefix()
 
-    if raw_mappings[DEPLOYMENT][CODECOMMIT_MIRROR_REPOSITORY_NAME] != '':
+    def create_mirror_repository_stack(scope: Construct, construct_id: str) -> cdk.Stack:
         mirror_repository_stack = CodeCommitStack(
-            app,
-            f'{DEPLOYMENT}-{logical_id_prefix}InfrastructureMirrorRepository',
+            scope,
+            construct_id,
             description='InsuranceLake stack for Infrastructure repository mirror (SO9489) (uksb-1tu7mtee2)',
             target_environment=DEPLOYMENT,
             env=deployment_aws_env,
         )
         tag(mirror_repository_stack, DEPLOYMENT)
+        return mirror_repository_stack
 
-    if os.environ.get('ENV', DEV) == DEV:
-        target_environment = DEV
-        dev_account = raw_mappings[DEV][ACCOUNT_ID]
-        dev_region = raw_mappings[DEV][REGION]
-        dev_aws_env = {
-            'account': dev_account,
-            'region': dev_region,
-        }
-        dev_pipeline_stack = PipelineStack(
-            app,
-            f'{target_environment}-{logical_id_prefix}InfrastructurePipeline',
-            description=f'InsuranceLake stack for Infrastructure pipeline - {DEV} environment (SO9489) (uksb-1tu7mtee2)',
-            target_environment=DEV,
-            target_branch=raw_mappings[DEV][CODE_BRANCH],
-            target_aws_env=dev_aws_env,
-            env=deployment_aws_env,
+    def create_endpoint_hub_stack(scope: Construct, construct_id: str) -> cdk.Stack:
+        endpoint_hub_stack = EndpointHubStack(
+            scope,
+            construct_id,
+            description='InsuranceLake stack for shared VPC endpoint hub (SO9489) (uksb-1tu7mtee2)',
+            target_environment=DEPLOYMENT,
+            env=cdk.Environment(**deployment_aws_env),
         )
-        tag(dev_pipeline_stack, DEPLOYMENT)
-
-    if os.environ.get('ENV', TEST) == TEST:
-        target_environment = TEST
-        test_account = raw_mappings[TEST][ACCOUNT_ID]
-        test_region = raw_mappings[TEST][REGION]
-        test_aws_env = {
-            'account': test_account,
-            'region': test_region,
+        tag(endpoint_hub_stack, DEPLOYMENT)
+        return endpoint_hub_stack
+
+    def create_pipeline_stack(scope: Construct, construct_id: str, target_environment: str) -> cdk.Stack:
+        target_aws_env = {
+            'account': raw_mappings[target_environment][ACCOUNT_ID],
+            'region': raw_mappings[target_environment][REGION],
         }
-        test_pipeline_stack = PipelineStack(
-            app,
-            f'{target_environment}-{logical_id_prefix}InfrastructurePipeline',
-            description=f'InsuranceLake stack for Infrastructure pipeline - {TEST} environment (SO9489) (uksb-1tu7mtee2)',
-            target_environment=TEST,
-            target_branch=raw_mappings[TEST][CODE_BRANCH],
-            target_aws_env=test_aws_env,
+        pipeline_stack = PipelineStack(
+            scope,
+            construct_id,
+            description=f'InsuranceLake stack for Infrastructure pipeline - {target_environment} environment '
+                '(SO9489) (uksb-1tu7mtee2)',
+            target_environment=target_environment,
+            target_branch=raw_mappings[target_environment][CODE_BRANCH],
+            target_aws_env=target_aws_env,
             env=deployment_aws_env,
         )
-        tag(test_pipeline_stack, DEPLOYMENT)
-
-    if os.environ.get('ENV', PROD) == PROD:
-        target_environment = PROD
-        prod_account = raw_mappings[PROD][ACCOUNT_ID]
-        prod_region = raw_mappings[PROD][REGION]
-        prod_aws_env = {
-            'account': prod_account,
-            'region': prod_region,
-        }
-        prod_pipeline_stack = PipelineStack(
-            app,
-            f'{target_environment}-{logical_id_prefix}InfrastructurePipeline',
-            description=f'InsuranceLake stack for Infrastructure pipeline - {PROD} environment (SO9489) (uksb-1tu7mtee2)',
-            target_environment=PROD,
-            target_branch=raw_mappings[PROD][CODE_BRANCH],
-            target_aws_env=prod_aws_env,
+        tag(pipeline_stack, DEPLOYMENT)
+        return pipeline_stack
+
+    def create_multi_environment_pipeline_stack(scope: Construct, construct_id: str) -> cdk.Stack:
+        deploy_waves = raw_mappings[DEPLOYMENT].get(DEPLOY_WAVES, DEFAULT_DEPLOY_WAVES)
+        pipeline_stack = PipelineStack(
+            scope,
+            construct_id,
+            description='InsuranceLake stack for Infrastructure pipeline - all environments (SO9489) (uksb-1tu7mtee2)',
+            target_environment=DEPLOYMENT,
+            # Changes are promoted from the branch of the last environment
+            target_branch=raw_mappings[deploy_waves[-1][-1]][CODE_BRANCH],
+            target_aws_env=None,
+            deploy_waves=deploy_waves,
             env=deployment_aws_env,
         )
-        tag(prod_pipeline_stack, DEPLOYMENT)
+        tag(pipeline_stack, DEPLOYMENT)
+        return pipeline_stack
+
+    # Only construct stacks requested with -c stacks=<patterns> or STACKS=<patterns>;
+    # ENV=<environment> is still supported and selects that environment's pipeline
+    default_patterns = None
+    if 'ENV' in os.environ:
+        default_patterns = [ f'{os.environ["ENV"]}-*', f'{DEPLOYMENT}-*' ]
+    stack_registry = StackRegistry(app, default_patterns=default_patterns)
+
+    if raw_mappings[DEPLOYMENT][CODECOMMIT_MIRROR_REPOSITORY_NAME] != '':
+        stack_registry.register(
+            f'{DEPLOYMENT}-{logical_id_prefix}InfrastructureMirrorRepository',
+            create_mirror_repository_stack,
+        )
+
+    if raw_mappings[DEPLOYMENT].get(ENDPOINT_HUB_VPC_CIDR):
+        # Deploy the endpoint hub with cdk deploy before the pipelines of its spoke environments
+        stack_registry.register(
+            f'{DEPLOYMENT}-{logical_id_prefix}InfrastructureEndpointHub',
+            create_endpoint_hub_stack,
+        )
+
+    pipeline_topology = raw_mappings[DEPLOYMENT].get(PIPELINE_TOPOLOGY, PIPELINE_TOPOLOGY_PER_ENVIRONMENT)
+    if pipeline_topology == PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT:
+        # Single pipeline synthesizes once and deploys all environments in waves
+        stack_registry.register(
+            f'{DEPLOYMENT}-{logical_id_prefix}InfrastructurePipeline',
+            create_multi_environment_pipeline_stack,
+        )
+    else:
+        for target_environment in [ DEV, TEST, PROD ]:
+            stack_registry.register(
+                f'{target_environment}-{logical_id_prefix}InfrastructurePipeline',
+                functools.partial(create_pipeline_stack, target_environment=target_environment),
+            )
+
+    stack_registry.build()
 
     # TODO: Modify replication bucket to have access logs and key rotation
     # Apply tagging to cross-region support stacks
@@ -120,4 +151,12 @@ else:
                 },
             ], apply_to_children=True)
 
-app.synth()
\ No newline at end of file
+# Enable CDK Nag for the Mirror repository, Pipeline, and related stacks, limited to
+# stacks selected with -c nag_stacks=<patterns> or NAG_STACKS=<patterns>
+# Environment stacks must be enabled on the Stage resource
+apply_nag_checks(app)
+
+with synth_phase('synth'):
+    app.synth()
+
+write_profile_report(app.outdir)
\ No newline at end of file
@@ -1,6 +1,10 @@
 # Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
 # SPDX-License-Identifier: MIT-0
+import os
 import re
+import json
+from types import MappingProxyType
+from typing import Mapping
 import boto3
 
 # Environments (targeted at accounts)
@@ -26,12 +30,172 @@ VPC_CIDR = 'vpc_cidr'
 LOGICAL_ID_PREFIX = 'logical_id_prefix'
 RESOURCE_NAME_PREFIX = 'resource_name_prefix'
 CODE_BRANCH = 'code_branch'
+TEMPLATE_FINGERPRINT = 'template_fingerprint'
+CODEBUILD_CACHE = 'codebuild_cache'
+CDK_CLI_VERSION = 'cdk_cli_version'
+CODEBUILD_BUILD_PROFILES = 'codebuild_build_profiles'
+PUBLISH_ASSETS_IN_PARALLEL = 'publish_assets_in_parallel'
+STACK_DEPENDENCIES = 'stack_dependencies'
+MAX_STACK_PARALLELISM = 'max_stack_parallelism'
+PIPELINE_TOPOLOGY = 'pipeline_topology'
+DEPLOY_WAVES = 'deploy_waves'
+SOURCE_TRIGGER_FILE_PATHS = 'source_trigger_file_paths'
+SOURCE_TRIGGER_EXCLUDED_FILE_PATHS = 'source_trigger_excluded_file_paths'
+SOURCE_TRIGGER_TAGS = 'source_trigger_tags'
+PIPELINE_TYPE = 'pipeline_type'
+PIPELINE_EXECUTION_MODE = 'pipeline_execution_mode'
+PIPELINE_VARIABLES = 'pipeline_variables'
+S3_EXPRESS_ZONES = 's3_express_zones'
+S3_EXPRESS_AVAILABILITY_ZONE_ID = 's3_express_availability_zone_id'
+S3_EXPRESS_ENCRYPTION = 's3_express_encryption'
+BUCKET_TIERING = 'bucket_tiering'
+COLLECT_TRANSFER_ACCELERATION = 'collect_transfer_acceleration'
+COLLECT_MULTI_REGION_ACCESS_POINT = 'collect_multi_region_access_point'
+REPLICA_REGION = 'replica_region'
+REPLICATION_ZONES = 'replication_zones'
+REPLICATION_TIME_CONTROL = 'replication_time_control'
+S3_INVENTORY_FREQUENCY = 's3_inventory_frequency'
+S3_REQUEST_METRICS_PREFIXES = 's3_request_metrics_prefixes'
+VPC_TOPOLOGY = 'vpc_topology'
+VPC_INTERFACE_ENDPOINTS = 'vpc_interface_endpoints'
+VPC_ENDPOINT_POLICIES = 'vpc_endpoint_policies'
+S3_INTERFACE_ENDPOINT = 's3_interface_endpoint'
+S3_INTERFACE_ENDPOINT_CLIENT_CIDRS = 's3_interface_endpoint_client_cidrs'
+ENDPOINT_HUB_VPC_CIDR = 'endpoint_hub_vpc_cidr'
+ENDPOINT_HUB_TRANSIT_GATEWAY_ID = 'endpoint_hub_transit_gateway_id'
+ENDPOINT_HUB_ROUTE53_PROFILE_ID = 'endpoint_hub_route53_profile_id'
+
+# Supported CodeBuild cache types for the pipeline Synth step
+CODEBUILD_CACHE_LOCAL = 'local'
+CODEBUILD_CACHE_S3 = 's3'
+
+# CodePipeline types and execution modes; trigger filters, execution modes other than SUPERSEDED,
+# and pipeline variables require the V2 pipeline type
+PIPELINE_TYPE_V1 = 'V1'
+PIPELINE_TYPE_V2 = 'V2'
+PIPELINE_TYPES = [ PIPELINE_TYPE_V1, PIPELINE_TYPE_V2 ]
+PIPELINE_EXECUTION_MODES = [ 'SUPERSEDED', 'QUEUED', 'PARALLEL' ]
+
+# Pipeline topologies: one pipeline per environment, or a single pipeline that synthesizes once
+# and deploys the environments in waves (environments in the same wave deploy in parallel)
+PIPELINE_TOPOLOGY_PER_ENVIRONMENT = 'per_environment'
+PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT = 'multi_environment'
+PIPELINE_TOPOLOGIES = [ PIPELINE_TOPOLOGY_PER_ENVIRONMENT, PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT ]
+DEFAULT_DEPLOY_WAVES = [ [ DEV, TEST ], [ PROD ] ]
+
+# CodeBuild build profiles: pipeline actions that can have a profile, and the profile settings
+BUILD_PROFILE_DEFAULT = 'default'
+BUILD_PROFILE_SYNTH = 'synth'
+BUILD_PROFILE_SELF_MUTATION = 'self_mutation'
+BUILD_PROFILE_ASSET_PUBLISHING = 'asset_publishing'
+BUILD_PROFILE_ACTIONS = [
+    BUILD_PROFILE_DEFAULT, BUILD_PROFILE_SYNTH, BUILD_PROFILE_SELF_MUTATION, BUILD_PROFILE_ASSET_PUBLISHING ]
+BUILD_PROFILE_COMPUTE_TYPE = 'compute_type'
+BUILD_PROFILE_ARM = 'arm'
+# Lambda compute types start quickly but only provide Node.js (no Python, Docker or caching),
+# so they are limited to actions that only run the CDK CLI
+BUILD_PROFILE_COMPUTE_TYPES = [ 'SMALL', 'MEDIUM', 'LARGE', 'X_LARGE', 'X2_LARGE' ]
+BUILD_PROFILE_LAMBDA_COMPUTE_TYPES = [ 'LAMBDA_1GB', 'LAMBDA_2GB', 'LAMBDA_4GB', 'LAMBDA_8GB', 'LAMBDA_10GB' ]
+BUILD_PROFILE_LAMBDA_ACTIONS = [ BUILD_PROFILE_SELF_MUTATION, BUILD_PROFILE_ASSET_PUBLISHING ]
+
+# Data lake bucket zones
+BUCKET_ZONE_COLLECT = 'collect'
+BUCKET_ZONE_CLEANSE = 'cleanse'
+BUCKET_ZONE_CONSUME = 'consume'
+BUCKET_ZONES = [ BUCKET_ZONE_COLLECT, BUCKET_ZONE_CLEANSE, BUCKET_ZONE_CONSUME ]
+
+# Storage tiering policy settings of a data lake bucket zone: Intelligent-Tiering archive
+# configurations, lifecycle transitions and storage class analysis; each entry can be limited
+# to an object key prefix and object tags
+TIERING_INTELLIGENT_TIERING = 'intelligent_tiering'
+TIERING_TRANSITIONS = 'transitions'
+TIERING_STORAGE_CLASS_ANALYSIS = 'storage_class_analysis'
+TIERING_MINIMUM_OBJECT_SIZE = 'minimum_object_size'
+TIERING_SETTINGS = [
+    TIERING_INTELLIGENT_TIERING, TIERING_TRANSITIONS, TIERING_STORAGE_CLASS_ANALYSIS, TIERING_MINIMUM_OBJECT_SIZE ]
+TIERING_PREFIX = 'prefix'
+TIERING_TAGS = 'tags'
+TIERING_ARCHIVE_DAYS = 'archive_days'
+TIERING_DEEP_ARCHIVE_DAYS = 'deep_archive_days'
+TIERING_STORAGE_CLASS = 'storage_class'
+TIERING_DAYS = 'days'
+TIERING_STORAGE_CLASSES = [
+    'INFREQUENT_ACCESS', 'ONE_ZONE_INFREQUENT_ACCESS', 'INTELLIGENT_TIERING',
+    'GLACIER_INSTANT_RETRIEVAL', 'GLACIER', 'DEEP_ARCHIVE' ]
+# Transitions skip smaller objects by default: per-object transition requests and monitoring cost
+# more than the savings, and Intelligent-Tiering does not tier objects under 128 KB
+DEFAULT_TIERING_MINIMUM_OBJECT_SIZE = 128 * 1024
+
+# VPC topology settings: number of availability zones, CIDR mask per subnet tier, NAT strategy, and
+# IPv6 dual stack; the ETL resource stacks import the first 3 availability zones, subnets and route tables
+VPC_TOPOLOGY_AVAILABILITY_ZONES = 'availability_zones'
+VPC_TOPOLOGY_SUBNET_MASKS = 'subnet_masks'
+VPC_TOPOLOGY_NAT = 'nat'
+VPC_TOPOLOGY_NAT_INSTANCE_TYPE = 'nat_instance_type'
+VPC_TOPOLOGY_DUAL_STACK = 'dual_stack'
+VPC_TOPOLOGY_SETTINGS = [
+    VPC_TOPOLOGY_AVAILABILITY_ZONES, VPC_TOPOLOGY_SUBNET_MASKS, VPC_TOPOLOGY_NAT, VPC_TOPOLOGY_NAT_INSTANCE_TYPE,
+    VPC_TOPOLOGY_DUAL_STACK ]
+VPC_SUBNET_TIER_PUBLIC = 'public'
+VPC_SUBNET_TIER_PRIVATE = 'private'
+VPC_SUBNET_TIER_ISOLATED = 'isolated'
+VPC_SUBNET_TIERS = [ VPC_SUBNET_TIER_PUBLIC, VPC_SUBNET_TIER_PRIVATE, VPC_SUBNET_TIER_ISOLATED ]
+# Subnet CIDR masks supported by Amazon VPC
+VPC_SUBNET_MASK_RANGE = range(16, 29)
+# NAT strategies: a NAT gateway in each availability zone, one NAT gateway shared by all availability
+# zones, a NAT instance in each availability zone, or no NAT and no Internet access (isolated subnets only)
+VPC_NAT_PER_AZ = 'per_az'
+VPC_NAT_SHARED = 'shared'
+VPC_NAT_INSTANCE = 'instance'
+VPC_NAT_NONE = 'none'
+VPC_NAT_STRATEGIES = [ VPC_NAT_PER_AZ, VPC_NAT_SHARED, VPC_NAT_INSTANCE, VPC_NAT_NONE ]
+DEFAULT_VPC_AVAILABILITY_ZONES = 3
+# ETL resource stacks import the availability zone, subnet and route table exports of AZs 1 to 3
+MIN_VPC_AVAILABILITY_ZONES = 3
+DEFAULT_VPC_NAT_INSTANCE_TYPE = 't4g.small'
+
+# VPC endpoints by InterfaceVpcEndpointAwsService and GatewayVpcEndpointAwsService attribute name;
+# gateway endpoints are always created, interface endpoints are configurable per environment
+VPC_GATEWAY_ENDPOINTS = [ 'S3', 'DYNAMODB' ]
+DEFAULT_VPC_INTERFACE_ENDPOINTS = [ 'GLUE', 'KMS', 'SSM', 'SECRETS_MANAGER', 'STEP_FUNCTIONS' ]
+# Services called by Glue ETL jobs; interface endpoints keep this traffic off NAT
+VPC_ETL_INTERFACE_ENDPOINTS = DEFAULT_VPC_INTERFACE_ENDPOINTS + [
+    'CLOUDWATCH_LOGS', 'CLOUDWATCH_MONITORING', 'STS', 'ATHENA', 'LAKE_FORMATION',
+    'SNS', 'SQS', 'EVENTBRIDGE', 'ECR', 'ECR_DOCKER' ]
+# Interface endpoints hosted by the endpoint hub VPC if the Deploy environment does not specify them
+DEFAULT_ENDPOINT_HUB_INTERFACE_ENDPOINTS = VPC_ETL_INTERFACE_ENDPOINTS
+
+# Supported S3 Inventory report frequencies
+S3_INVENTORY_FREQUENCIES = [ 'DAILY', 'WEEKLY' ]
+
+# Supported default encryption for S3 Express One Zone directory buckets: the data lake KMS key,
+# or S3 managed keys
+S3_EXPRESS_ENCRYPTION_KMS = 'kms'
+S3_EXPRESS_ENCRYPTION_S3 = 's3'
+S3_EXPRESS_ENCRYPTIONS = [ S3_EXPRESS_ENCRYPTION_KMS, S3_EXPRESS_ENCRYPTION_S3 ]
+
+# Stacks in the pipeline deploy stage, used to configure explicit stack dependencies
+DEPLOY_STACK_VPC = 'vpc'
+DEPLOY_STACK_S3_BUCKET_ZONES = 's3_bucket_zones'
+DEPLOY_STACK_S3_REPLICA = 's3_replica'
+DEPLOY_STACKS = [ DEPLOY_STACK_VPC, DEPLOY_STACK_S3_BUCKET_ZONES, DEPLOY_STACK_S3_REPLICA ]
+
+# Zones replicated to the replica region by default
+DEFAULT_REPLICATION_ZONES = [ BUCKET_ZONE_CONSUME ]
 
 # Secrets Manager Inputs
+# GitHub personal access token with the repo and admin:repo_hook scopes; admin:repo_hook
+# allows CodePipeline to create the webhook that starts the pipeline on push
 GITHUB_TOKEN = 'github_token'
 
 # Used in Automated Outputs
 VPC_ID = 'vpc_id'
+# Output names of the nth (1-based) availability zone, subnet and route table of the VPC
+AVAILABILITY_ZONE_N = 'availability_zone_{}'
+SUBNET_ID_N = 'subnet_id_{}'
+ROUTE_TABLE_N = 'route_table_{}'
+SUBNET_IPV6_CIDR_N = 'subnet_ipv6_cidr_{}'
+VPC_IPV6_CIDR = 'vpc_ipv6_cidr'
 AVAILABILITY_ZONE_1 = 'availability_zone_1'
 AVAILABILITY_ZONE_2 = 'availability_zone_2'
 AVAILABILITY_ZONE_3 = 'availability_zone_3'
@@ -42,23 +206,134 @@ ROUTE_TABLE_1 = 'route_table_1'
 ROUTE_TABLE_2 = 'route_table_2'
 ROUTE_TABLE_3 = 'route_table_3'
 SHARED_SECURITY_GROUP_ID = 'shared_security_group_id'
+S3_INTERFACE_ENDPOINT_ID = 's3_interface_endpoint_id'
+S3_INTERFACE_ENDPOINT_DNS_NAME = 's3_interface_endpoint_dns_name'
+S3_INTERFACE_ENDPOINT_DNS_ENTRIES = 's3_interface_endpoint_dns_entries'
 S3_KMS_KEY = 's3_kms_key'
 S3_ACCESS_LOG_BUCKET = 's3_access_log_bucket'
 S3_RAW_BUCKET = 's3_raw_bucket'
 S3_CONFORMED_BUCKET = 's3_conformed_bucket'
 S3_PURPOSE_BUILT_BUCKET = 's3_purpose_built_bucket'
+S3_EXPRESS_RAW_BUCKET = 's3_express_raw_bucket'
+S3_EXPRESS_CONFORMED_BUCKET = 's3_express_conformed_bucket'
+S3_EXPRESS_PURPOSE_BUILT_BUCKET = 's3_express_purpose_built_bucket'
+S3_RAW_BUCKET_ACCELERATED_ENDPOINT = 's3_raw_bucket_accelerated_endpoint'
+S3_RAW_BUCKET_MULTI_REGION_ACCESS_POINT = 's3_raw_bucket_multi_region_access_point'
+S3_REPLICA_KMS_KEY = 's3_replica_kms_key'
+S3_REPLICA_CONFORMED_BUCKET = 's3_replica_conformed_bucket'
+S3_REPLICA_PURPOSE_BUILT_BUCKET = 's3_replica_purpose_built_bucket'
+# Exported by the endpoint hub stack; configure the values as ENDPOINT_HUB_TRANSIT_GATEWAY_ID and
+# ENDPOINT_HUB_ROUTE53_PROFILE_ID of the spoke environments
+ENDPOINT_HUB_TRANSIT_GATEWAY = 'endpoint_hub_transit_gateway'
+ENDPOINT_HUB_ROUTE53_PROFILE = 'endpoint_hub_route53_profile'
 
 MAX_S3_BUCKET_NAME_LENGTH = 63
 
-def get_local_configuration(environment: str, local_mapping: dict = None) -> dict:
+# Offline synth: set this environment variable to a JSON file path, or to inline JSON, that maps
+# each environment to its account_id (and optionally region), e.g.
+# {"Deploy": {"account_id": "111111111111"}, "Dev": {"account_id": "222222222222", "region": "us-east-1"}}
+# The Deploy account replaces the STS lookup of the active account, so no boto3 client is created.
+# To use a local stand-in for STS instead, leave this unset and set AWS_ENDPOINT_URL_STS.
+ACCOUNT_MANIFEST_ENVIRONMENT_VARIABLE = 'ACCOUNT_MANIFEST'
+ACCOUNT_MANIFEST_KEYS = [ ACCOUNT_ID, REGION ]
+
+# Process-wide cache of resolved configuration values, so that a full synth calls STS
+# and validates the local mapping only once; use clear_configuration_cache() to reset
+_configuration_cache = {}
+_ACTIVE_ACCOUNT_ID_CACHE_KEY = 'active_account_id'
+_LOCAL_MAPPING_CACHE_KEY = 'local_mapping'
+_ACCOUNT_MANIFEST_CACHE_KEY = 'account_manifest'
+
+
+def clear_configuration_cache():
+    """Invalidates the process-wide configuration cache and the tag tables built from it.
+    The next configuration request will resolve the active account and rebuild the local
+    mapping snapshot.
+    """
+    # Imported here because the tagging module imports this module
+    from .tagging import clear_tag_cache
+
+    _configuration_cache.clear()
+    clear_tag_cache()
+
+
+def get_account_manifest() -> Mapping:
+    """Returns the offline account manifest from the ACCOUNT_MANIFEST environment variable,
+    which holds either inline JSON or a path to a JSON file
+
+    Raises
+    ------
+    AttributeError
+        If the manifest is not a mapping of environments to account_id and region values
+
+    Returns
+    -------
+    Mapping
+        Read-only account and region overrides keyed by environment; empty if not configured
+    """
+    if _ACCOUNT_MANIFEST_CACHE_KEY not in _configuration_cache:
+        manifest = {}
+        manifest_source = os.environ.get(ACCOUNT_MANIFEST_ENVIRONMENT_VARIABLE, '').strip()
+        if manifest_source.startswith('{'):
+            manifest = json.loads(manifest_source)
+        elif manifest_source:
+            with open(manifest_source, encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+
+        if not isinstance(manifest, dict):
+            raise AttributeError(f'Account manifest {manifest_source} must map environments to account settings')
+        for each_env, each_config in manifest.items():
+            if not isinstance(each_config, dict) or set(each_config) - set(ACCOUNT_MANIFEST_KEYS):
+                raise AttributeError(f'Account manifest entry for {each_env} may only contain '
+                    f'the keys {ACCOUNT_MANIFEST_KEYS}')
+
+        _configuration_cache[_ACCOUNT_MANIFEST_CACHE_KEY] = MappingProxyType({
+            each_env: MappingProxyType(dict(each_config))
+            for each_env, each_config in manifest.items()
+        })
+
+    return _configuration_cache[_ACCOUNT_MANIFEST_CACHE_KEY]
+
+
+def get_active_account_id() -> str:
+    """Returns the AWS account ID of the active credentials, calling STS at most once per process.
+    When an account manifest is configured, the Deploy account from the manifest is used and
+    STS is never called.
+
+    Raises
+    ------
+    AttributeError
+        If an account manifest is configured without a Deploy account_id
+
+    Returns
+    -------
+    str
+        AWS account ID of the active credentials
+    """
+    if _ACTIVE_ACCOUNT_ID_CACHE_KEY not in _configuration_cache:
+        account_manifest = get_account_manifest()
+        if account_manifest:
+            if ACCOUNT_ID not in account_manifest.get(DEPLOYMENT, {}):
+                raise AttributeError(f'Account manifest must specify {ACCOUNT_ID} for the {DEPLOYMENT} '
+                    'environment to synthesize without credentials')
+            _configuration_cache[_ACTIVE_ACCOUNT_ID_CACHE_KEY] = account_manifest[DEPLOYMENT][ACCOUNT_ID]
+        else:
+            _configuration_cache[_ACTIVE_ACCOUNT_ID_CACHE_KEY] = \
+                boto3.client('sts').get_caller_identity()['Account']
+
+    return _configuration_cache[_ACTIVE_ACCOUNT_ID_CACHE_KEY]
+
+
+def get_local_configuration(environment: str, local_mapping: dict = None) -> Mapping:
     """Provides manually configured variables that are validated for quality and safety.
+    The embedded local_mapping is validated once and cached as an immutable snapshot.
 
     Parameters
     ----------
     environment
         The environment used to retrieve corresponding configuration
     local_mapping: optional
-        Optional override the embedded local_mapping; used for testing
+        Optional override the embedded local_mapping; used for testing (bypasses the cache)
 
     Raises
     ------
@@ -66,73 +341,259 @@ def get_local_configuration(environment: str, local_mapping: dict = None) -> dic
         If the resource_name_prefix does not conform or if the requested
         environment does not exist
 
+    Returns
+    -------
+    Mapping
+        Read-only configuration for the requested environment
+    """
+    if local_mapping is None:
+        if _LOCAL_MAPPING_CACHE_KEY not in _configuration_cache:
+            embedded_local_mapping = apply_account_manifest(get_embedded_local_mapping(), get_account_manifest())
+            validate_local_mapping(embedded_local_mapping)
+            _configuration_cache[_LOCAL_MAPPING_CACHE_KEY] = MappingProxyType({
+                each_env: MappingProxyType(dict(each_config))
+                for each_env, each_config in embedded_local_mapping.items()
+            })
+        local_mapping = _configuration_cache[_LOCAL_MAPPING_CACHE_KEY]
+    else:
+        validate_local_mapping(local_mapping)
+
+    if environment not in local_mapping:
+        raise AttributeError(f'The requested environment: {environment} does not exist in local mappings')
+
+    return local_mapping[environment]
+
+
+def get_embedded_local_mapping() -> dict:
+    """Provides the manually configured variables for all environments (edit this mapping)
+
     Returns
     -------
     dict
-        Configuration for the requested environment
+        Configuration for all environments, before validation
     """
-    active_account_id = boto3.client("sts").get_caller_identity()["Account"]
+    active_account_id = get_active_account_id()
 
-    if local_mapping is None:
-        local_mapping = {
-            DEPLOYMENT: {
-                ACCOUNT_ID: active_account_id,
-                REGION: 'us-east-2',
-
-                # If you use GitHub / GitHub Enterprise, this will be the organization name
-                GITHUB_REPOSITORY_OWNER_NAME: '',
-
-                # Leave empty if you do not use Github (use your forked Github repo here!)
-                GITHUB_REPOSITORY_NAME: '',
-
-                # If you use Bitbucket Cloud or any other supported Codestar provider, specify the
-                # Codestar connection ARN
-                CODESTAR_CONNECTION_ARN: '',
-
-                # Codestar repository owner or workspace name if using Bitbucket Cloud
-                CODESTAR_REPOSITORY_OWNER_NAME: '',
-
-                # Leave empty if you do not use Codestar
-                CODESTAR_REPOSITORY_NAME: '',
-
-                # Use only if your repository is already in CodecCommit, otherwise leave empty!
-                # Use your CodeCommit repo name here
-                CODECOMMIT_REPOSITORY_NAME: '',
-
-                # Use only if you do NOT use Github or CodeCommit and need to mirror your repository
-                # Name your CodeCommit mirror repo here (recommend matching your external repo)
-                # Leave empty if you use Github or your repository is in CodeCommit already
-                CODECOMMIT_MIRROR_REPOSITORY_NAME: 'aws-insurancelake-infrastructure',
-
-                # This is used in the Logical Id of CloudFormation resources.
-                # We recommend Capital case for consistency, e.g. DataLakeCdkBlog
-                LOGICAL_ID_PREFIX: 'InsuranceLake',
-
-                # Important: This is used as a prefix for resources that must be **globally** unique!
-                # Resource names may only contain alphanumeric characters, hyphens, and cannot contain trailing hyphens.
-                # S3 bucket names from this application must be under the 63 character bucket name limit
-                RESOURCE_NAME_PREFIX: 'insurancelake',
-            },
-            DEV: {
-                ACCOUNT_ID: active_account_id,
-                REGION: 'us-east-2',
-                # VPC_CIDR: '10.20.0.0/24',
-                CODE_BRANCH: 'develop',
-            },
-            TEST: {
-                ACCOUNT_ID: active_account_id,
-                REGION: 'us-east-2',
-                # VPC_CIDR: '10.10.0.0/24',
-                CODE_BRANCH: 'test',
-            },
-            PROD: {
-                ACCOUNT_ID: active_account_id,
-                REGION: 'us-east-2',
-                # VPC_CIDR: '10.0.0.0/24',
-                CODE_BRANCH: 'main',
-            }
+    return {
+        DEPLOYMENT: {
+            ACCOUNT_ID: active_account_id,
+            REGION: 'us-east-2',
+
+            # If you use GitHub / GitHub Enterprise, this will be the organization name
+            GITHUB_REPOSITORY_OWNER_NAME: '',
+
+            # Leave empty if you do not use Github (use your forked Github repo here!)
+            GITHUB_REPOSITORY_NAME: '',
+
+            # If you use Bitbucket Cloud or any other supported Codestar provider, specify the
+            # Codestar connection ARN
+            CODESTAR_CONNECTION_ARN: '',
+
+            # Codestar repository owner or workspace name if using Bitbucket Cloud
+            CODESTAR_REPOSITORY_OWNER_NAME: '',
+
+            # Leave empty if you do not use Codestar
+            CODESTAR_REPOSITORY_NAME: '',
+
+            # Codestar only: start the pipeline only for pushes that change matching files (glob
+            # syntax, e.g. 'lib/**'); requires and enables the V2 pipeline type
+            # SOURCE_TRIGGER_FILE_PATHS: [ 'app.py', 'cdk.json', 'requirements.txt', 'lib/**' ],
+            # SOURCE_TRIGGER_EXCLUDED_FILE_PATHS: [ '**/*.md', 'test/**' ],
+            # Codestar only: also start the pipeline for pushed git tags that match (glob syntax)
+            # SOURCE_TRIGGER_TAGS: [ 'release-*' ],
+
+            # Use only if your repository is already in CodecCommit, otherwise leave empty!
+            # Use your CodeCommit repo name here
+            CODECOMMIT_REPOSITORY_NAME: '',
+
+            # Use only if you do NOT use Github or CodeCommit and need to mirror your repository
+            # Name your CodeCommit mirror repo here (recommend matching your external repo)
+            # Leave empty if you use Github or your repository is in CodeCommit already
+            CODECOMMIT_MIRROR_REPOSITORY_NAME: 'aws-insurancelake-infrastructure',
+
+            # This is used in the Logical Id of CloudFormation resources.
+            # We recommend Capital case for consistency, e.g. DataLakeCdkBlog
+            LOGICAL_ID_PREFIX: 'InsuranceLake',
+
+            # Important: This is used as a prefix for resources that must be **globally** unique!
+            # Resource names may only contain alphanumeric characters, hyphens, and cannot contain trailing hyphens.
+            # S3 bucket names from this application must be under the 63 character bucket name limit
+            RESOURCE_NAME_PREFIX: 'insurancelake',
+
+            # Use a single pipeline for all environments instead of one pipeline per environment;
+            # the pipeline follows the code branch of the last environment and uses the pipeline
+            # settings (e.g. CODEBUILD_CACHE) of this environment
+            # PIPELINE_TOPOLOGY: PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT,
+            # DEPLOY_WAVES: [ [ DEV, TEST ], [ PROD ] ],
+
+            # Create an endpoint hub stack in this account and region with centralized interface
+            # endpoints (VPC_INTERFACE_ENDPOINTS, default VPC_ETL_INTERFACE_ENDPOINTS), Route 53
+            # private hosted zones shared through a Route 53 Profile, and a Transit Gateway for the
+            # environment VPCs in the same region; deploy it with cdk deploy before the pipelines,
+            # then configure the environments as spokes with the stack outputs
+            # ENDPOINT_HUB_VPC_CIDR: '10.255.0.0/24',
+        },
+        DEV: {
+            ACCOUNT_ID: active_account_id,
+            REGION: 'us-east-2',
+            # VPC_CIDR: '10.20.0.0/24',
+            CODE_BRANCH: 'develop',
+            # Skip the deploy stage when no stack template or asset changed since the last deployment
+            # TEMPLATE_FINGERPRINT: True,
+            # Cache npm and pip downloads in the Synth step: CODEBUILD_CACHE_LOCAL or CODEBUILD_CACHE_S3
+            # CODEBUILD_CACHE: CODEBUILD_CACHE_LOCAL,
+            # Pin the CDK CLI version installed by the Synth step and used by the pipeline
+            # CDK_CLI_VERSION: '2.1000.0',
+            # CodeBuild compute type and architecture for all build actions (default) or specific actions
+            # CODEBUILD_BUILD_PROFILES: {
+            #     BUILD_PROFILE_DEFAULT: { BUILD_PROFILE_ARM: True },
+            #     BUILD_PROFILE_SYNTH: { BUILD_PROFILE_COMPUTE_TYPE: 'LARGE', BUILD_PROFILE_ARM: True },
+            #     BUILD_PROFILE_SELF_MUTATION: { BUILD_PROFILE_COMPUTE_TYPE: 'LAMBDA_2GB' },
+            #     BUILD_PROFILE_ASSET_PUBLISHING: { BUILD_PROFILE_COMPUTE_TYPE: 'LAMBDA_2GB' },
+            # },
+            # Independent stacks deploy concurrently; add explicit dependencies (stack: [ stacks it
+            # depends on ]) and limit the number of stacks deployed at the same time
+            # STACK_DEPENDENCIES: { DEPLOY_STACK_S3_BUCKET_ZONES: [ DEPLOY_STACK_VPC ] },
+            # MAX_STACK_PARALLELISM: 1,
+            # Publish assets in one CodeBuild action per asset (default) or a single action
+            # PUBLISH_ASSETS_IN_PARALLEL: False,
+            # CodePipeline type (PIPELINE_TYPE_V1 or PIPELINE_TYPE_V2); V2 is used automatically when
+            # a setting requires it
+            # PIPELINE_TYPE: PIPELINE_TYPE_V2,
+            # Run executions for a burst of commits one after another (QUEUED) or concurrently
+            # (PARALLEL) instead of cancelling waiting executions (SUPERSEDED, the default)
+            # PIPELINE_EXECUTION_MODE: 'QUEUED',
+            # Pipeline variables and default values, passed to the Synth step as environment variables
+            # and overridable when starting the pipeline manually, e.g. to limit CDK Nag checks
+            # PIPELINE_VARIABLES: { 'NAG_STACKS': '*' },
+            # Create an S3 Express One Zone directory bucket for low latency access next to these zones'
+            # buckets; use the availability zone ID (not name) of one of the VPC availability zones
+            # S3_EXPRESS_ZONES: [ BUCKET_ZONE_CLEANSE ],
+            # S3_EXPRESS_AVAILABILITY_ZONE_ID: 'use2-az1',
+            # Directory bucket default encryption: S3_EXPRESS_ENCRYPTION_KMS (default) or S3_EXPRESS_ENCRYPTION_S3
+            # S3_EXPRESS_ENCRYPTION: S3_EXPRESS_ENCRYPTION_KMS,
+            # Speed up long distance uploads to the Collect bucket with S3 Transfer Acceleration, and/or
+            # create a Multi-Region Access Point for it (clients must sign requests with SigV4A)
+            # COLLECT_TRANSFER_ACCELERATION: True,
+            # COLLECT_MULTI_REGION_ACCESS_POINT: True,
+            # Replicate the Consume (and optionally Cleanse) bucket to replica buckets in another region
+            # with Replication Time Control (default) and re-encryption with a replica region KMS key;
+            # bootstrap the replica region for the environment account first
+            # REPLICA_REGION: 'us-west-2',
+            # REPLICATION_ZONES: [ BUCKET_ZONE_CLEANSE, BUCKET_ZONE_CONSUME ],
+            # REPLICATION_TIME_CONTROL: True,
+            # Write a Parquet S3 Inventory report of each data lake bucket to the access logs bucket
+            # (inventory/ prefix), e.g. to find partitions with many small files: 'DAILY' or 'WEEKLY'
+            # S3_INVENTORY_FREQUENCY: 'WEEKLY',
+            # Publish CloudWatch request metrics (billed per metric) for these prefixes of each data
+            # lake bucket; use '' for the entire bucket
+            # S3_REQUEST_METRICS_PREFIXES: [ '', 'claims/' ],
+            # Storage tiering per bucket zone; transitions replace the default Prod Glacier transition
+            # BUCKET_TIERING: {
+            #     BUCKET_ZONE_CLEANSE: {
+            #         TIERING_INTELLIGENT_TIERING: [ { TIERING_ARCHIVE_DAYS: 90, TIERING_DEEP_ARCHIVE_DAYS: 180 } ],
+            #         TIERING_TRANSITIONS: [
+            #             { TIERING_STORAGE_CLASS: 'INTELLIGENT_TIERING', TIERING_DAYS: 0 },
+            #             {
+            #                 TIERING_STORAGE_CLASS: 'GLACIER', TIERING_DAYS: 365,
+            #                 TIERING_TAGS: { 'retention': 'archive' },
+            #             },
+            #         ],
+            #         TIERING_MINIMUM_OBJECT_SIZE: 131072,
+            #         TIERING_STORAGE_CLASS_ANALYSIS: [ { TIERING_PREFIX: 'claims/' } ],
+            #     },
+            # },
+            # VPC topology: availability zones, subnet CIDR masks per tier (subnets without a mask share
+            # the remaining space), and NAT strategy (VPC_NAT_PER_AZ, VPC_NAT_SHARED, VPC_NAT_INSTANCE,
+            # or VPC_NAT_NONE for isolated subnets only); size private subnets for Glue job DPUs
+            # VPC_TOPOLOGY: {
+            #     VPC_TOPOLOGY_AVAILABILITY_ZONES: 3,
+            #     VPC_TOPOLOGY_SUBNET_MASKS: { VPC_SUBNET_TIER_PUBLIC: 28, VPC_SUBNET_TIER_PRIVATE: 20 },
+            #     VPC_TOPOLOGY_NAT: VPC_NAT_SHARED,
+            #     # Add an Amazon-provided IPv6 CIDR and a /64 to each subnet; private subnets send IPv6
+            #     # traffic through an egress-only internet gateway instead of NAT
+            #     VPC_TOPOLOGY_DUAL_STACK: True,
+            # },
+            # Interface endpoints to create (each costs an ENI per availability zone), e.g. all services
+            # called by Glue ETL jobs, and optional endpoint policy statements (IAM JSON) per endpoint
+            # VPC_INTERFACE_ENDPOINTS: VPC_ETL_INTERFACE_ENDPOINTS,
+            # VPC_ENDPOINT_POLICIES: {
+            #     'SQS': [ {
+            #         'Effect': 'Allow',
+            #         'Principal': { 'AWS': '*' },
+            #         'Action': [ 'sqs:*' ],
+            #         'Resource': [ f'arn:aws:sqs:us-east-2:{active_account_id}:*' ],
+            #     } ],
+            # },
+            # Add an S3 interface endpoint (PrivateLink) for on-premises and peered VPC clients, e.g.
+            # uploads to the Collect bucket; private DNS answers only queries through a Route 53
+            # inbound resolver endpoint, so resources in the VPC keep using the S3 gateway endpoint
+            # S3_INTERFACE_ENDPOINT: True,
+            # S3_INTERFACE_ENDPOINT_CLIENT_CIDRS: [ '192.168.0.0/16' ],
+            # Use the endpoint hub interface endpoints instead of creating them in this VPC (spoke mode);
+            # use the Transit Gateway and Route 53 Profile IDs from the endpoint hub stack outputs
+            # ENDPOINT_HUB_TRANSIT_GATEWAY_ID: 'tgw-0123456789abcdef0',
+            # ENDPOINT_HUB_ROUTE53_PROFILE_ID: 'rp-0123456789abcdef',
+        },
+        TEST: {
+            ACCOUNT_ID: active_account_id,
+            REGION: 'us-east-2',
+            # VPC_CIDR: '10.10.0.0/24',
+            CODE_BRANCH: 'test',
+        },
+        PROD: {
+            ACCOUNT_ID: active_account_id,
+            REGION: 'us-east-2',
+            # VPC_CIDR: '10.0.0.0/24',
+            CODE_BRANCH: 'main',
         }
+    }
+
+
+def apply_account_manifest(local_mapping: dict, account_manifest: Mapping) -> dict:
+    """Overrides account and region values in the local mapping with the offline account manifest
+
+    Parameters
+    ----------
+    local_mapping
+        Configuration for all environments
+    account_manifest
+        Account and region overrides keyed by environment
 
+    Raises
+    ------
+    AttributeError
+        If the account manifest references an environment that does not exist in local mappings
+
+    Returns
+    -------
+    dict
+        Configuration for all environments with manifest values applied
+    """
+    for each_env in account_manifest:
+        if each_env not in local_mapping:
+            raise AttributeError(f'Account manifest environment: {each_env} does not exist in local mappings')
+
+    return {
+        each_env: { **each_config, **account_manifest.get(each_env, {}) }
+        for each_env, each_config in local_mapping.items()
+    }
+
+
+def validate_local_mapping(local_mapping: dict):
+    """Validates manually configured variables for quality and safety
+
+    Parameters
+    ----------
+    local_mapping
+        Configuration for all environments
+
+    Raises
+    ------
+    AttributeError
+        If the resource_name_prefix does not conform, the pipeline topology or deploy waves are invalid,
+        or an endpoint hub spoke is missing endpoint hub settings
+    """
     resource_prefix = local_mapping[DEPLOYMENT][RESOURCE_NAME_PREFIX]
     if (
         not re.fullmatch('^[a-z0-9-]+', resource_prefix)
@@ -141,18 +602,35 @@ def get_local_configuration(environment: str, local_mapping: dict = None) -> dic
         raise AttributeError('Resource names may only contain lowercase alphanumeric and hyphens '
                         'and cannot contain leading or trailing hyphens')
 
-    for each_env in local_mapping:
-        longest_bucket_name = \
-            f'{each_env}-{resource_prefix}-{local_mapping[each_env][ACCOUNT_ID]}-{local_mapping[each_env][REGION]}-access-logs'
-        if len(longest_bucket_name) > MAX_S3_BUCKET_NAME_LENGTH:
-            raise AttributeError('Resource name prefix is too long; at least one S3 bucket name '
-                        f'would exceed maximum allowed length of {MAX_S3_BUCKET_NAME_LENGTH} '
-                        f'characters, e.g. {longest_bucket_name}')
-
-    if environment not in local_mapping:
-        raise AttributeError(f'The requested environment: {environment} does not exist in local mappings')
+    pipeline_topology = local_mapping[DEPLOYMENT].get(PIPELINE_TOPOLOGY, PIPELINE_TOPOLOGY_PER_ENVIRONMENT)
+    if pipeline_topology not in PIPELINE_TOPOLOGIES:
+        raise AttributeError(f'Pipeline topology {pipeline_topology} is not one of {PIPELINE_TOPOLOGIES}')
+    if pipeline_topology == PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT:
+        deploy_waves = local_mapping[DEPLOYMENT].get(DEPLOY_WAVES, DEFAULT_DEPLOY_WAVES)
+        wave_environments = [ environment for wave in deploy_waves for environment in wave ]
+        if not wave_environments or any(
+            environment not in local_mapping or environment == DEPLOYMENT for environment in wave_environments
+        ) or len(set(wave_environments)) != len(wave_environments):
+            raise AttributeError(f'Deploy waves {deploy_waves} must list each target environment at most once')
 
-    return local_mapping[environment]
+    for each_env in local_mapping:
+        if local_mapping[each_env].get(ENDPOINT_HUB_TRANSIT_GATEWAY_ID):
+            if not local_mapping[DEPLOYMENT].get(ENDPOINT_HUB_VPC_CIDR) \
+                    or local_mapping[each_env][REGION] != local_mapping[DEPLOYMENT][REGION]:
+                raise AttributeError(f'Endpoint hub spoke {each_env} requires {ENDPOINT_HUB_VPC_CIDR} in the '
+                    f'{DEPLOYMENT} environment and the same region as the endpoint hub')
+            if not local_mapping[each_env].get(ENDPOINT_HUB_ROUTE53_PROFILE_ID):
+                raise AttributeError(f'Endpoint hub spoke {each_env} requires {ENDPOINT_HUB_ROUTE53_PROFILE_ID}')
+
+        for each_region in [ local_mapping[each_env][REGION], local_mapping[each_env].get(REPLICA_REGION) ]:
+            if not each_region:
+                continue
+            longest_bucket_name = \
+                f'{each_env}-{resource_prefix}-{local_mapping[each_env][ACCOUNT_ID]}-{each_region}-access-logs'
+            if len(longest_bucket_name) > MAX_S3_BUCKET_NAME_LENGTH:
+                raise AttributeError('Resource name prefix is too long; at least one S3 bucket name '
+                            f'would exceed maximum allowed length of {MAX_S3_BUCKET_NAME_LENGTH} '
+                            f'characters, e.g. {longest_bucket_name}')
 
 
 def get_environment_configuration(environment: str, local_mapping: dict = None) -> dict:
@@ -170,27 +648,43 @@ def get_environment_configuration(environment: str, local_mapping: dict = None)
     dict
         Combined configuration and Cloudformation output names for target environment
     """
+    local_configuration = get_local_configuration(environment, local_mapping = local_mapping)
+    availability_zones = get_vpc_topology(local_configuration)[VPC_TOPOLOGY_AVAILABILITY_ZONES]
+
     cloudformation_output_mapping = {
         ENVIRONMENT: f'{environment}',
         VPC_ID: f'{environment}VpcId',
-        AVAILABILITY_ZONE_1: f'{environment}AvailabilityZone1',
-        AVAILABILITY_ZONE_2: f'{environment}AvailabilityZone2',
-        AVAILABILITY_ZONE_3: f'{environment}AvailabilityZone3',
-        SUBNET_ID_1: f'{environment}SubnetId1',
-        SUBNET_ID_2: f'{environment}SubnetId2',
-        SUBNET_ID_3: f'{environment}SubnetId3',
-        ROUTE_TABLE_1: f'{environment}RouteTable1',
-        ROUTE_TABLE_2: f'{environment}RouteTable2',
-        ROUTE_TABLE_3: f'{environment}RouteTable3',
+        VPC_IPV6_CIDR: f'{environment}VpcIpv6Cidr',
         SHARED_SECURITY_GROUP_ID: f'{environment}SharedSecurityGroupId',
+        S3_INTERFACE_ENDPOINT_ID: f'{environment}S3InterfaceEndpointId',
+        S3_INTERFACE_ENDPOINT_DNS_NAME: f'{environment}S3InterfaceEndpointDnsName',
+        S3_INTERFACE_ENDPOINT_DNS_ENTRIES: f'{environment}S3InterfaceEndpointDnsEntries',
         S3_KMS_KEY: f'{environment}S3KmsKeyArn',
         S3_ACCESS_LOG_BUCKET: f'{environment}S3AccessLogBucket',
         S3_RAW_BUCKET: f'{environment}CollectBucketName',
         S3_CONFORMED_BUCKET: f'{environment}CleanseBucketName',
         S3_PURPOSE_BUILT_BUCKET: f'{environment}ConsumeBucketName',
+        S3_EXPRESS_RAW_BUCKET: f'{environment}CollectExpressBucketName',
+        S3_EXPRESS_CONFORMED_BUCKET: f'{environment}CleanseExpressBucketName',
+        S3_EXPRESS_PURPOSE_BUILT_BUCKET: f'{environment}ConsumeExpressBucketName',
+        S3_RAW_BUCKET_ACCELERATED_ENDPOINT: f'{environment}CollectBucketAcceleratedEndpoint',
+        S3_RAW_BUCKET_MULTI_REGION_ACCESS_POINT: f'{environment}CollectMultiRegionAccessPointArn',
+        # Exported in the replica region
+        S3_REPLICA_KMS_KEY: f'{environment}ReplicaS3KmsKeyArn',
+        S3_REPLICA_CONFORMED_BUCKET: f'{environment}ReplicaCleanseBucketName',
+        S3_REPLICA_PURPOSE_BUILT_BUCKET: f'{environment}ReplicaConsumeBucketName',
+        ENDPOINT_HUB_TRANSIT_GATEWAY: f'{environment}EndpointHubTransitGatewayId',
+        ENDPOINT_HUB_ROUTE53_PROFILE: f'{environment}EndpointHubRoute53ProfileId',
     }
+    for az_number in range(1, availability_zones + 1):
+        cloudformation_output_mapping.update({
+            AVAILABILITY_ZONE_N.format(az_number): f'{environment}AvailabilityZone{az_number}',
+            SUBNET_ID_N.format(az_number): f'{environment}SubnetId{az_number}',
+            ROUTE_TABLE_N.format(az_number): f'{environment}RouteTable{az_number}',
+            SUBNET_IPV6_CIDR_N.format(az_number): f'{environment}SubnetIpv6Cidr{az_number}',
+        })
 
-    return {**cloudformation_output_mapping, **get_local_configuration(environment, local_mapping = local_mapping)}
+    return {**cloudformation_output_mapping, **local_configuration}
 
 
 def get_all_configurations() -> dict:
@@ -215,6 +709,146 @@ def get_all_configurations() -> dict:
     }
 
 
+def get_build_profile(environment_configuration: Mapping, action: str) -> dict:
+    """Returns the CodeBuild build profile for a pipeline action, combining the default
+    profile and the action profile of the environment
+
+    Parameters
+    ----------
+    environment_configuration
+        Configuration of the pipeline target environment
+    action
+        Pipeline action, one of BUILD_PROFILE_ACTIONS
+
+    Raises
+    ------
+    AttributeError
+        If the build profiles contain unknown actions, settings or compute types, or
+        a Lambda compute type is used for an action that requires the standard image
+
+    Returns
+    -------
+    dict
+        Build profile with compute_type (None for the CodeBuild default) and arm settings
+    """
+    build_profiles = environment_configuration.get(CODEBUILD_BUILD_PROFILES, {})
+    for each_action, each_profile in build_profiles.items():
+        if each_action not in BUILD_PROFILE_ACTIONS:
+            raise AttributeError(f'Build profile action {each_action} is not one of {BUILD_PROFILE_ACTIONS}')
+        if set(each_profile) - { BUILD_PROFILE_COMPUTE_TYPE, BUILD_PROFILE_ARM }:
+            raise AttributeError(f'Build profile for {each_action} may only contain the keys '
+                f'{[ BUILD_PROFILE_COMPUTE_TYPE, BUILD_PROFILE_ARM ]}')
+
+    build_profile = {
+        BUILD_PROFILE_COMPUTE_TYPE: None,
+        BUILD_PROFILE_ARM: False,
+        **build_profiles.get(BUILD_PROFILE_DEFAULT, {}),
+        **build_profiles.get(action, {}),
+    }
+
+    compute_type = build_profile[BUILD_PROFILE_COMPUTE_TYPE]
+    if compute_type in BUILD_PROFILE_LAMBDA_COMPUTE_TYPES:
+        if action not in BUILD_PROFILE_LAMBDA_ACTIONS:
+            raise AttributeError(f'Lambda compute type {compute_type} is only supported for '
+                f'{BUILD_PROFILE_LAMBDA_ACTIONS} build actions, not {action}')
+    elif compute_type is not None and compute_type not in BUILD_PROFILE_COMPUTE_TYPES:
+        raise AttributeError(f'Build profile compute type {compute_type} is not one of '
+            f'{BUILD_PROFILE_COMPUTE_TYPES + BUILD_PROFILE_LAMBDA_COMPUTE_TYPES}')
+
+    return build_profile
+
+
+def get_bucket_tiering(environment_configuration: Mapping, zone: str) -> dict:
+    """Returns the storage tiering policy of a data lake bucket zone in the environment
+
+    Parameters
+    ----------
+    environment_configuration
+        Configuration of the target environment
+    zone
+        Data lake bucket zone, one of BUCKET_ZONES
+
+    Raises
+    ------
+    AttributeError
+        If the tiering policies contain unknown zones, settings or storage classes, or a
+        transition without days
+
+    Returns
+    -------
+    dict
+        Tiering policy with intelligent_tiering, transitions, storage_class_analysis and
+        minimum_object_size settings
+    """
+    bucket_tiering = environment_configuration.get(BUCKET_TIERING, {})
+    for each_zone, each_policy in bucket_tiering.items():
+        if each_zone not in BUCKET_ZONES:
+            raise AttributeError(f'Bucket tiering zone {each_zone} is not one of {BUCKET_ZONES}')
+        if set(each_policy) - set(TIERING_SETTINGS):
+            raise AttributeError(f'Bucket tiering for {each_zone} may only contain the keys {TIERING_SETTINGS}')
+        for transition in each_policy.get(TIERING_TRANSITIONS, []):
+            if transition.get(TIERING_STORAGE_CLASS) not in TIERING_STORAGE_CLASSES:
+                raise AttributeError(f'Bucket tiering transition storage class {transition.get(TIERING_STORAGE_CLASS)} '
+                    f'for {each_zone} is not one of {TIERING_STORAGE_CLASSES}')
+            if TIERING_DAYS not in transition:
+                raise AttributeError(f'Bucket tiering transitions for {each_zone} must specify {TIERING_DAYS}')
+
+    return {
+        TIERING_INTELLIGENT_TIERING: [],
+        TIERING_TRANSITIONS: [],
+        TIERING_STORAGE_CLASS_ANALYSIS: [],
+        TIERING_MINIMUM_OBJECT_SIZE: DEFAULT_TIERING_MINIMUM_OBJECT_SIZE,
+        **bucket_tiering.get(zone, {}),
+    }
+
+
+def get_vpc_topology(environment_configuration: Mapping) -> dict:
+    """Returns the VPC topology of the environment with defaults for settings that are not configured
+
+    Parameters
+    ----------
+    environment_configuration
+        Configuration of the target environment
+
+    Raises
+    ------
+    AttributeError
+        If the topology contains unknown settings, subnet tiers or NAT strategies, subnet masks
+        outside the range supported by Amazon VPC, or less than MIN_VPC_AVAILABILITY_ZONES
+        availability zones
+
+    Returns
+    -------
+    dict
+        VPC topology with availability_zones, subnet_masks, nat, nat_instance_type and dual_stack settings
+    """
+    vpc_topology = {
+        VPC_TOPOLOGY_AVAILABILITY_ZONES: DEFAULT_VPC_AVAILABILITY_ZONES,
+        VPC_TOPOLOGY_SUBNET_MASKS: {},
+        VPC_TOPOLOGY_NAT: VPC_NAT_PER_AZ,
+        VPC_TOPOLOGY_NAT_INSTANCE_TYPE: DEFAULT_VPC_NAT_INSTANCE_TYPE,
+        VPC_TOPOLOGY_DUAL_STACK: False,
+        **environment_configuration.get(VPC_TOPOLOGY, {}),
+    }
+    if set(vpc_topology) - set(VPC_TOPOLOGY_SETTINGS):
+        raise AttributeError(f'VPC topology may only contain the keys {VPC_TOPOLOGY_SETTINGS}')
+    if not isinstance(vpc_topology[VPC_TOPOLOGY_AVAILABILITY_ZONES], int) \
+            or vpc_topology[VPC_TOPOLOGY_AVAILABILITY_ZONES] < MIN_VPC_AVAILABILITY_ZONES:
+        raise AttributeError(f'VPC topology {VPC_TOPOLOGY_AVAILABILITY_ZONES} must be at least '
+            f'{MIN_VPC_AVAILABILITY_ZONES} because the ETL resource stacks import the subnets of '
+            f'{MIN_VPC_AVAILABILITY_ZONES} availability zones')
+    if vpc_topology[VPC_TOPOLOGY_NAT] not in VPC_NAT_STRATEGIES:
+        raise AttributeError(f'VPC NAT strategy {vpc_topology[VPC_TOPOLOGY_NAT]} is not one of {VPC_NAT_STRATEGIES}')
+    for each_tier, each_mask in vpc_topology[VPC_TOPOLOGY_SUBNET_MASKS].items():
+        if each_tier not in VPC_SUBNET_TIERS:
+            raise AttributeError(f'VPC subnet tier {each_tier} is not one of {VPC_SUBNET_TIERS}')
+        if each_mask not in VPC_SUBNET_MASK_RANGE:
+            raise AttributeError(f'VPC subnet mask {each_mask} for {each_tier} must be between '
+                f'{VPC_SUBNET_MASK_RANGE.start} and {VPC_SUBNET_MASK_RANGE.stop - 1}')
+
+    return vpc_topology
+
+
 def get_logical_id_prefix() -> str:
     """Returns the logical id prefix to apply to all CloudFormation resources
 
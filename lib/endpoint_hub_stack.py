@@ -0,0 +1,265 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import ipaddress
+import aws_cdk as cdk
+from constructs import Construct
+import aws_cdk.aws_ec2 as ec2
+import aws_cdk.aws_iam as iam
+import aws_cdk.aws_logs as logs
+import aws_cdk.aws_ram as ram
+import aws_cdk.aws_route53 as route53
+import aws_cdk.aws_route53_targets as route53_targets
+import aws_cdk.aws_route53profiles as route53profiles
+
+from .configuration import (
+    ACCOUNT_ID, REGION, VPC_CIDR, DEV, TEST, PROD, ENDPOINT_HUB_VPC_CIDR, VPC_INTERFACE_ENDPOINTS,
+    VPC_ENDPOINT_POLICIES, VPC_TOPOLOGY_AVAILABILITY_ZONES, DEFAULT_ENDPOINT_HUB_INTERFACE_ENDPOINTS,
+    ENDPOINT_HUB_TRANSIT_GATEWAY, ENDPOINT_HUB_ROUTE53_PROFILE,
+    get_all_configurations, get_environment_configuration, get_logical_id_prefix, get_resource_name_prefix,
+    get_vpc_topology
+)
+
+
+class EndpointHubStack(cdk.Stack):
+
+    def __init__(
+            self, scope: Construct, construct_id: str,
+            target_environment: str, env: cdk.Environment,
+            **kwargs
+        ):
+        """CloudFormation stack to create an endpoint hub VPC with centralized interface endpoints,
+        Route 53 private hosted zones for the endpoint service names shared through a Route 53 Profile,
+        and a Transit Gateway that attaches the environment (spoke) VPCs
+
+        Parameters
+        ----------
+        scope
+            Parent of this stack, usually an App or a Stage, but could be any construct
+        construct_id
+            The construct ID of this stack; if stackName is not explicitly defined,
+            this ID (and any parent IDs) will be used to determine the physical ID of the stack
+        target_environment
+            The environment that hosts the endpoint hub, usually the Deploy environment
+        env
+            AWS environment definition (account, region) to pass to stacks
+        kwargs: optional
+            Optional keyword arguments to pass up to parent Stack class
+
+        Raises
+        ------
+        AttributeError
+            If an environment VPC CIDR overlaps with the endpoint hub VPC CIDR
+        """
+        super().__init__(scope, construct_id, env=env, **kwargs)
+
+        self.target_environment = target_environment
+        all_mappings = get_all_configurations()
+        self.mappings = get_environment_configuration(target_environment)
+        self.logical_id_prefix = get_logical_id_prefix()
+        self.resource_name_prefix = get_resource_name_prefix()
+        hub_cidr = self.mappings[ENDPOINT_HUB_VPC_CIDR]
+
+        # Spokes are the environment VPCs in the hub region; Transit Gateway attachments are regional
+        self.spoke_mappings = {
+            environment: all_mappings[environment]
+            for environment in [ DEV, TEST, PROD ]
+            if VPC_CIDR in all_mappings[environment] and all_mappings[environment][REGION] == self.mappings[REGION]
+        }
+        for environment, spoke_mapping in self.spoke_mappings.items():
+            if ipaddress.ip_network(spoke_mapping[VPC_CIDR]).overlaps(ipaddress.ip_network(hub_cidr)):
+                raise AttributeError(f'{environment} VPC CIDR {spoke_mapping[VPC_CIDR]} overlaps with '
+                    f'endpoint hub VPC CIDR {hub_cidr}')
+        spoke_cidrs = sorted({ spoke_mapping[VPC_CIDR] for spoke_mapping in self.spoke_mappings.values() })
+
+        self.vpc = ec2.Vpc(
+            self,
+            f'{self.logical_id_prefix}EndpointHubVpc',
+            vpc_name=f'{target_environment}{self.logical_id_prefix}EndpointHubVpc',
+            ip_addresses=ec2.IpAddresses.cidr(hub_cidr),
+            max_azs=get_vpc_topology(self.mappings)[VPC_TOPOLOGY_AVAILABILITY_ZONES],
+            nat_gateways=0,
+            subnet_configuration=[
+                ec2.SubnetConfiguration(name='Endpoints', subnet_type=ec2.SubnetType.PRIVATE_ISOLATED),
+            ],
+        )
+
+        cloudwatch_flow_log_group = logs.LogGroup(
+            self,
+            f'{target_environment}{self.logical_id_prefix}EndpointHubVpcFlowLogGroup',
+            removal_policy=cdk.RemovalPolicy.RETAIN,
+            retention=logs.RetentionDays.SIX_MONTHS,
+        )
+        self.vpc.add_flow_log(
+            f'{target_environment}{self.logical_id_prefix}EndpointHubVpcFlowLog',
+            destination=ec2.FlowLogDestination.to_cloud_watch_logs(cloudwatch_flow_log_group),
+            traffic_type=ec2.FlowLogTrafficType.ALL,
+        )
+
+        self.endpoint_security_group = ec2.SecurityGroup(
+            self,
+            f'{target_environment}{self.logical_id_prefix}EndpointHubSecurityGroup',
+            vpc=self.vpc,
+            description='Endpoint hub interface endpoint access from the hub and spoke VPCs.',
+            allow_all_outbound=False,
+        )
+        for client_cidr in [ hub_cidr, *spoke_cidrs ]:
+            self.endpoint_security_group.add_ingress_rule(
+                peer=ec2.Peer.ipv4(client_cidr),
+                connection=ec2.Port.tcp(443),
+                description=f'HTTPS from {client_cidr}',
+            )
+
+        self.route53_profile = route53profiles.CfnProfile(
+            self,
+            f'{target_environment}{self.logical_id_prefix}EndpointHubRoute53Profile',
+            name=f'{self.resource_name_prefix}-endpoint-hub',
+        )
+        self.add_hub_endpoints()
+
+        self.transit_gateway = ec2.CfnTransitGateway(
+            self,
+            f'{target_environment}{self.logical_id_prefix}EndpointHubTransitGateway',
+            description=f'{self.logical_id_prefix} endpoint hub for environment VPCs',
+            auto_accept_shared_attachments='enable',
+            default_route_table_association='enable',
+            default_route_table_propagation='enable',
+            dns_support='enable',
+        )
+        self.add_hub_attachment(spoke_cidrs)
+        self.share_with_spoke_accounts()
+        self.add_cloudformation_exports()
+
+
+    def add_hub_endpoints(self):
+        """Adds the configured interface endpoints without private DNS, and for each endpoint a
+        Route 53 private hosted zone for the service DNS name (and its subdomains) that is added
+        to the Route 53 Profile, so that spoke VPCs resolve the service name to the hub endpoint
+
+        Raises
+        ------
+        AttributeError
+            If an interface endpoint or endpoint policy refers to an unsupported service
+        """
+        interface_endpoints = self.mappings.get(VPC_INTERFACE_ENDPOINTS, DEFAULT_ENDPOINT_HUB_INTERFACE_ENDPOINTS)
+        endpoint_policies = self.mappings.get(VPC_ENDPOINT_POLICIES, {})
+        for service_name in [ *interface_endpoints, *endpoint_policies ]:
+            if service_name not in interface_endpoints \
+                    or not hasattr(ec2.InterfaceVpcEndpointAwsService, service_name):
+                raise AttributeError(f'Endpoint hub service {service_name} is not a configured '
+                    'InterfaceVpcEndpointAwsService')
+
+        self.vpc_endpoints = {}
+        for service_name in interface_endpoints:
+            service = getattr(ec2.InterfaceVpcEndpointAwsService, service_name)
+            pascal_service_name = service_name.title().replace('_', '')
+            endpoint = self.vpc.add_interface_endpoint(
+                f'{self.target_environment}{self.logical_id_prefix}{pascal_service_name}Endpoint',
+                service=service,
+                security_groups=[self.endpoint_security_group],
+                private_dns_enabled=False,
+            )
+            for policy_statement in endpoint_policies.get(service_name, []):
+                endpoint.add_to_policy(iam.PolicyStatement.from_json(policy_statement))
+            self.vpc_endpoints[service_name] = endpoint
+
+            # Service short names are reversed DNS labels, e.g. ecr.dkr is dkr.ecr.<region>.amazonaws.com
+            zone_name = '.'.join([ *reversed(service.short_name.split('.')), self.region, self.url_suffix ])
+            hosted_zone = route53.PrivateHostedZone(
+                self,
+                f'{self.target_environment}{self.logical_id_prefix}{pascal_service_name}HostedZone',
+                zone_name=zone_name,
+                vpc=self.vpc,
+                comment=f'Endpoint hub private DNS for {service_name}',
+            )
+            for record_name in [ None, '*' ]:
+                route53.ARecord(
+                    self,
+                    f'{self.target_environment}{self.logical_id_prefix}{pascal_service_name}'
+                        f'{"Wildcard" if record_name else ""}Record',
+                    zone=hosted_zone,
+                    record_name=record_name,
+                    target=route53.RecordTarget.from_alias(route53_targets.InterfaceVpcEndpointTarget(endpoint)),
+                )
+            route53profiles.CfnProfileResourceAssociation(
+                self,
+                f'{self.target_environment}{self.logical_id_prefix}{pascal_service_name}ProfileAssociation',
+                name=f'{self.resource_name_prefix}-{service.short_name.replace(".", "-")}',
+                profile_id=self.route53_profile.attr_id,
+                resource_arn=hosted_zone.hosted_zone_arn,
+            )
+
+
+    def add_hub_attachment(self, spoke_cidrs: list):
+        """Attaches the hub VPC to the Transit Gateway and routes spoke VPC traffic through it
+
+        Parameters
+        ----------
+        spoke_cidrs
+            CIDR blocks of the spoke VPCs
+        """
+        hub_attachment = ec2.CfnTransitGatewayAttachment(
+            self,
+            f'{self.target_environment}{self.logical_id_prefix}EndpointHubAttachment',
+            transit_gateway_id=self.transit_gateway.ref,
+            vpc_id=self.vpc.vpc_id,
+            subnet_ids=[ subnet.subnet_id for subnet in self.vpc.isolated_subnets ],
+        )
+        for subnet_number, subnet in enumerate(self.vpc.isolated_subnets, start=1):
+            for spoke_number, spoke_cidr in enumerate(spoke_cidrs, start=1):
+                route = ec2.CfnRoute(
+                    self,
+                    f'{self.target_environment}{self.logical_id_prefix}EndpointHubSpoke{spoke_number}'
+                        f'Route{subnet_number}',
+                    route_table_id=subnet.route_table.route_table_id,
+                    destination_cidr_block=spoke_cidr,
+                    transit_gateway_id=self.transit_gateway.ref,
+                )
+                route.add_dependency(hub_attachment)
+
+
+    def share_with_spoke_accounts(self):
+        """Shares the Transit Gateway and Route 53 Profile with spoke accounts other than the hub
+        account through AWS RAM; the accounts must be in the same AWS Organization
+        """
+        spoke_accounts = sorted({
+            spoke_mapping[ACCOUNT_ID] for spoke_mapping in self.spoke_mappings.values()
+            if spoke_mapping[ACCOUNT_ID] != self.mappings[ACCOUNT_ID]
+        })
+        if not spoke_accounts:
+            return
+
+        ram.CfnResourceShare(
+            self,
+            f'{self.target_environment}{self.logical_id_prefix}EndpointHubResourceShare',
+            name=f'{self.resource_name_prefix}-endpoint-hub',
+            allow_external_principals=False,
+            principals=spoke_accounts,
+            resource_arns=[
+                self.format_arn(
+                    service='ec2',
+                    resource='transit-gateway',
+                    resource_name=self.transit_gateway.ref,
+                ),
+                self.route53_profile.attr_arn,
+            ],
+        )
+
+
+    def add_cloudformation_exports(self):
+        """Add Cloudformation exports to Endpoint Hub Stack
+        Spoke environments in other accounts cannot import these values; configure them in the
+        spoke environment instead
+        """
+        cdk.CfnOutput(
+            self,
+            f'{self.target_environment}{self.logical_id_prefix}EndpointHubTransitGatewayId',
+            value=self.transit_gateway.ref,
+            export_name=self.mappings[ENDPOINT_HUB_TRANSIT_GATEWAY],
+        )
+
+        cdk.CfnOutput(
+            self,
+            f'{self.target_environment}{self.logical_id_prefix}EndpointHubRoute53ProfileId',
+            value=self.route53_profile.attr_id,
+            export_name=self.mappings[ENDPOINT_HUB_ROUTE53_PROFILE],
+        )
\ No newline at end of file
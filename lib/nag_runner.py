@@ -0,0 +1,233 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+"""Scoped CDK Nag execution with a result cache.
+
+Limit CDK Nag to selected stacks during any synth with -c nag_stacks=<patterns> or NAG_STACKS=<patterns>
+(an empty value disables CDK Nag). Run the cached nag runner instead of cdk synth to skip the CDK Nag
+rule walk for stacks whose synthesized template has not changed since the last run:
+    python3 -m lib.nag_runner --outdir cdk.out
+
+CDK Nag must be added as an aspect before synth, so the runner cannot decide which stacks to check
+from the templates of the same synth. It synthesizes the app once without CDK Nag to hash the
+templates, and on a cache miss synthesizes again with CDK Nag scoped to the changed stacks. The
+second synth uses the stack registry selection so only the top-level stacks that contain a changed
+stack are constructed. A cache miss therefore costs one full synth without CDK Nag plus a partial
+synth with CDK Nag; a change to a stage stack still constructs its whole pipeline stack.
+"""
+import os
+import sys
+import json
+import shlex
+import hashlib
+import argparse
+import tempfile
+from fnmatch import fnmatchcase
+import aws_cdk as cdk
+from constructs import Construct
+from cdk_nag import AwsSolutionsChecks
+
+from .profiling import profiled_aspect
+from .stack_registry import STACK_SELECTION_CONTEXT_KEY, STACK_SELECTION_ENVIRONMENT_VARIABLE
+from .synth_driver import run_app
+from .template_fingerprint import get_stack_artifacts
+
+NAG_STACKS_CONTEXT_KEY = 'nag_stacks'
+NAG_STACKS_ENVIRONMENT_VARIABLE = 'NAG_STACKS'
+NAG_CACHE_FILE = '.nag-cache.json'
+NAG_RULE_PACK_PREFIX = 'AwsSolutions-'
+NAG_FINDING_LEVELS = {
+    'aws:cdk:error': 'error',
+    'aws:cdk:warning': 'warning',
+}
+
+
+def get_nag_selection(scope: Construct) -> list:
+    """Returns the stack patterns CDK Nag should check, from CDK context or the environment
+
+    Parameters
+    ----------
+    scope
+        Construct used to read CDK context
+
+    Returns
+    -------
+    list
+        Stack path or stack name patterns (fnmatch syntax), empty to disable CDK Nag,
+        or None to check all stacks
+    """
+    selection = scope.node.try_get_context(NAG_STACKS_CONTEXT_KEY)
+    if selection is None:
+        selection = os.environ.get(NAG_STACKS_ENVIRONMENT_VARIABLE)
+    if selection is None:
+        return None
+
+    if isinstance(selection, str):
+        selection = selection.split(',')
+    return [ pattern.strip() for pattern in selection if pattern.strip() ]
+
+
+def apply_nag_checks(scope: Construct) -> list:
+    """Adds CDK Nag AwsSolutionsChecks to each selected stack directly under the scope.
+    Call after the stacks are created; aspects do not cross Stage boundaries, so call it
+    for the App and for each Stage.
+
+    Parameters
+    ----------
+    scope
+        App or Stage containing the stacks to check
+
+    Returns
+    -------
+    list
+        Stacks that CDK Nag will check
+    """
+    patterns = get_nag_selection(scope)
+    selected_stacks = []
+    for child in scope.node.children:
+        if not cdk.Stack.is_stack(child):
+            continue
+        if patterns is None or any(
+            fnmatchcase(child.node.path, pattern) or fnmatchcase(child.stack_name, pattern)
+            for pattern in patterns
+        ):
+            cdk.Aspects.of(child).add(profiled_aspect(AwsSolutionsChecks(), 'cdk-nag'))
+            selected_stacks.append(child)
+
+    return selected_stacks
+
+
+def get_template_hashes(assembly_dir: str) -> dict:
+    """Returns a SHA-256 hash of each synthesized stack template in a cloud assembly
+
+    Returns
+    -------
+    dict
+        Template hash keyed by stack display name
+    """
+    template_hashes = {}
+    for stack_name, (stack_assembly_dir, artifact) in get_stack_artifacts(assembly_dir).items():
+        with open(os.path.join(stack_assembly_dir, artifact['properties']['templateFile']), 'rb') as template:
+            template_hashes[stack_name] = hashlib.sha256(template.read()).hexdigest()
+
+    return template_hashes
+
+
+def get_nag_findings(assembly_dir: str) -> dict:
+    """Returns the CDK Nag errors and warnings recorded in a cloud assembly
+
+    Returns
+    -------
+    dict
+        List of findings (level, path, message) keyed by stack display name
+    """
+    findings = {}
+    for stack_name, (stack_assembly_dir, artifact) in get_stack_artifacts(assembly_dir).items():
+        metadata = artifact.get('metadata', {})
+        if 'additionalMetadataFile' in artifact:
+            with open(os.path.join(stack_assembly_dir, artifact['additionalMetadataFile']), encoding='utf-8') \
+                    as metadata_file:
+                metadata = { **metadata, **json.load(metadata_file) }
+
+        findings[stack_name] = [
+            {
+                'level': NAG_FINDING_LEVELS[entry['type']],
+                'path': construct_path,
+                'message': entry['data'],
+            }
+            for construct_path, entries in metadata.items()
+            for entry in entries
+            if entry['type'] in NAG_FINDING_LEVELS
+                and isinstance(entry['data'], str) and entry['data'].startswith(NAG_RULE_PACK_PREFIX)
+        ]
+
+    return findings
+
+
+def run_cached_nag(app_command: list, context: dict, outdir: str, cache_path: str) -> dict:
+    """Synthesizes the app without CDK Nag, then synthesizes only the stacks whose template
+    hash is not in the cache with CDK Nag and updates the cache
+
+    Parameters
+    ----------
+    app_command
+        Command and arguments that run the CDK app
+    context
+        CDK context passed to the app
+    outdir
+        Cloud assembly output directory
+    cache_path
+        Path of the JSON file that stores findings keyed by stack name and template hash
+
+    Returns
+    -------
+    dict
+        List of findings keyed by stack display name for all stacks in the app
+    """
+    run_app(app_command, { **context, NAG_STACKS_CONTEXT_KEY: '' }, outdir,
+        unset_variables=[ NAG_STACKS_ENVIRONMENT_VARIABLE ])
+    template_hashes = get_template_hashes(outdir)
+
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding='utf-8') as cache_file:
+            cache = json.load(cache_file)
+
+    cache_keys = {
+        stack_name: f'{stack_name}:{template_hash}'
+        for stack_name, template_hash in template_hashes.items()
+    }
+    changed_stacks = [ stack_name for stack_name, cache_key in cache_keys.items() if cache_key not in cache ]
+    if changed_stacks:
+        # Stack registry patterns select the top-level stack that contains a stage stack
+        nag_context = {
+            **context,
+            NAG_STACKS_CONTEXT_KEY: ','.join(changed_stacks),
+            STACK_SELECTION_CONTEXT_KEY: ','.join(changed_stacks),
+        }
+        with tempfile.TemporaryDirectory(prefix='nag-runner-') as nag_outdir:
+            run_app(app_command, nag_context, nag_outdir,
+                unset_variables=[ NAG_STACKS_ENVIRONMENT_VARIABLE, STACK_SELECTION_ENVIRONMENT_VARIABLE ])
+            new_findings = get_nag_findings(nag_outdir)
+        for stack_name in changed_stacks:
+            cache[cache_keys[stack_name]] = new_findings.get(stack_name, [])
+
+    # Drop results for previous templates of the synthesized stacks so the cache does not grow
+    # unbounded; keep results for stacks that were not selected in this run
+    current_cache_keys = set(cache_keys.values())
+    cache = {
+        cache_key: stack_findings for cache_key, stack_findings in cache.items()
+        if cache_key in current_cache_keys or cache_key.rsplit(':', 1)[0] not in cache_keys
+    }
+    with open(cache_path, 'w', encoding='utf-8') as cache_file:
+        json.dump(cache, cache_file, indent=2, sort_keys=True)
+
+    return { stack_name: cache[cache_key] for stack_name, cache_key in cache_keys.items() }
+
+
+def main(argv: list = None) -> int:
+    """Runs cached CDK Nag checks and prints findings; returns 1 if any errors are found
+    """
+    parser = argparse.ArgumentParser(description='Synthesize app.py and run CDK Nag only for changed stacks')
+    parser.add_argument('--outdir', default=os.environ.get('CDK_OUTDIR', 'cdk.out'),
+        help='Cloud assembly output directory (default: CDK_OUTDIR or cdk.out)')
+    parser.add_argument('--app', default=f'{sys.executable} app.py',
+        help='Command that runs the CDK app (default: current Python interpreter with app.py)')
+    parser.add_argument('--cache', default=NAG_CACHE_FILE,
+        help=f'CDK Nag result cache file (default: {NAG_CACHE_FILE})')
+    args = parser.parse_args(argv)
+
+    context = json.loads(os.environ.get('CDK_CONTEXT_JSON', '{}'))
+    findings = run_cached_nag(shlex.split(args.app), context, args.outdir, args.cache)
+
+    error_count = 0
+    for stack_name, stack_findings in findings.items():
+        for finding in stack_findings:
+            print(f'[{finding["level"]} at {finding["path"]}] {finding["message"]}')
+            error_count += finding['level'] == 'error'
+    print(f'CDK Nag checked {len(findings)} stacks: {error_count} errors')
+
+    return 1 if error_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
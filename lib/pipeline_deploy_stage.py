@@ -4,8 +4,14 @@ import aws_cdk as cdk
 from constructs import Construct
 from .vpc_stack import VpcStack
 from .s3_bucket_zones_stack import S3BucketZonesStack
+from .s3_replica_stack import S3ReplicaStack
 from .tagging import tag
-from .configuration import VPC_CIDR, get_environment_configuration, get_logical_id_prefix
+from .profiling import synth_phase
+from .configuration import (
+    VPC_CIDR, STACK_DEPENDENCIES, MAX_STACK_PARALLELISM, DEPLOY_STACKS, DEPLOY_STACK_VPC, DEPLOY_STACK_S3_BUCKET_ZONES,
+    DEPLOY_STACK_S3_REPLICA, REPLICA_REGION,
+    get_environment_configuration, get_logical_id_prefix
+)
 
 class PipelineDeployStage(cdk.Stage):
     def __init__(
@@ -35,25 +41,127 @@ class PipelineDeployStage(cdk.Stage):
 
         mappings = get_environment_configuration(target_environment)
         logical_id_prefix = get_logical_id_prefix()
+        # Stacks in this stage in creation order, keyed by their DEPLOY_STACKS name
+        self.deploy_stacks = {}
 
         if VPC_CIDR in mappings:
-            vpc_stack = VpcStack(
+            with synth_phase('VpcStack'):
+                vpc_stack = VpcStack(
+                    self,
+                    f'{logical_id_prefix}InfrastructureVpc',
+                    description='InsuranceLake stack for networking resources (SO9489) (uksb-1tu7mtee2)',
+                    target_environment=target_environment,
+                    env=env,
+                    **kwargs,
+                )
+                tag(vpc_stack, target_environment)
+                self.deploy_stacks[DEPLOY_STACK_VPC] = vpc_stack
+
+        with synth_phase('S3BucketZonesStack'):
+            bucket_stack = S3BucketZonesStack(
                 self,
-                f'{logical_id_prefix}InfrastructureVpc',
-                description='InsuranceLake stack for networking resources (SO9489) (uksb-1tu7mtee2)',
+                f'{logical_id_prefix}InfrastructureS3BucketZones',
+                description='InsuranceLake stack for three S3 buckets used to store data (SO9489) (uksb-1tu7mtee2)',
                 target_environment=target_environment,
+                deployment_account_id=deployment_account_id,
                 env=env,
                 **kwargs,
             )
-            tag(vpc_stack, target_environment)
-
-        bucket_stack = S3BucketZonesStack(
-            self,
-            f'{logical_id_prefix}InfrastructureS3BucketZones',
-            description='InsuranceLake stack for three S3 buckets used to store data (SO9489) (uksb-1tu7mtee2)',
-            target_environment=target_environment,
-            deployment_account_id=deployment_account_id,
-            env=env,
-            **kwargs,
+            tag(bucket_stack, target_environment)
+            self.deploy_stacks[DEPLOY_STACK_S3_BUCKET_ZONES] = bucket_stack
+
+        stack_dependencies = mappings.get(STACK_DEPENDENCIES, {})
+        if mappings.get(REPLICA_REGION):
+            with synth_phase('S3ReplicaStack'):
+                replica_stack = S3ReplicaStack(
+                    self,
+                    f'{logical_id_prefix}InfrastructureS3Replica',
+                    description='InsuranceLake stack for S3 replica buckets in the replica region '
+                        '(SO9489) (uksb-1tu7mtee2)',
+                    target_environment=target_environment,
+                    env=cdk.Environment(account=env.account, region=mappings[REPLICA_REGION]),
+                    **kwargs,
+                )
+                tag(replica_stack, target_environment)
+                self.deploy_stacks[DEPLOY_STACK_S3_REPLICA] = replica_stack
+
+            # Replication destinations must exist before replication is configured on the source buckets
+            stack_dependencies = {
+                **stack_dependencies,
+                DEPLOY_STACK_S3_BUCKET_ZONES: [
+                    *stack_dependencies.get(DEPLOY_STACK_S3_BUCKET_ZONES, []), DEPLOY_STACK_S3_REPLICA ],
+            }
+
+        self.add_stack_dependencies(
+            stack_dependencies,
+            mappings.get(MAX_STACK_PARALLELISM),
         )
-        tag(bucket_stack, target_environment)
\ No newline at end of file
+
+
+    def add_stack_dependencies(self, stack_dependencies: dict, max_parallelism: int = None) -> list:
+        """Adds explicit dependencies between stacks in the stage, then chains the stacks in
+        deployment order so that at most max_parallelism stacks deploy at the same time.
+        CDK Pipelines deploys stacks without dependencies between them concurrently.
+
+        Parameters
+        ----------
+        stack_dependencies
+            List of DEPLOY_STACKS names each stack depends on, keyed by DEPLOY_STACKS name;
+            dependencies on stacks that are not created in this environment are ignored
+        max_parallelism: optional
+            Maximum number of stacks deployed at the same time, a positive integer; None for no limit
+
+        Raises
+        ------
+        AttributeError
+            If a stack name is unknown, the dependencies contain a cycle or max_parallelism is
+            not a positive integer
+
+        Returns
+        -------
+        list
+            DEPLOY_STACKS names of the stacks in this stage in deployment order
+        """
+        # bool is a subclass of int, but True is not a meaningful stack count
+        if max_parallelism is not None and (
+            not isinstance(max_parallelism, int) or isinstance(max_parallelism, bool) or max_parallelism < 1
+        ):
+            raise AttributeError(f'{MAX_STACK_PARALLELISM} {max_parallelism!r} must be a positive integer')
+
+        dependencies = { stack_name: set() for stack_name in self.deploy_stacks }
+        for stack_name, dependency_names in stack_dependencies.items():
+            for each_name in [ stack_name, *dependency_names ]:
+                if each_name not in DEPLOY_STACKS:
+                    raise AttributeError(f'Stack dependency {each_name} is not one of {DEPLOY_STACKS}')
+            if stack_name not in self.deploy_stacks:
+                continue
+            dependencies[stack_name].update(
+                dependency_name for dependency_name in dependency_names if dependency_name in self.deploy_stacks
+            )
+
+        # Topological sort that keeps creation order for independent stacks
+        deployment_order = []
+        while len(deployment_order) < len(dependencies):
+            ready_stacks = [
+                stack_name for stack_name, dependency_names in dependencies.items()
+                if stack_name not in deployment_order and dependency_names.issubset(deployment_order)
+            ]
+            if not ready_stacks:
+                raise AttributeError(f'Stack dependencies contain a cycle: {stack_dependencies}')
+            deployment_order.append(ready_stacks[0])
+
+        for stack_name in deployment_order:
+            for dependency_name in sorted(dependencies[stack_name], key=deployment_order.index):
+                self.deploy_stacks[stack_name].add_dependency(
+                    self.deploy_stacks[dependency_name], 'Configured stack dependency')
+
+        # Each stack waits for the stack max_parallelism positions earlier in deployment order,
+        # which never creates a cycle
+        if max_parallelism is not None:
+            for position in range(max_parallelism, len(deployment_order)):
+                self.deploy_stacks[deployment_order[position]].add_dependency(
+                    self.deploy_stacks[deployment_order[position - max_parallelism]],
+                    f'Limit concurrent stack deployments to {max_parallelism}'
+                )
+
+        return deployment_order
\ No newline at end of file
@@ -1,5 +1,7 @@
 # Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
 # SPDX-License-Identifier: MIT-0
+import shlex
+import jsii
 import aws_cdk as cdk
 from constructs import Construct
 import aws_cdk.pipelines as Pipelines
@@ -10,16 +12,53 @@ import aws_cdk.aws_codepipeline as CodePipeline
 import aws_cdk.aws_codepipeline_actions as CodePipelineActions
 import aws_cdk.aws_codebuild as CodeBuild
 import aws_cdk.aws_codecommit as CodeCommit
-from cdk_nag import AwsSolutionsChecks, NagSuppressions
+from cdk_nag import NagSuppressions
 
 from .configuration import (
-    ACCOUNT_ID, CODECOMMIT_MIRROR_REPOSITORY_NAME, DEPLOYMENT, PROD, TEST,
+    ACCOUNT_ID, REGION, CODECOMMIT_MIRROR_REPOSITORY_NAME, DEPLOYMENT, PROD, TEST,
 	GITHUB_REPOSITORY_NAME, GITHUB_REPOSITORY_OWNER_NAME, GITHUB_TOKEN,
     CODESTAR_CONNECTION_ARN, CODESTAR_REPOSITORY_OWNER_NAME, CODESTAR_REPOSITORY_NAME,
-	CODECOMMIT_REPOSITORY_NAME, CODECOMMIT_MIRROR_REPOSITORY_NAME,
+	CODECOMMIT_REPOSITORY_NAME, CODECOMMIT_MIRROR_REPOSITORY_NAME, TEMPLATE_FINGERPRINT,
+    CODEBUILD_CACHE, CODEBUILD_CACHE_LOCAL, CODEBUILD_CACHE_S3, CDK_CLI_VERSION,
+    BUILD_PROFILE_DEFAULT, BUILD_PROFILE_SYNTH, BUILD_PROFILE_SELF_MUTATION, BUILD_PROFILE_ASSET_PUBLISHING,
+    BUILD_PROFILE_COMPUTE_TYPE, BUILD_PROFILE_ARM, BUILD_PROFILE_LAMBDA_COMPUTE_TYPES, get_build_profile,
+    PUBLISH_ASSETS_IN_PARALLEL,
+    SOURCE_TRIGGER_FILE_PATHS, SOURCE_TRIGGER_EXCLUDED_FILE_PATHS, SOURCE_TRIGGER_TAGS,
+    PIPELINE_TYPE, PIPELINE_TYPE_V1, PIPELINE_TYPE_V2, PIPELINE_TYPES,
+    PIPELINE_EXECUTION_MODE, PIPELINE_EXECUTION_MODES,
+    PIPELINE_VARIABLES,
     get_logical_id_prefix, get_resource_name_prefix, get_all_configurations
 )
 from .pipeline_deploy_stage import PipelineDeployStage
+from .nag_runner import apply_nag_checks
+from .profiling import synth_phase
+
+# Pipeline variable exported by the fingerprint check step, true if any stack in the stage changed
+TEMPLATE_FINGERPRINT_CHANGED_VARIABLE = 'CHANGED'
+
+# Synth step dependency locations saved in the CodeBuild cache: npm download cache,
+# npm global prefix (installed CDK CLI), and pip wheel cache
+SYNTH_NPM_PREFIX = '/root/.npm-global'
+SYNTH_CACHE_PATHS = [ '/root/.npm/**/*', f'{SYNTH_NPM_PREFIX}/**/*', '/root/.cache/pip/**/*' ]
+SYNTH_CACHE_EXPIRATION_DAYS = 30
+
+
+@jsii.implements(cdk.IStableStringProducer)
+class ArtifactBucketNameProducer:
+
+    def __init__(self, pipeline: Pipelines.CodePipeline):
+        """Lazily resolves the artifact bucket name of a CDK Pipeline, which is only created
+        when the pipeline is built
+
+        Parameters
+        ----------
+        pipeline
+            CDK Pipeline that owns the artifact bucket
+        """
+        self.pipeline = pipeline
+
+    def produce(self) -> str:
+        return self.pipeline.pipeline.artifact_bucket.bucket_name
 
 
 class PipelineStack(cdk.Stack):
@@ -27,6 +66,7 @@ class PipelineStack(cdk.Stack):
     def __init__(
         self, scope: Construct, construct_id: str,
         target_environment: str, target_branch: str, target_aws_env: dict,
+        deploy_waves: list = None,
         **kwargs
     ):
         """CloudFormation stack to create CDK Pipeline resources (Code Pipeline, Code Build, and ancillary resources).
@@ -39,11 +79,16 @@ class PipelineStack(cdk.Stack):
             The construct ID of this stack; if stackName is not explicitly defined,
             this ID (and any parent IDs) will be used to determine the physical ID of the stack
         target_environment
-            The target environment for stacks in the deploy stage
+            The target environment for stacks in the deploy stage; for a multi-environment
+            pipeline, the environment that names and configures the pipeline, usually Deploy
         target_branch
             The source branch for polling
         target_aws_env
-            The CDK env variables used for stacks in the deploy stage
+            The CDK env variables used for stacks in the deploy stage; ignored if deploy_waves is specified
+        deploy_waves: optional
+            List of waves, each a list of environments deployed in parallel, for a single pipeline
+            that deploys multiple environments in order, e.g. [[ DEV, TEST ], [ PROD ]]; the account
+            and region of each environment is taken from configuration
         kwargs: optional
             Optional keyword arguments to pass up to parent Stack class
         """
@@ -55,7 +100,19 @@ class PipelineStack(cdk.Stack):
         self.resource_name_prefix = get_resource_name_prefix()
         self.target_branch = target_branch
 
-        if (target_environment == PROD or target_environment == TEST):
+        if deploy_waves is None:
+            deploy_waves = [ [ target_environment ] ]
+            deploy_aws_envs = { target_environment: target_aws_env }
+        else:
+            deploy_aws_envs = {
+                environment: {
+                    'account': self.mappings[environment][ACCOUNT_ID],
+                    'region': self.mappings[environment][REGION],
+                }
+                for wave_environments in deploy_waves for environment in wave_environments
+            }
+
+        if (PROD in deploy_aws_envs or TEST in deploy_aws_envs):
             self.removal_policy = cdk.RemovalPolicy.RETAIN
             self.log_retention = logs.RetentionDays.SIX_MONTHS
         else:
@@ -64,13 +121,14 @@ class PipelineStack(cdk.Stack):
 
         self.create_environment_pipeline(
             target_environment,
-            target_aws_env
+            deploy_waves,
+            deploy_aws_envs
         )
 
 
     def create_environment_pipeline(
         self,
-        target_environment: str, target_aws_env: dict
+        target_environment: str, deploy_waves: list, deploy_aws_envs: dict
     ):
         """Creates CloudFormation stack to create CDK Pipeline resources such as:
         Code Pipeline, Code Build, and ancillary resources.
@@ -78,17 +136,14 @@ class PipelineStack(cdk.Stack):
         Parameters
         ----------
         target_environment
-            The target environment for stacks in the deploy stage
-        target_branch
-            The source branch for polling
-        target_aws_env
-            The CDK env variables used for stacks in the deploy stage
+            The environment that names and configures the pipeline
+        deploy_waves
+            List of waves, each a list of environments deployed in parallel
+        deploy_aws_envs
+            The CDK env variables used for stacks in the deploy stage, keyed by environment
         """
-        code_build_env = CodeBuild.BuildEnvironment(
-            build_image=CodeBuild.LinuxBuildImage.STANDARD_7_0,
-            privileged=False
-        )
-        
+        code_build_env = self.get_build_environment(target_environment, BUILD_PROFILE_DEFAULT)
+
         code_build_opt = Pipelines.CodeBuildOptions(
             build_environment=code_build_env,
             role_policy=[
@@ -114,44 +169,99 @@ class PipelineStack(cdk.Stack):
             ]
         )
 
+        source = self.get_codepipeline_source()
+        template_fingerprint = self.mappings[target_environment].get(TEMPLATE_FINGERPRINT, False)
+        source_push_filters = self.get_source_push_filters()
+        pipeline_variables = self.mappings[target_environment].get(PIPELINE_VARIABLES, {})
+        execution_mode = self.get_execution_mode(target_environment)
+        pipeline_type = self.get_pipeline_type(
+            target_environment,
+            # Stage conditions used to skip unchanged deployments, trigger filters, execution modes
+            # and variables require a V2 pipeline
+            requires_v2=bool(template_fingerprint or source_push_filters or pipeline_variables
+                or execution_mode != CodePipeline.ExecutionMode.SUPERSEDED),
+        )
+        cdk_cli_version = self.mappings[target_environment].get(CDK_CLI_VERSION, '')
+        codebuild_cache = self.mappings[target_environment].get(CODEBUILD_CACHE, '')
+        synth_code_build_opt = self.get_synth_code_build_options(target_environment)
+
         pipeline = Pipelines.CodePipeline(
             self,
             f'{target_environment}{self.logical_id_prefix}InfrastructurePipeline',
             pipeline_name=f'{target_environment.lower()}-{self.resource_name_prefix}-infrastructure-pipeline',
             code_build_defaults=code_build_opt,
+            synth_code_build_defaults=synth_code_build_opt,
+            self_mutation_code_build_defaults=Pipelines.CodeBuildOptions(
+                build_environment=self.get_build_environment(target_environment, BUILD_PROFILE_SELF_MUTATION)
+            ),
+            asset_publishing_code_build_defaults=Pipelines.CodeBuildOptions(
+                build_environment=self.get_build_environment(target_environment, BUILD_PROFILE_ASSET_PUBLISHING)
+            ),
             self_mutation=True,
+            publish_assets_in_parallel=self.mappings[target_environment].get(PUBLISH_ASSETS_IN_PARALLEL, True),
+            # Use the pinned CDK CLI for self-mutation and asset publishing as well
+            cli_version=cdk_cli_version or None,
             synth=Pipelines.ShellStep(
                 'Synth',
-                input=self.get_codepipeline_source(),
+                input=source,
                 commands=[
-                    'npm install -g aws-cdk',
+                    # Installed CLI is saved with the npm global prefix when caching is enabled
+                    *([ f'export PATH="{SYNTH_NPM_PREFIX}/bin:$PATH"' ] if codebuild_cache else []),
+                    f'npm install -g aws-cdk@{cdk_cli_version}' if cdk_cli_version else 'npm install -g aws-cdk',
                     'python -m pip install -r requirements.txt --root-user-action=ignore',
                     'cdk synth'
                 ],
+                # Pipeline variable references are resolved by CodePipeline when the action runs
+                env={ name: f'#{{variables.{name}}}' for name in pipeline_variables } or None,
             ),
-            cross_account_keys=True
+            cross_account_keys=True,
+            pipeline_type=pipeline_type,
         )
 
-        pipeline_deploy_stage = PipelineDeployStage(
-                self,
-                target_environment,
-                target_environment=target_environment,
-                deployment_account_id=self.mappings[DEPLOYMENT][ACCOUNT_ID],
-                env=cdk.Environment(
-                    account=target_aws_env['account'],
-                    region=target_aws_env['region']
-                )
-            )
+        fingerprinted_stages = []
+        for wave_environments in deploy_waves:
+            pipeline_deploy_stages = []
+            for environment in wave_environments:
+                with synth_phase('PipelineDeployStage'):
+                    pipeline_deploy_stage = PipelineDeployStage(
+                            self,
+                            environment,
+                            target_environment=environment,
+                            deployment_account_id=self.mappings[DEPLOYMENT][ACCOUNT_ID],
+                            env=cdk.Environment(
+                                account=deploy_aws_envs[environment]['account'],
+                                region=deploy_aws_envs[environment]['region']
+                            )
+                        )
 
-        # Enable CDK Nag for environment stacks before adding to
-        # pipeline, which are deployed with CodePipeline
-        cdk.Aspects.of(pipeline_deploy_stage).add(AwsSolutionsChecks())
+                # Enable CDK Nag for environment stacks before adding to
+                # pipeline, which are deployed with CodePipeline
+                apply_nag_checks(pipeline_deploy_stage)
+                pipeline_deploy_stages.append(pipeline_deploy_stage)
 
-        pipeline.add_stage(pipeline_deploy_stage)
+            # A single environment is a pipeline stage named after the environment; multiple
+            # environments are a wave, which deploys the environments in parallel in one pipeline stage
+            stage_name = ''.join(wave_environments)
+            post_steps = []
+            if template_fingerprint:
+                check_step, record_step, changed_variable = \
+                    self.add_fingerprint_steps(pipeline, source, stage_name, pipeline_deploy_stages)
+                post_steps.append(record_step)
+                fingerprinted_stages.append((stage_name, changed_variable, [ check_step, record_step ]))
+
+            # Adding the stage synthesizes its stacks, which runs the CDK Nag and tagging aspects
+            with synth_phase('add_stage'):
+                if len(pipeline_deploy_stages) == 1:
+                    pipeline.add_stage(pipeline_deploy_stages[0], post=post_steps)
+                else:
+                    wave = pipeline.add_wave(stage_name, post=post_steps)
+                    for pipeline_deploy_stage in pipeline_deploy_stages:
+                        wave.add_stage(pipeline_deploy_stage)
 
         # Force Pipeline construct creation during synth so we can add
         # Nag Suppressions, artifact bucket policies, and access Build stages
-        pipeline.build_pipeline()
+        with synth_phase('build_pipeline'):
+            pipeline.build_pipeline()
 
         # Loop through Stages and Actions looking for Build actions
         # that write to CloudWatch logs
@@ -168,6 +278,29 @@ class PipelineStack(cdk.Stack):
                         retention=self.log_retention,
                     )
 
+        if source_push_filters:
+            pipeline.pipeline.add_trigger(
+                provider_type=CodePipeline.ProviderType.CODE_STAR_SOURCE_CONNECTION,
+                git_configuration=CodePipeline.GitConfiguration(
+                    # Source stage has the single connection source action
+                    source_action=pipeline.pipeline.stages[0].actions[0],
+                    push_filter=source_push_filters,
+                ),
+            )
+
+        for name, default_value in pipeline_variables.items():
+            pipeline.pipeline.add_variable(CodePipeline.Variable(
+                variable_name=name,
+                default_value=default_value,
+            ))
+
+        # CDK Pipelines does not expose the execution mode, so set it using escape hatch
+        if execution_mode != CodePipeline.ExecutionMode.SUPERSEDED:
+            pipeline.pipeline.node.default_child.add_property_override('ExecutionMode', execution_mode.value)
+
+        for stage_name, changed_variable, fingerprint_steps in fingerprinted_stages:
+            self.skip_unchanged_stage(pipeline, stage_name, changed_variable, fingerprint_steps)
+
         # Apply stack removal policy to Artifact Bucket
         pipeline.pipeline.artifact_bucket.apply_removal_policy(self.removal_policy)
 
@@ -187,11 +320,319 @@ class PipelineStack(cdk.Stack):
         NagSuppressions.add_resource_suppressions(pipeline, [
             {
                 'id': 'AwsSolutions-IAM5',
-                'reason': 'Wildcard IAM permissions are used by auto-created Codepipeline policies and custom policies to allow flexible creation of resources'
+                'reason': 'Wildcard IAM permissions are used by auto-created Codepipeline policies and custom '
+                    'policies to allow flexible creation of resources'
             },
         ], apply_to_children=True)
 
 
+    def get_pipeline_type(self, target_environment: str, requires_v2: bool) -> CodePipeline.PipelineType:
+        """Returns the configured CodePipeline type, or V2 if the pipeline settings require it
+
+        Parameters
+        ----------
+        target_environment
+            The target environment of the pipeline
+        requires_v2
+            True if the pipeline uses settings only supported by the V2 pipeline type
+
+        Raises
+        ------
+        AttributeError
+            If the pipeline type is unknown, or V1 is configured with settings that require V2
+
+        Returns
+        -------
+        CodePipeline.PipelineType
+            Pipeline type, or None for the CDK Pipelines default
+        """
+        pipeline_type = self.mappings[target_environment].get(PIPELINE_TYPE, '')
+        if pipeline_type and pipeline_type not in PIPELINE_TYPES:
+            raise AttributeError(f'Pipeline type {pipeline_type} is not one of {PIPELINE_TYPES}')
+        if pipeline_type == PIPELINE_TYPE_V1:
+            if requires_v2:
+                raise AttributeError(f'Pipeline type {PIPELINE_TYPE_V1} does not support template fingerprints, '
+                    'trigger filters, execution modes or pipeline variables')
+            return CodePipeline.PipelineType.V1
+
+        return CodePipeline.PipelineType.V2 if pipeline_type == PIPELINE_TYPE_V2 or requires_v2 else None
+
+
+    def get_execution_mode(self, target_environment: str) -> CodePipeline.ExecutionMode:
+        """Returns the configured CodePipeline execution mode, SUPERSEDED by default
+
+        Raises
+        ------
+        AttributeError
+            If the execution mode is unknown
+        """
+        execution_mode = self.mappings[target_environment].get(PIPELINE_EXECUTION_MODE, 'SUPERSEDED')
+        if execution_mode not in PIPELINE_EXECUTION_MODES:
+            raise AttributeError(f'Pipeline execution mode {execution_mode} is not one of {PIPELINE_EXECUTION_MODES}')
+
+        return CodePipeline.ExecutionMode[execution_mode]
+
+
+    def get_build_environment(self, target_environment: str, action: str) -> CodeBuild.BuildEnvironment:
+        """Returns the CodeBuild environment for a pipeline action from its build profile
+
+        Parameters
+        ----------
+        target_environment
+            The target environment of the pipeline
+        action
+            Pipeline action, e.g. BUILD_PROFILE_SYNTH
+
+        Returns
+        -------
+        CodeBuild.BuildEnvironment
+            Build image and compute type for the action
+        """
+        build_profile = get_build_profile(self.mappings[target_environment], action)
+        compute_type = build_profile[BUILD_PROFILE_COMPUTE_TYPE]
+
+        if compute_type in BUILD_PROFILE_LAMBDA_COMPUTE_TYPES:
+            # Lambda compute is limited to actions that only need Node.js to run the CDK CLI
+            lambda_build_image = CodeBuild.LinuxArmLambdaBuildImage if build_profile[BUILD_PROFILE_ARM] \
+                else CodeBuild.LinuxLambdaBuildImage
+            build_image = lambda_build_image.AMAZON_LINUX_2023_NODE_22
+        elif build_profile[BUILD_PROFILE_ARM]:
+            build_image = CodeBuild.LinuxArmBuildImage.AMAZON_LINUX_2023_STANDARD_3_0
+        else:
+            build_image = CodeBuild.LinuxBuildImage.STANDARD_7_0
+
+        return CodeBuild.BuildEnvironment(
+            build_image=build_image,
+            compute_type=getattr(CodeBuild.ComputeType, compute_type) if compute_type else None,
+            privileged=False
+        )
+
+
+    def get_synth_code_build_options(self, target_environment: str) -> Pipelines.CodeBuildOptions:
+        """Returns CodeBuild options for the Synth step: the Synth build profile, and a local
+        or S3 cache for npm and pip dependencies, based on configuration
+
+        Parameters
+        ----------
+        target_environment
+            The target environment of the pipeline
+
+        Raises
+        ------
+        AttributeError
+            If the configured cache type is not supported
+
+        Returns
+        -------
+        Pipelines.CodeBuildOptions
+            Synth step CodeBuild options
+        """
+        build_environment = self.get_build_environment(target_environment, BUILD_PROFILE_SYNTH)
+        codebuild_cache = self.mappings[target_environment].get(CODEBUILD_CACHE, '')
+        if not codebuild_cache:
+            return Pipelines.CodeBuildOptions(build_environment=build_environment)
+
+        if codebuild_cache == CODEBUILD_CACHE_LOCAL:
+            # Local cache is kept on the build host and is only reused by builds that land on the same host
+            cache = CodeBuild.Cache.local(CodeBuild.LocalCacheMode.CUSTOM)
+        elif codebuild_cache == CODEBUILD_CACHE_S3:
+            cache_bucket = s3.Bucket(
+                self,
+                f'{target_environment}{self.logical_id_prefix}SynthCacheBucket',
+                encryption=s3.BucketEncryption.S3_MANAGED,
+                block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+                enforce_ssl=True,
+                server_access_logs_prefix='access-logs',
+                removal_policy=self.removal_policy,
+                lifecycle_rules=[
+                    s3.LifecycleRule(
+                        id='ExpireSynthCache',
+                        expiration=cdk.Duration.days(SYNTH_CACHE_EXPIRATION_DAYS),
+                    ),
+                ],
+            )
+            cache = CodeBuild.Cache.bucket(cache_bucket, prefix='synth')
+        else:
+            raise AttributeError(f'CodeBuild cache type {codebuild_cache} for {target_environment} is not supported; '
+                f'use {CODEBUILD_CACHE_LOCAL} or {CODEBUILD_CACHE_S3}')
+
+        return Pipelines.CodeBuildOptions(
+            build_environment=build_environment,
+            cache=cache,
+            partial_build_spec=CodeBuild.BuildSpec.from_object({
+                'env': {
+                    'variables': {
+                        'NPM_CONFIG_PREFIX': SYNTH_NPM_PREFIX,
+                    },
+                },
+                'cache': {
+                    'paths': SYNTH_CACHE_PATHS,
+                },
+            }),
+        )
+
+
+    def add_fingerprint_steps(
+        self,
+        pipeline: Pipelines.CodePipeline, source: Pipelines.CodePipelineSource,
+        stage_name: str, stages: list
+    ) -> tuple:
+        """Adds a wave before the deploy stage that compares the fingerprints of the stage stacks
+        with the fingerprints recorded after the last deployment, and creates the step that
+        records fingerprints after a successful deployment
+
+        Parameters
+        ----------
+        pipeline
+            CDK Pipeline to add the fingerprint check to
+        source
+            Pipeline source, which provides the fingerprint module
+        stage_name
+            Name of the deploy stage in the pipeline
+        stages
+            CDK Stages deployed by the pipeline stage, whose stacks are fingerprinted
+
+        Returns
+        -------
+        tuple
+            Fingerprint check step, fingerprint record step (to add after the deploy stage),
+            and the exported changed variable
+        """
+        fingerprint_arguments = ' '.join([
+            '--assembly cdk.out',
+            '--store "$FINGERPRINT_STORE"',
+            *[ f'--stacks {shlex.quote(stage.node.path + "/*")}' for stage in stages ],
+        ])
+        fingerprint_options = dict(
+            input=source,
+            additional_inputs={ 'cdk.out': pipeline.cloud_assembly_file_set },
+            env={
+                'FINGERPRINT_STORE': f's3://{cdk.Lazy.string(ArtifactBucketNameProducer(pipeline))}'
+                    f'/fingerprints/{self.node.path}/{stage_name}.json',
+            },
+        )
+
+        check_step = Pipelines.CodeBuildStep(
+            'FingerprintCheck',
+            commands=[
+                # Assign before exporting so a failed check fails the build
+                f'{TEMPLATE_FINGERPRINT_CHANGED_VARIABLE}=$(python -m lib.template_fingerprint check '
+                    f'{fingerprint_arguments})',
+                f'export {TEMPLATE_FINGERPRINT_CHANGED_VARIABLE}',
+            ],
+            **fingerprint_options,
+        )
+        # Consuming the exported variable in a later step assigns the check action a variable namespace;
+        # the deploy stage entry condition must reference the same variable token
+        changed_variable = check_step.exported_variable(TEMPLATE_FINGERPRINT_CHANGED_VARIABLE)
+        record_step = Pipelines.CodeBuildStep(
+            'FingerprintRecord',
+            commands=[ f'python -m lib.template_fingerprint record {fingerprint_arguments}' ],
+            **{
+                **fingerprint_options,
+                'env': {
+                    **fingerprint_options['env'],
+                    TEMPLATE_FINGERPRINT_CHANGED_VARIABLE: changed_variable,
+                },
+            },
+        )
+
+        pipeline.add_wave(f'{stage_name}Fingerprint', pre=[ check_step ])
+
+        return check_step, record_step, changed_variable
+
+
+    def skip_unchanged_stage(
+        self,
+        pipeline: Pipelines.CodePipeline, stage_name: str, changed_variable: str, fingerprint_steps: list
+    ):
+        """Skips the deploy stage when the fingerprint check found no changed stacks, and allows
+        the fingerprint steps to read and write the fingerprint store in the artifact bucket.
+        Call after the pipeline is built.
+
+        Parameters
+        ----------
+        pipeline
+            Built CDK Pipeline
+        stage_name
+            Name of the deploy stage in the pipeline
+        changed_variable
+            Changed variable exported by the fingerprint check step
+        fingerprint_steps
+            Fingerprint steps that read and write the fingerprint store
+        """
+        for step in fingerprint_steps:
+            pipeline.pipeline.artifact_bucket.grant_read_write(step.project)
+
+        # Stage entry conditions are not available on the L2 stage after creation, so use escape hatch
+        stage_names = [ stage.stage_name for stage in pipeline.pipeline.stages ]
+        cfn_pipeline = pipeline.pipeline.node.default_child
+        cfn_pipeline.add_property_override(f'Stages.{stage_names.index(stage_name)}.BeforeEntry', {
+            'Conditions': [{
+                'Result': 'SKIP',
+                'Rules': [{
+                    'Name': f'{stage_name}StacksChanged',
+                    'RuleTypeId': {
+                        'Category': 'Rule',
+                        'Owner': 'AWS',
+                        'Provider': 'VariableCheck',
+                        'Version': '1',
+                    },
+                    # Enter the stage only if the condition is met, otherwise skip it
+                    'Configuration': {
+                        'Variable': changed_variable,
+                        'Value': 'true',
+                        'Operator': 'EQ',
+                    },
+                }],
+            }],
+        })
+
+
+    def get_source_push_filters(self) -> list:
+        """Returns the pipeline trigger push filters for the target branch and the configured file
+        paths and git tags, so only pushes that change infrastructure code or push a matching tag
+        start the pipeline
+
+        Returns
+        -------
+        list
+            CodePipeline.GitPushFilter objects for the Codestar source, empty if no file paths or
+            tags are configured
+
+        Raises
+        ------
+        AttributeError
+            If file paths or tags are configured for a source other than Codestar
+        """
+        file_paths_includes = self.mappings[DEPLOYMENT].get(SOURCE_TRIGGER_FILE_PATHS, [])
+        file_paths_excludes = self.mappings[DEPLOYMENT].get(SOURCE_TRIGGER_EXCLUDED_FILE_PATHS, [])
+        tags_includes = self.mappings[DEPLOYMENT].get(SOURCE_TRIGGER_TAGS, [])
+        if not file_paths_includes and not file_paths_excludes and not tags_includes:
+            return []
+
+        # Pipeline triggers with filters are only supported for connection sources
+        if self.mappings[DEPLOYMENT][GITHUB_REPOSITORY_NAME] \
+                or not self.mappings[DEPLOYMENT][CODESTAR_REPOSITORY_NAME]:
+            raise AttributeError(f'{SOURCE_TRIGGER_FILE_PATHS}, {SOURCE_TRIGGER_EXCLUDED_FILE_PATHS} and '
+                f'{SOURCE_TRIGGER_TAGS} are only supported with a Codestar connection repository')
+
+        push_filters = [
+            CodePipeline.GitPushFilter(
+                branches_includes=[ self.target_branch ],
+                # A filter needs included file paths; default to all files when only exclusions are set
+                file_paths_includes=(file_paths_includes or [ '**' ])
+                    if file_paths_includes or file_paths_excludes else None,
+                file_paths_excludes=file_paths_excludes or None,
+            )
+        ]
+        # A push filter cannot combine tags with branches or file paths
+        if tags_includes:
+            push_filters.append(CodePipeline.GitPushFilter(tags_includes=tags_includes))
+
+        return push_filters
+
+
     def get_codepipeline_source(self) -> Pipelines.CodePipelineSource:
         """Based on configuration, create a CodePipeline source object for the selected repository type
 
@@ -209,7 +650,9 @@ class PipelineStack(cdk.Stack):
                     authentication=cdk.SecretValue.secrets_manager(
                         self.mappings[DEPLOYMENT][GITHUB_TOKEN]
                     ),
-                    trigger=CodePipelineActions.GitHubTrigger.POLL,
+                    # Webhook starts the pipeline on push instead of polling GitHub on a schedule;
+                    # the token needs the admin:repo_hook scope to create the repository webhook
+                    trigger=CodePipelineActions.GitHubTrigger.WEBHOOK,
                 )
         if self.mappings[DEPLOYMENT][CODESTAR_REPOSITORY_NAME]:
             # CodeStar
@@ -238,4 +681,6 @@ class PipelineStack(cdk.Stack):
                 repository=repo,
                 branch=self.target_branch,
                 code_build_clone_output=True,
+                # EventBridge rule on repository changes starts the pipeline without polling
+                trigger=CodePipelineActions.CodeCommitTrigger.EVENTS,
             )
\ No newline at end of file
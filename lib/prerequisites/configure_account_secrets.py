@@ -22,7 +22,8 @@ if __name__ == '__main__':
         f'{get_all_configurations()[DEPLOYMENT][GITHUB_TOKEN]} '
         f'in account: {boto3.client("sts").get_caller_identity().get("Account")} '
         f'and region: {boto3.session.Session().region_name}?\n\n'
-        'This should be the Central Deployment Account ID\n\n'
+        'This should be the Central Deployment Account ID\n'
+        'The token needs the repo and admin:repo_hook scopes to create the pipeline webhook\n\n'
         '(y/n)'
     ))
 
@@ -0,0 +1,230 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import os
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+import aws_cdk as cdk
+from constructs import Construct, IConstruct
+import jsii
+
+# Enable synth profiling with SYNTH_PROFILE=1 or cdk synth -c synth_profile=true
+SYNTH_PROFILE_CONTEXT_KEY = 'synth_profile'
+SYNTH_PROFILE_ENVIRONMENT_VARIABLE = 'SYNTH_PROFILE'
+# Reports are written next to the cloud assembly output directory
+SYNTH_PROFILE_REPORT_FILE = 'synth-profile.json'
+SYNTH_PROFILE_FOLDED_FILE = 'synth-profile.folded'
+
+_profile = {
+    'enabled': False,
+    'phase_stack': [],
+    'phases': {},
+    'jsii_calls': 0,
+    'original_send': None,
+}
+
+
+def _get_node_process_class():
+    """Returns the JSII kernel node process class whose send method is patched to count JSII
+    calls, or None if this JSII version does not provide it; profiling then records wall time
+    and Python allocations only
+    """
+    try:
+        from jsii._kernel.providers.process import _NodeProcess
+        getattr(_NodeProcess, 'send')
+    except (ImportError, AttributeError):
+        return None
+    return _NodeProcess
+
+
+def is_profiling_enabled() -> bool:
+    """Returns True if synth profiling was enabled with start_profiling()
+    """
+    return _profile['enabled']
+
+
+def start_profiling(scope: Construct) -> bool:
+    """Enables synth profiling if requested with CDK context or the environment, and starts
+    tracking Python allocations and JSII calls
+
+    Parameters
+    ----------
+    scope
+        Construct used to read CDK context, usually the App
+
+    Returns
+    -------
+    bool
+        True if profiling is enabled
+    """
+    requested = scope.node.try_get_context(SYNTH_PROFILE_CONTEXT_KEY)
+    if requested is None:
+        requested = os.environ.get(SYNTH_PROFILE_ENVIRONMENT_VARIABLE, '')
+    if str(requested).lower() not in [ '1', 'true', 'yes' ]:
+        return False
+
+    _profile.update(enabled=True, phase_stack=[], phases={}, jsii_calls=0)
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    node_process_class = _get_node_process_class()
+    if node_process_class is not None and _profile['original_send'] is None:
+        original_send = node_process_class.send
+        def counting_send(self, *args, **kwargs):
+            _profile['jsii_calls'] += 1
+            return original_send(self, *args, **kwargs)
+        _profile['original_send'] = original_send
+        node_process_class.send = counting_send
+
+    return True
+
+
+def stop_profiling():
+    """Disables synth profiling, discards recorded phases and stops counting JSII calls
+    """
+    if _profile['original_send'] is not None:
+        _get_node_process_class().send = _profile['original_send']
+    _profile.update(enabled=False, phase_stack=[], phases={}, jsii_calls=0, original_send=None)
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+@contextmanager
+def count_jsii_calls():
+    """Counts JSII kernel round trips made inside the context
+
+    Yields
+    ------
+    list
+        Single element list whose value is updated with the number of JSII calls on exit;
+        remains 0 if this JSII version does not support counting calls
+    """
+    calls = [ 0 ]
+    node_process_class = _get_node_process_class()
+    if node_process_class is None:
+        yield calls
+        return
+
+    original_send = node_process_class.send
+    def counting_send(self, *args, **kwargs):
+        calls[0] += 1
+        return original_send(self, *args, **kwargs)
+
+    node_process_class.send = counting_send
+    try:
+        yield calls
+    finally:
+        node_process_class.send = original_send
+
+
+@contextmanager
+def synth_phase(name: str):
+    """Records wall time, Python allocations and JSII calls of a synth phase when profiling
+    is enabled; nested phases are recorded under their parent phase
+
+    Parameters
+    ----------
+    name
+        Name of the phase, e.g. configuration or build_pipeline
+    """
+    if not _profile['enabled']:
+        yield
+        return
+
+    _profile['phase_stack'].append(name)
+    phase_path = ';'.join(_profile['phase_stack'])
+    start_memory, _ = tracemalloc.get_traced_memory()
+    start_jsii_calls = _profile['jsii_calls']
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start_time
+        end_memory, _ = tracemalloc.get_traced_memory()
+        phase = _profile['phases'].setdefault(phase_path, {
+            'calls': 0, 'seconds': 0.0, 'allocated_bytes': 0, 'jsii_calls': 0,
+        })
+        phase['calls'] += 1
+        phase['seconds'] += seconds
+        phase['allocated_bytes'] += end_memory - start_memory
+        phase['jsii_calls'] += _profile['jsii_calls'] - start_jsii_calls
+        _profile['phase_stack'].pop()
+
+
+@jsii.implements(cdk.IAspect)
+class ProfiledAspect:
+
+    def __init__(self, aspect: cdk.IAspect, phase_name: str):
+        """Aspect wrapper that records the time spent visiting constructs as a synth phase
+
+        Parameters
+        ----------
+        aspect
+            Aspect to wrap
+        phase_name
+            Name of the phase to record aspect visits under
+        """
+        self.aspect = aspect
+        self.phase_name = phase_name
+
+    def visit(self, node: IConstruct):
+        with synth_phase(self.phase_name):
+            self.aspect.visit(node)
+
+
+def profiled_aspect(aspect: cdk.IAspect, phase_name: str) -> cdk.IAspect:
+    """Wraps an aspect for profiling when profiling is enabled, otherwise returns it unchanged
+    """
+    if not _profile['enabled']:
+        return aspect
+    return ProfiledAspect(aspect, phase_name)
+
+
+def write_profile_report(outdir: str) -> list:
+    """Writes the synth profile as JSON and as folded stacks (flame graph format, microseconds
+    of self time per phase) next to the cloud assembly output directory
+
+    Parameters
+    ----------
+    outdir
+        Cloud assembly output directory, e.g. cdk.out
+
+    Returns
+    -------
+    list
+        Paths of the written report files; empty if profiling is not enabled
+    """
+    if not _profile['enabled']:
+        return []
+
+    phases = _profile['phases']
+    _, peak_memory = tracemalloc.get_traced_memory()
+    report = {
+        'total_jsii_calls': _profile['jsii_calls'],
+        'peak_traced_bytes': peak_memory,
+        'phases': [
+            { 'phase': phase_path.split(';'), **{ key: round(value, 6) for key, value in phase.items() } }
+            for phase_path, phase in phases.items()
+        ],
+    }
+
+    # Flame graphs expect self time, so subtract the time of direct child phases
+    folded_lines = []
+    for phase_path, phase in phases.items():
+        child_seconds = sum(
+            child['seconds'] for child_path, child in phases.items()
+            if child_path.startswith(f'{phase_path};') and child_path.count(';') == phase_path.count(';') + 1
+        )
+        self_microseconds = max(int((phase['seconds'] - child_seconds) * 1_000_000), 0)
+        folded_lines.append(f'{phase_path} {self_microseconds}')
+
+    report_dir = os.path.dirname(os.path.abspath(outdir))
+    report_path = os.path.join(report_dir, SYNTH_PROFILE_REPORT_FILE)
+    folded_path = os.path.join(report_dir, SYNTH_PROFILE_FOLDED_FILE)
+    with open(report_path, 'w', encoding='utf-8') as report_file:
+        json.dump(report, report_file, indent=2)
+    with open(folded_path, 'w', encoding='utf-8') as folded_file:
+        folded_file.write('\n'.join(folded_lines) + '\n')
+
+    return [ report_path, folded_path ]
\ No newline at end of file
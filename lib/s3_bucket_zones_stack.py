@@ -1,18 +1,365 @@
 # Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
 # SPDX-License-Identifier: MIT-0
+import re
 import aws_cdk as cdk
 from constructs import Construct
 import aws_cdk.aws_iam as iam
 import aws_cdk.aws_kms as kms
 import aws_cdk.aws_s3 as s3
+import aws_cdk.aws_s3express as s3express
+from cdk_nag import NagSuppressions
 
 from .configuration import (
     PROD, S3_ACCESS_LOG_BUCKET, S3_CONFORMED_BUCKET, S3_KMS_KEY, S3_PURPOSE_BUILT_BUCKET, S3_RAW_BUCKET, TEST,
-    get_environment_configuration, get_logical_id_prefix, get_resource_name_prefix,
+    BUCKET_ZONE_COLLECT, BUCKET_ZONE_CLEANSE, BUCKET_ZONE_CONSUME, BUCKET_ZONES,
+    S3_EXPRESS_ZONES, S3_EXPRESS_AVAILABILITY_ZONE_ID, S3_EXPRESS_ENCRYPTION,
+    S3_EXPRESS_ENCRYPTION_KMS, S3_EXPRESS_ENCRYPTIONS,
+    S3_EXPRESS_RAW_BUCKET, S3_EXPRESS_CONFORMED_BUCKET, S3_EXPRESS_PURPOSE_BUILT_BUCKET,
+    REPLICA_REGION, REPLICATION_ZONES, REPLICATION_TIME_CONTROL, DEFAULT_REPLICATION_ZONES,
+    S3_REPLICA_CONFORMED_BUCKET, S3_REPLICA_PURPOSE_BUILT_BUCKET,
+    MAX_S3_BUCKET_NAME_LENGTH, TIERING_INTELLIGENT_TIERING, TIERING_TRANSITIONS, TIERING_STORAGE_CLASS_ANALYSIS,
+    TIERING_MINIMUM_OBJECT_SIZE, TIERING_PREFIX, TIERING_TAGS, TIERING_ARCHIVE_DAYS, TIERING_DEEP_ARCHIVE_DAYS,
+    TIERING_STORAGE_CLASS, TIERING_DAYS, COLLECT_TRANSFER_ACCELERATION, COLLECT_MULTI_REGION_ACCESS_POINT,
+    S3_RAW_BUCKET_ACCELERATED_ENDPOINT, S3_RAW_BUCKET_MULTI_REGION_ACCESS_POINT,
+    S3_INVENTORY_FREQUENCY, S3_INVENTORY_FREQUENCIES, S3_REQUEST_METRICS_PREFIXES,
+    get_bucket_tiering, get_environment_configuration, get_logical_id_prefix, get_resource_name_prefix,
 )
 
+# CloudFormation export of each zone's replica bucket in the replica region
+S3_REPLICA_BUCKET_EXPORTS = {
+    BUCKET_ZONE_CLEANSE: S3_REPLICA_CONFORMED_BUCKET,
+    BUCKET_ZONE_CONSUME: S3_REPLICA_PURPOSE_BUILT_BUCKET,
+}
+# Replication Time Control replicates 99.99% of objects within 15 minutes
+REPLICATION_TIME_CONTROL_MINUTES = 15
 
-class S3BucketZonesStack(cdk.Stack):
+# Prefix of S3 Inventory reports in the access logs bucket; reports are further organized by
+# source bucket and inventory ID
+S3_INVENTORY_PREFIX = 'inventory'
+S3_INVENTORY_OPTIONAL_FIELDS = [ 'Size', 'LastModifiedDate', 'StorageClass', 'IntelligentTieringAccessTier' ]
+
+# Multi-Region Access Point names are limited to 50 characters
+MAX_MULTI_REGION_ACCESS_POINT_NAME_LENGTH = 50
+
+# CloudFormation export of each zone's S3 Express One Zone directory bucket
+S3_EXPRESS_BUCKET_EXPORTS = {
+    BUCKET_ZONE_COLLECT: S3_EXPRESS_RAW_BUCKET,
+    BUCKET_ZONE_CLEANSE: S3_EXPRESS_CONFORMED_BUCKET,
+    BUCKET_ZONE_CONSUME: S3_EXPRESS_PURPOSE_BUILT_BUCKET,
+}
+
+# Availability zone IDs are the region code followed by the zone number, e.g. use1-az4 in
+# us-east-1; Local Zone IDs add the Local Zone code, e.g. usw2-lax1-az1
+AVAILABILITY_ZONE_ID_PATTERN = r'(?P<region_code>[a-z]+[0-9]+)(-[a-z]+[0-9]+)?-az[0-9]+'
+# Region codes abbreviate the region direction, e.g. ap-southeast-2 is apse2
+REGION_CODE_PATTERN = r'(?P<country>[a-z]{2})-(?P<direction>[a-z]+)-(?P<number>[0-9]+)'
+REGION_CODE_DIRECTIONS = {
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w', 'central': 'c',
+    'northeast': 'ne', 'northwest': 'nw', 'southeast': 'se', 'southwest': 'sw',
+}
+
+
+def get_availability_zone_id_region_code(region: str) -> str:
+    """Returns the region code that prefixes availability zone IDs in a region, e.g. use1 for
+    us-east-1, or None if the region is a token or does not follow the common naming scheme
+    (e.g. AWS GovCloud)
+    """
+    if cdk.Token.is_unresolved(region):
+        return None
+    region_match = re.fullmatch(REGION_CODE_PATTERN, region)
+    if not region_match or region_match['direction'] not in REGION_CODE_DIRECTIONS:
+        return None
+    return f"{region_match['country']}{REGION_CODE_DIRECTIONS[region_match['direction']]}{region_match['number']}"
+
+
+def get_replication_zones(mappings: dict) -> list:
+    """Returns the zones replicated to the replica region, Consume by default
+
+    Raises
+    ------
+    AttributeError
+        If a zone cannot be replicated
+    """
+    replication_zones = mappings.get(REPLICATION_ZONES, DEFAULT_REPLICATION_ZONES)
+    for zone in replication_zones:
+        if zone not in S3_REPLICA_BUCKET_EXPORTS:
+            raise AttributeError(f'Replication zone {zone} is not one of {list(S3_REPLICA_BUCKET_EXPORTS)}')
+
+    return replication_zones
+
+
+class DataLakeBucketMixin:
+    """Bucket creation methods shared by stacks that create data lake buckets; call
+    set_retention_policy() before creating buckets
+    """
+
+    def set_retention_policy(self, target_environment: str):
+        """Sets the removal policy and object expiration of the environment's buckets and keys
+
+        Parameters
+        ----------
+        target_environment
+            The target environment for stacks in the deploy stage
+        """
+        self.target_environment = target_environment
+
+        # Default values for Dev
+        self.removal_policy = cdk.RemovalPolicy.DESTROY
+        self.object_expiration_days = cdk.Duration.days(60)
+        self.noncurrent_version_expiration_days = cdk.Duration.days(30)
+        if (target_environment == PROD):
+            self.removal_policy = cdk.RemovalPolicy.RETAIN
+            self.object_expiration_days = cdk.Duration.days(3650)
+            self.noncurrent_version_expiration_days = cdk.Duration.days(180)
+        if (target_environment == TEST):
+            self.removal_policy = cdk.RemovalPolicy.RETAIN
+            self.object_expiration_days = cdk.Duration.days(365)
+            self.noncurrent_version_expiration_days = cdk.Duration.days(90)
+
+    def create_data_lake_bucket(
+        self,
+        logical_id: str,
+        bucket_name: str,
+        access_logs_bucket: s3.Bucket,
+        s3_kms_key: kms.Key,
+        tiering: dict = None,
+        transfer_acceleration: bool = False
+    ) -> s3.Bucket:
+        """Creates an Amazon S3 bucket and attaches bucket policy with necessary guardrails.
+        It enables server-side encryption using provided KMS key and leverage S3 bucket key feature.
+
+        logical_id
+            The logical id to apply to the bucket
+        bucket_name
+            The name for the bucket resource
+        access_logs_bucket
+            The S3 bucket resource to target for Access Logging and storage class analysis exports
+        s3_kms_key
+            The KMS Key to use for encryption of data at rest
+        tiering: optional
+            Storage tiering policy of the bucket zone from get_bucket_tiering; transitions replace
+            the default Prod Glacier transition
+        transfer_acceleration: optional
+            Enable S3 Transfer Acceleration for uploads over long distances, defaults to False
+
+        Returns
+        -------
+        s3.Bucket
+            The bucket resource that was created
+        """
+        lifecycle_rules = [
+            s3.LifecycleRule(
+                enabled=True,
+                expiration=self.object_expiration_days,
+                noncurrent_version_expiration=self.noncurrent_version_expiration_days,
+            )
+        ]
+        if tiering and tiering[TIERING_TRANSITIONS]:
+            lifecycle_rules.extend(self.get_tiering_lifecycle_rules(tiering))
+        elif self.target_environment == PROD:
+            lifecycle_rules = [
+                s3.LifecycleRule(
+                    enabled=True,
+                    expiration=self.object_expiration_days,
+                    noncurrent_version_expiration=self.noncurrent_version_expiration_days,
+                    transitions=[
+                        s3.Transition(
+                            storage_class=s3.StorageClass.GLACIER,
+                            transition_after=cdk.Duration.days(365),
+                        )
+                    ]
+                )
+            ]
+        bucket = s3.Bucket(
+            self,
+            id=logical_id,
+            access_control=s3.BucketAccessControl.PRIVATE,
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            enforce_ssl=True,
+            bucket_key_enabled=True,
+            bucket_name=bucket_name,
+            encryption=s3.BucketEncryption.KMS,
+            encryption_key=s3_kms_key,
+            lifecycle_rules=lifecycle_rules,
+            intelligent_tiering_configurations=[
+                s3.IntelligentTieringConfiguration(
+                    name=f'IntelligentTiering{configuration_number + 1}',
+                    prefix=intelligent_tiering.get(TIERING_PREFIX),
+                    tags=[
+                        s3.Tag(key=key, value=value)
+                        for key, value in intelligent_tiering.get(TIERING_TAGS, {}).items()
+                    ] or None,
+                    archive_access_tier_time=cdk.Duration.days(intelligent_tiering[TIERING_ARCHIVE_DAYS])
+                        if TIERING_ARCHIVE_DAYS in intelligent_tiering else None,
+                    deep_archive_access_tier_time=cdk.Duration.days(intelligent_tiering[TIERING_DEEP_ARCHIVE_DAYS])
+                        if TIERING_DEEP_ARCHIVE_DAYS in intelligent_tiering else None,
+                )
+                for configuration_number, intelligent_tiering
+                in enumerate(tiering[TIERING_INTELLIGENT_TIERING] if tiering else [])
+            ] or None,
+            public_read_access=False,
+            removal_policy=self.removal_policy,
+            versioned=True,
+            object_ownership=s3.ObjectOwnership.OBJECT_WRITER,
+            server_access_logs_bucket=access_logs_bucket,
+            server_access_logs_prefix=f'{bucket_name}-',
+            transfer_acceleration=transfer_acceleration or None,
+        )
+        bucket.add_to_resource_policy(
+            iam.PolicyStatement(
+                sid='OnlyAllowSecureTransport',
+                effect=iam.Effect.DENY,
+                principals=[iam.AnyPrincipal()],
+                actions=[
+                    's3:GetObject',
+                    's3:PutObject',
+                ],
+                resources=[f'{bucket.bucket_arn}/*'],
+                conditions={'Bool': {'aws:SecureTransport': 'false'}}
+            )
+        )
+
+        if tiering and tiering[TIERING_STORAGE_CLASS_ANALYSIS]:
+            self.add_storage_class_analysis(bucket, bucket_name, access_logs_bucket,
+                tiering[TIERING_STORAGE_CLASS_ANALYSIS])
+
+        return bucket
+
+    def get_tiering_lifecycle_rules(self, tiering: dict) -> list:
+        """Returns a lifecycle rule for each transition of a tiering policy, filtered by prefix,
+        tags and minimum object size
+
+        Parameters
+        ----------
+        tiering
+            Storage tiering policy of the bucket zone from get_bucket_tiering
+
+        Returns
+        -------
+        list
+            s3.LifecycleRule objects
+        """
+        lifecycle_rules = []
+        for transition in tiering[TIERING_TRANSITIONS]:
+            minimum_object_size = transition.get(TIERING_MINIMUM_OBJECT_SIZE, tiering[TIERING_MINIMUM_OBJECT_SIZE])
+            lifecycle_rules.append(s3.LifecycleRule(
+                enabled=True,
+                prefix=transition.get(TIERING_PREFIX),
+                tag_filters=transition.get(TIERING_TAGS) or None,
+                object_size_greater_than=minimum_object_size or None,
+                transitions=[
+                    s3.Transition(
+                        storage_class=getattr(s3.StorageClass, transition[TIERING_STORAGE_CLASS]),
+                        transition_after=cdk.Duration.days(transition[TIERING_DAYS]),
+                    )
+                ],
+            ))
+
+        return lifecycle_rules
+
+    def add_storage_class_analysis(
+        self,
+        bucket: s3.Bucket,
+        bucket_name: str,
+        export_bucket: s3.Bucket,
+        analyses: list
+    ):
+        """Adds storage class analysis to a bucket using escape hatch, exporting daily results
+        to a prefix of the export bucket
+
+        Parameters
+        ----------
+        bucket
+            The bucket to analyze
+        bucket_name
+            The name of the bucket to analyze, used as the export prefix
+        export_bucket
+            The S3 bucket that receives the analysis exports
+        analyses
+            Storage class analysis settings, each with an optional prefix and tags
+        """
+        export_prefix = f'storage-class-analysis/{bucket_name}/'
+        cfn_bucket = bucket.node.default_child
+        cfn_bucket.analytics_configurations = [
+            s3.CfnBucket.AnalyticsConfigurationProperty(
+                id=f'StorageClassAnalysis{analysis_number + 1}',
+                prefix=analysis.get(TIERING_PREFIX),
+                tag_filters=[
+                    s3.CfnBucket.TagFilterProperty(key=key, value=value)
+                    for key, value in analysis.get(TIERING_TAGS, {}).items()
+                ] or None,
+                storage_class_analysis=s3.CfnBucket.StorageClassAnalysisProperty(
+                    data_export=s3.CfnBucket.DataExportProperty(
+                        output_schema_version='V_1',
+                        destination=s3.CfnBucket.DestinationProperty(
+                            bucket_arn=export_bucket.bucket_arn,
+                            format='CSV',
+                            prefix=export_prefix,
+                        ),
+                    ),
+                ),
+            )
+            for analysis_number, analysis in enumerate(analyses)
+        ]
+
+        export_bucket.add_to_resource_policy(
+            iam.PolicyStatement(
+                principals=[iam.ServicePrincipal('s3.amazonaws.com')],
+                actions=['s3:PutObject'],
+                resources=[export_bucket.arn_for_objects(f'{export_prefix}*')],
+                conditions={
+                    'StringEquals': {'aws:SourceAccount': self.account},
+                    'ArnLike': {'aws:SourceArn': bucket.bucket_arn},
+                },
+            )
+        )
+
+    def create_access_logs_bucket(self, logical_id: str, bucket_name: str) -> s3.Bucket:
+        """Creates an Amazon S3 bucket to store S3 server access logs. It attaches bucket policy
+        with necessary guardrails. It enables server-side encryption using provided KMS key and
+        leverage S3 bucket key feature.
+
+        logical_id
+            The logical id to apply to the bucket
+        bucket_name
+            The name for the bucket resource
+        s3_kms_key
+            The KMS Key to use for encryption of data at rest
+
+        Returns
+        -------
+        s3.Bucket
+            The bucket resource that was created
+        """
+        access_logs_intelligent_tiering = s3.IntelligentTieringConfiguration(
+            name='ServerAccessLogsDeepArchiveConfiguration',
+            archive_access_tier_time=cdk.Duration.days(90),
+            deep_archive_access_tier_time=cdk.Duration.days(180),
+        )
+
+        access_logs_bucket = s3.Bucket(
+            self,
+            id=logical_id,
+            access_control=s3.BucketAccessControl.LOG_DELIVERY_WRITE,
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            enforce_ssl=True,
+            bucket_name=bucket_name,
+            # Server access log buckets only support S3-managed keys
+            # for default bucket encryption
+            encryption=s3.BucketEncryption.S3_MANAGED,
+            public_read_access=False,
+            removal_policy=self.removal_policy,
+            versioned=True,
+            object_ownership=s3.ObjectOwnership.BUCKET_OWNER_PREFERRED,
+            intelligent_tiering_configurations=[
+                access_logs_intelligent_tiering
+            ],
+        )
+
+        return access_logs_bucket
+
+
+class S3BucketZonesStack(DataLakeBucketMixin, cdk.Stack):
     def __init__(
         self, scope: Construct, construct_id: str,
         target_environment: str, deployment_account_id: str,
@@ -36,24 +383,11 @@ class S3BucketZonesStack(cdk.Stack):
         """
         super().__init__(scope, construct_id, **kwargs)
 
-        self.target_environment = target_environment
+        self.set_retention_policy(target_environment)
         mappings = get_environment_configuration(target_environment)
         logical_id_prefix = get_logical_id_prefix()
         resource_name_prefix = get_resource_name_prefix()
 
-        # Default values for Dev
-        self.removal_policy = cdk.RemovalPolicy.DESTROY
-        self.object_expiration_days = cdk.Duration.days(60)
-        self.noncurrent_version_expiration_days = cdk.Duration.days(30)
-        if (target_environment == PROD):
-            self.removal_policy = cdk.RemovalPolicy.RETAIN
-            self.object_expiration_days = cdk.Duration.days(3650)
-            self.noncurrent_version_expiration_days = cdk.Duration.days(180)
-        if (target_environment == TEST):
-            self.removal_policy = cdk.RemovalPolicy.RETAIN
-            self.object_expiration_days = cdk.Duration.days(365)
-            self.noncurrent_version_expiration_days = cdk.Duration.days(90)
-
         s3_kms_key = self.create_kms_key(
             deployment_account_id,
             logical_id_prefix,
@@ -68,20 +402,36 @@ class S3BucketZonesStack(cdk.Stack):
             f'{target_environment.lower()}-{resource_name_prefix}-{self.account}-{self.region}-collect',
             access_logs_bucket,
             s3_kms_key,
+            get_bucket_tiering(mappings, BUCKET_ZONE_COLLECT),
+            transfer_acceleration=mappings.get(COLLECT_TRANSFER_ACCELERATION, False),
         )
         cleanse_bucket = self.create_data_lake_bucket(
             f'{target_environment}{logical_id_prefix}CleanseBucket',
             f'{target_environment.lower()}-{resource_name_prefix}-{self.account}-{self.region}-cleanse',
             access_logs_bucket,
             s3_kms_key,
+            get_bucket_tiering(mappings, BUCKET_ZONE_CLEANSE),
         )
         consume_bucket = self.create_data_lake_bucket(
             f'{target_environment}{logical_id_prefix}ConsumeBucket',
             f'{target_environment.lower()}-{resource_name_prefix}-{self.account}-{self.region}-consume',
             access_logs_bucket,
             s3_kms_key,
+            get_bucket_tiering(mappings, BUCKET_ZONE_CONSUME),
         )
 
+        for bucket in [ collect_bucket, cleanse_bucket, consume_bucket ]:
+            self.add_bucket_reporting(bucket, access_logs_bucket, mappings)
+
+        if mappings.get(REPLICA_REGION):
+            self.add_replication(
+                { BUCKET_ZONE_CLEANSE: cleanse_bucket, BUCKET_ZONE_CONSUME: consume_bucket },
+                mappings,
+                s3_kms_key,
+                logical_id_prefix,
+                resource_name_prefix,
+            )
+
         # Stack Outputs that are programmatically synchronized
         # Specifically, these outputs are imported in the ETL stack using Fn:ImportValue,
         # which expects the values to be present
@@ -117,6 +467,49 @@ class S3BucketZonesStack(cdk.Stack):
             export_name=mappings[S3_PURPOSE_BUILT_BUCKET]
         )
 
+        if mappings.get(COLLECT_TRANSFER_ACCELERATION, False):
+            cdk.CfnOutput(
+                self,
+                f'{target_environment}{logical_id_prefix}CollectBucketAcceleratedEndpoint',
+                value=f'{collect_bucket.bucket_name}.s3-accelerate.amazonaws.com',
+                export_name=mappings[S3_RAW_BUCKET_ACCELERATED_ENDPOINT]
+            )
+
+        if mappings.get(COLLECT_MULTI_REGION_ACCESS_POINT, False):
+            collect_access_point = self.create_multi_region_access_point(
+                f'{target_environment}{logical_id_prefix}CollectMultiRegionAccessPoint',
+                f'{target_environment.lower()}-{resource_name_prefix}-collect',
+                collect_bucket,
+            )
+            cdk.CfnOutput(
+                self,
+                f'{target_environment}{logical_id_prefix}CollectMultiRegionAccessPointArn',
+                value=self.format_arn(
+                    service='s3',
+                    region='',
+                    resource='accesspoint',
+                    resource_name=collect_access_point.attr_alias,
+                ),
+                export_name=mappings[S3_RAW_BUCKET_MULTI_REGION_ACCESS_POINT]
+            )
+
+        for zone in mappings.get(S3_EXPRESS_ZONES, []):
+            if zone not in BUCKET_ZONES:
+                raise AttributeError(f'S3 Express zone {zone} is not one of {BUCKET_ZONES}')
+            directory_bucket = self.create_directory_bucket(
+                f'{target_environment}{logical_id_prefix}{zone.title()}ExpressBucket',
+                f'{target_environment.lower()}-{resource_name_prefix}-{self.account}-{zone}',
+                mappings.get(S3_EXPRESS_AVAILABILITY_ZONE_ID, ''),
+                mappings.get(S3_EXPRESS_ENCRYPTION, S3_EXPRESS_ENCRYPTION_KMS),
+                s3_kms_key,
+            )
+            cdk.CfnOutput(
+                self,
+                f'{target_environment}{logical_id_prefix}{zone.title()}ExpressBucketName',
+                value=directory_bucket.ref,
+                export_name=mappings[S3_EXPRESS_BUCKET_EXPORTS[zone]]
+            )
+
     def create_kms_key(
         self,
         deployment_account_id: str,
@@ -201,125 +594,298 @@ class S3BucketZonesStack(cdk.Stack):
         )
         return s3_kms_key
 
-    def create_data_lake_bucket(
-        self,
-        logical_id: str,
-        bucket_name: str,
-        access_logs_bucket: s3.Bucket,
-        s3_kms_key: kms.Key
-    ) -> s3.Bucket:
-        """Creates an Amazon S3 bucket and attaches bucket policy with necessary guardrails.
-        It enables server-side encryption using provided KMS key and leverage S3 bucket key feature.
+    def add_bucket_reporting(self, bucket: s3.Bucket, report_bucket: s3.Bucket, mappings: dict):
+        """Adds the configured S3 Inventory report and CloudWatch request metrics to a data lake bucket
 
-        logical_id
-            The logical id to apply to the bucket
-        bucket_name
-            The name for the bucket resource
-        access_logs_bucket
-            The S3 bucket resource to target for Access Logging
-        s3_kms_key
-            The KMS Key to use for encryption of data at rest
+        Parameters
+        ----------
+        bucket
+            The data lake bucket to report on
+        report_bucket
+            The S3 bucket that receives the inventory reports
+        mappings
+            Configuration of the target environment
 
-        Returns
-        -------
-        s3.Bucket
-            The bucket resource that was created
+        Raises
+        ------
+        AttributeError
+            If the inventory frequency is not supported
         """
-        lifecycle_rules = [
-            s3.LifecycleRule(
-                enabled=True,
-                expiration=self.object_expiration_days,
-                noncurrent_version_expiration=self.noncurrent_version_expiration_days,
+        inventory_frequency = mappings.get(S3_INVENTORY_FREQUENCY)
+        if inventory_frequency:
+            if inventory_frequency not in S3_INVENTORY_FREQUENCIES:
+                raise AttributeError(f'S3 Inventory frequency {inventory_frequency} is not one of '
+                    f'{S3_INVENTORY_FREQUENCIES}')
+            # Bucket policy allowing S3 to write reports is added to the report bucket
+            bucket.add_inventory(
+                inventory_id='DataLakeInventory',
+                destination=s3.InventoryDestination(bucket=report_bucket, prefix=S3_INVENTORY_PREFIX),
+                format=s3.InventoryFormat.PARQUET,
+                frequency=s3.InventoryFrequency[inventory_frequency],
+                include_object_versions=s3.InventoryObjectVersion.CURRENT,
+                optional_fields=S3_INVENTORY_OPTIONAL_FIELDS,
             )
-        ]
-        if self.target_environment == PROD:
-            lifecycle_rules = [
-                s3.LifecycleRule(
-                    enabled=True,
-                    expiration=self.object_expiration_days,
-                    noncurrent_version_expiration=self.noncurrent_version_expiration_days,
-                    transitions=[
-                        s3.Transition(
-                            storage_class=s3.StorageClass.GLACIER,
-                            transition_after=cdk.Duration.days(365),
-                        )
-                    ]
-                )
-            ]
-        bucket = s3.Bucket(
+
+        for metrics_number, prefix in enumerate(mappings.get(S3_REQUEST_METRICS_PREFIXES, [])):
+            bucket.add_metric(
+                id=f'RequestMetrics{metrics_number + 1}',
+                prefix=prefix or None,
+            )
+
+    def add_replication(
+        self,
+        buckets: dict,
+        mappings: dict,
+        s3_kms_key: kms.Key,
+        logical_id_prefix: str,
+        resource_name_prefix: str
+    ):
+        """Adds Cross-Region Replication from data lake buckets to the replica buckets created by
+        S3ReplicaStack in the replica region, re-encrypting objects with the replica region KMS key.
+        Replica resources are referenced by name because cross-region stack references are not
+        supported.
+
+        Parameters
+        ----------
+        buckets
+            Data lake buckets that can be replicated, keyed by zone
+        mappings
+            Configuration of the target environment
+        s3_kms_key
+            The KMS Key that encrypts the source buckets
+        logical_id_prefix
+            The logical ID prefix to apply to resources
+        resource_name_prefix
+            The resource name prefix used to name the replica resources
+        """
+        replica_region = mappings[REPLICA_REGION]
+        replication_time_control = mappings.get(REPLICATION_TIME_CONTROL, True)
+        replica_kms_key_alias = f'alias/{self.target_environment.lower()}-{resource_name_prefix}-replica-kms-key'
+
+        replication_role = iam.Role(
             self,
-            id=logical_id,
-            access_control=s3.BucketAccessControl.PRIVATE,
-            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
-            enforce_ssl=True,
-            bucket_key_enabled=True,
-            bucket_name=bucket_name,
-            encryption=s3.BucketEncryption.KMS,
-            encryption_key=s3_kms_key,
-            lifecycle_rules=lifecycle_rules,
-            public_read_access=False,
-            removal_policy=self.removal_policy,
-            versioned=True,
-            object_ownership=s3.ObjectOwnership.OBJECT_WRITER,
-            server_access_logs_bucket=access_logs_bucket,
-            server_access_logs_prefix=f'{bucket_name}-',
+            f'{self.target_environment}{logical_id_prefix}ReplicationRole',
+            assumed_by=iam.ServicePrincipal('s3.amazonaws.com'),
+            description='Role used by S3 to replicate data lake buckets to the replica region',
         )
-        bucket.add_to_resource_policy(
+        s3_kms_key.grant_decrypt(replication_role)
+        replication_role.add_to_policy(
             iam.PolicyStatement(
-                sid='OnlyAllowSecureTransport',
-                effect=iam.Effect.DENY,
-                principals=[iam.AnyPrincipal()],
-                actions=[
-                    's3:GetObject',
-                    's3:PutObject',
+                actions=[ 'kms:Encrypt', 'kms:GenerateDataKey' ],
+                resources=[ f'arn:{self.partition}:kms:{replica_region}:{self.account}:key/*' ],
+                conditions={'ForAnyValue:StringEquals': {'kms:ResourceAliases': replica_kms_key_alias}},
+            )
+        )
+
+        for zone in get_replication_zones(mappings):
+            bucket = buckets[zone]
+            replica_bucket_arn = f'arn:{self.partition}:s3:::{self.target_environment.lower()}-' \
+                f'{resource_name_prefix}-{self.account}-{replica_region}-{zone}'
+            replication_role.add_to_policy(
+                iam.PolicyStatement(
+                    actions=[
+                        's3:GetReplicationConfiguration',
+                        's3:ListBucket',
+                        's3:GetObjectVersionForReplication',
+                        's3:GetObjectVersionAcl',
+                        's3:GetObjectVersionTagging',
+                    ],
+                    resources=[ bucket.bucket_arn, bucket.arn_for_objects('*') ],
+                )
+            )
+            replication_role.add_to_policy(
+                iam.PolicyStatement(
+                    actions=[ 's3:ReplicateObject', 's3:ReplicateDelete', 's3:ReplicateTags' ],
+                    resources=[ f'{replica_bucket_arn}/*' ],
+                )
+            )
+
+            replication_time = s3.CfnBucket.ReplicationTimeValueProperty(minutes=REPLICATION_TIME_CONTROL_MINUTES)
+            cfn_bucket = bucket.node.default_child
+            cfn_bucket.replication_configuration = s3.CfnBucket.ReplicationConfigurationProperty(
+                role=replication_role.role_arn,
+                rules=[
+                    s3.CfnBucket.ReplicationRuleProperty(
+                        id=f'{zone.title()}ReplicaRule',
+                        status='Enabled',
+                        priority=0,
+                        filter=s3.CfnBucket.ReplicationRuleFilterProperty(prefix=''),
+                        delete_marker_replication=s3.CfnBucket.DeleteMarkerReplicationProperty(status='Enabled'),
+                        source_selection_criteria=s3.CfnBucket.SourceSelectionCriteriaProperty(
+                            sse_kms_encrypted_objects=s3.CfnBucket.SseKmsEncryptedObjectsProperty(status='Enabled'),
+                        ),
+                        destination=s3.CfnBucket.ReplicationDestinationProperty(
+                            bucket=replica_bucket_arn,
+                            # Alias ARN because the key ARN is not known outside the replica region
+                            encryption_configuration=s3.CfnBucket.EncryptionConfigurationProperty(
+                                replica_kms_key_id=f'arn:{self.partition}:kms:{replica_region}:'
+                                    f'{self.account}:{replica_kms_key_alias}',
+                            ),
+                            # Replication Time Control requires replication metrics
+                            replication_time=s3.CfnBucket.ReplicationTimeProperty(
+                                status='Enabled',
+                                time=replication_time,
+                            ) if replication_time_control else None,
+                            metrics=s3.CfnBucket.MetricsProperty(
+                                status='Enabled',
+                                event_threshold=replication_time,
+                            ) if replication_time_control else None,
+                        ),
+                    )
                 ],
-                resources=[f'{bucket.bucket_arn}/*'],
-                conditions={'Bool': {'aws:SecureTransport': 'false'}}
             )
+
+        NagSuppressions.add_resource_suppressions(replication_role, [
+            {
+                'id': 'AwsSolutions-IAM5',
+                'reason': 'Replication requires access to all objects in the source and replica buckets, '
+                    'and the replica key is only known by its alias',
+            },
+        ], apply_to_children=True)
+
+    def create_multi_region_access_point(
+        self,
+        logical_id: str,
+        name: str,
+        bucket: s3.Bucket
+    ) -> s3.CfnMultiRegionAccessPoint:
+        """Creates an Amazon S3 Multi-Region Access Point for a bucket that routes requests over the
+        AWS global network to the bucket, and blocks all public access. Access is granted through
+        IAM policies in the bucket account.
+
+        logical_id
+            The logical id to apply to the access point
+        name
+            The name for the access point resource
+        bucket
+            The bucket to route requests to
+
+        Raises
+        ------
+        AttributeError
+            If the access point name is too long
+
+        Returns
+        -------
+        s3.CfnMultiRegionAccessPoint
+            The access point resource that was created
+        """
+        if len(name) > MAX_MULTI_REGION_ACCESS_POINT_NAME_LENGTH:
+            raise AttributeError(f'Multi-Region Access Point name {name} is longer than '
+                f'{MAX_MULTI_REGION_ACCESS_POINT_NAME_LENGTH} characters; use a shorter resource name prefix')
+
+        access_point = s3.CfnMultiRegionAccessPoint(
+            self,
+            logical_id,
+            name=name,
+            regions=[
+                s3.CfnMultiRegionAccessPoint.RegionProperty(bucket=bucket.bucket_name),
+            ],
+            public_access_block_configuration=s3.CfnMultiRegionAccessPoint.PublicAccessBlockConfigurationProperty(
+                block_public_acls=True,
+                block_public_policy=True,
+                ignore_public_acls=True,
+                restrict_public_buckets=True,
+            ),
         )
+        access_point.apply_removal_policy(self.removal_policy)
 
-        return bucket
+        return access_point
 
-    def create_access_logs_bucket(self, logical_id: str, bucket_name: str) -> s3.Bucket:
-        """Creates an Amazon S3 bucket to store S3 server access logs. It attaches bucket policy
-        with necessary guardrails. It enables server-side encryption using provided KMS key and
-        leverage S3 bucket key feature.
+    def create_directory_bucket(
+        self,
+        logical_id: str,
+        bucket_base_name: str,
+        availability_zone_id: str,
+        encryption: str,
+        s3_kms_key: kms.Key
+    ) -> s3express.CfnDirectoryBucket:
+        """Creates an Amazon S3 Express One Zone directory bucket in a single availability zone
+        for low latency access from compute in the same availability zone. Objects expire with
+        the same lifecycle as the data lake buckets.
 
         logical_id
             The logical id to apply to the bucket
-        bucket_name
-            The name for the bucket resource
+        bucket_base_name
+            The base name for the bucket resource; the availability zone ID and directory
+            bucket suffix are appended
+        availability_zone_id
+            The availability zone ID (e.g. use1-az4) in the stack region in which to store the data
+        encryption
+            Default encryption, one of S3_EXPRESS_ENCRYPTIONS
         s3_kms_key
-            The KMS Key to use for encryption of data at rest
+            The KMS Key to use for encryption of data at rest with SSE-KMS
+
+        Raises
+        ------
+        AttributeError
+            If the availability zone ID is missing, malformed or not in the stack region, the
+            encryption is not configured correctly, or the bucket name is too long
 
         Returns
         -------
-        s3.Bucket
-            The bucket resource that was created
+        s3express.CfnDirectoryBucket
+            The directory bucket resource that was created
         """
-        access_logs_intelligent_tiering = s3.IntelligentTieringConfiguration(
-            name='ServerAccessLogsDeepArchiveConfiguration',
-            archive_access_tier_time=cdk.Duration.days(90),
-            deep_archive_access_tier_time=cdk.Duration.days(180),
-        )
+        if not availability_zone_id:
+            raise AttributeError(f'{S3_EXPRESS_AVAILABILITY_ZONE_ID} is required to create '
+                'S3 Express One Zone directory buckets')
+        availability_zone_id_match = re.fullmatch(AVAILABILITY_ZONE_ID_PATTERN, availability_zone_id)
+        if not availability_zone_id_match:
+            raise AttributeError(f'{S3_EXPRESS_AVAILABILITY_ZONE_ID} {availability_zone_id} is not an '
+                'availability zone ID, e.g. use1-az4')
+        region_code = get_availability_zone_id_region_code(self.region)
+        if region_code and availability_zone_id_match['region_code'] != region_code:
+            raise AttributeError(f'{S3_EXPRESS_AVAILABILITY_ZONE_ID} {availability_zone_id} is not in '
+                f'region {self.region}; availability zone IDs in this region start with {region_code}-')
+        if encryption not in S3_EXPRESS_ENCRYPTIONS:
+            raise AttributeError(f'S3 Express encryption {encryption} is not one of {S3_EXPRESS_ENCRYPTIONS}')
 
-        access_logs_bucket = s3.Bucket(
+        bucket_name = f'{bucket_base_name}--{availability_zone_id}--x-s3'
+        # Account is a token if the stack environment is not explicit
+        if not cdk.Token.is_unresolved(bucket_name) and len(bucket_name) > MAX_S3_BUCKET_NAME_LENGTH:
+            raise AttributeError(f'Directory bucket name {bucket_name} is longer than '
+                f'{MAX_S3_BUCKET_NAME_LENGTH} characters; use a shorter resource name prefix')
+
+        if encryption == S3_EXPRESS_ENCRYPTION_KMS:
+            server_side_encryption = s3express.CfnDirectoryBucket.ServerSideEncryptionByDefaultProperty(
+                sse_algorithm='aws:kms',
+                # Directory buckets require the key ARN
+                kms_master_key_id=s3_kms_key.key_arn,
+            )
+        else:
+            server_side_encryption = s3express.CfnDirectoryBucket.ServerSideEncryptionByDefaultProperty(
+                sse_algorithm='AES256',
+            )
+
+        directory_bucket = s3express.CfnDirectoryBucket(
             self,
-            id=logical_id,
-            access_control=s3.BucketAccessControl.LOG_DELIVERY_WRITE,
-            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
-            enforce_ssl=True,
+            logical_id,
             bucket_name=bucket_name,
-            # Server access log buckets only support S3-managed keys
-            # for default bucket encryption
-            encryption=s3.BucketEncryption.S3_MANAGED,
-            public_read_access=False,
-            removal_policy=self.removal_policy,
-            versioned=True,
-            object_ownership=s3.ObjectOwnership.BUCKET_OWNER_PREFERRED,
-            intelligent_tiering_configurations=[
-                access_logs_intelligent_tiering
-            ],
+            data_redundancy='SingleAvailabilityZone',
+            location_name=availability_zone_id,
+            bucket_encryption=s3express.CfnDirectoryBucket.BucketEncryptionProperty(
+                server_side_encryption_configuration=[
+                    s3express.CfnDirectoryBucket.ServerSideEncryptionRuleProperty(
+                        # S3 Bucket Keys are always enabled for SSE-KMS in directory buckets
+                        bucket_key_enabled=encryption == S3_EXPRESS_ENCRYPTION_KMS,
+                        server_side_encryption_by_default=server_side_encryption,
+                    )
+                ]
+            ),
+            lifecycle_configuration=s3express.CfnDirectoryBucket.LifecycleConfigurationProperty(
+                rules=[
+                    s3express.CfnDirectoryBucket.RuleProperty(
+                        status='Enabled',
+                        expiration_in_days=self.object_expiration_days.to_days(),
+                        abort_incomplete_multipart_upload=
+                            s3express.CfnDirectoryBucket.AbortIncompleteMultipartUploadProperty(
+                                days_after_initiation=7,
+                            ),
+                    )
+                ]
+            ),
         )
+        directory_bucket.apply_removal_policy(self.removal_policy)
 
-        return access_logs_bucket
\ No newline at end of file
+        return directory_bucket
\ No newline at end of file
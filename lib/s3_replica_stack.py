@@ -0,0 +1,79 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import aws_cdk as cdk
+from constructs import Construct
+import aws_cdk.aws_kms as kms
+
+from .configuration import (
+    S3_REPLICA_KMS_KEY, get_bucket_tiering, get_environment_configuration, get_logical_id_prefix,
+    get_resource_name_prefix,
+)
+from .s3_bucket_zones_stack import DataLakeBucketMixin, S3_REPLICA_BUCKET_EXPORTS, get_replication_zones
+
+
+class S3ReplicaStack(DataLakeBucketMixin, cdk.Stack):
+    def __init__(
+        self, scope: Construct, construct_id: str,
+        target_environment: str,
+        **kwargs
+    ):
+        """CloudFormation stack to create the AWS KMS Key and Amazon S3 replica buckets that receive
+        Cross-Region Replication from the data lake buckets. Deploy in the replica region of the
+        environment, before the S3BucketZonesStack that replicates to it.
+
+        Parameters
+        ----------
+        scope
+            Parent of this stack, usually an App or a Stage, but could be any construct
+        construct_id
+            The construct ID of this stack; if stackName is not explicitly defined,
+            this ID (and any parent IDs) will be used to determine the physical ID of the stack
+        target_environment
+            The target environment for stacks in the deploy stage
+        kwargs: optional
+            Optional keyword arguments to pass up to parent Stack class
+        """
+        super().__init__(scope, construct_id, **kwargs)
+
+        self.set_retention_policy(target_environment)
+        mappings = get_environment_configuration(target_environment)
+        logical_id_prefix = get_logical_id_prefix()
+        resource_name_prefix = get_resource_name_prefix()
+
+        replica_kms_key = kms.Key(
+            self,
+            f'{target_environment}{logical_id_prefix}ReplicaKmsKey',
+            description='Key used for encrypting InsuranceLake S3 replica buckets',
+            removal_policy=self.removal_policy,
+            enable_key_rotation=True,
+            pending_window=cdk.Duration.days(30),
+            # Source buckets reference the key by this alias
+            alias=f'{target_environment.lower()}-{resource_name_prefix}-replica-kms-key',
+        )
+        access_logs_bucket = self.create_access_logs_bucket(
+            f'{target_environment}{logical_id_prefix}ReplicaAccessLogsBucket',
+            f'{target_environment.lower()}-{resource_name_prefix}-{self.account}-{self.region}-access-logs',
+        )
+
+        cdk.CfnOutput(
+            self,
+            f'{target_environment}{logical_id_prefix}ReplicaKmsKeyArn',
+            value=replica_kms_key.key_arn,
+            export_name=mappings[S3_REPLICA_KMS_KEY]
+        )
+
+        for zone in get_replication_zones(mappings):
+            replica_bucket = self.create_data_lake_bucket(
+                f'{target_environment}{logical_id_prefix}{zone.title()}ReplicaBucket',
+                # Must match the destination name used by S3BucketZonesStack.add_replication
+                f'{target_environment.lower()}-{resource_name_prefix}-{self.account}-{self.region}-{zone}',
+                access_logs_bucket,
+                replica_kms_key,
+                get_bucket_tiering(mappings, zone),
+            )
+            cdk.CfnOutput(
+                self,
+                f'{target_environment}{logical_id_prefix}{zone.title()}ReplicaBucketName',
+                value=replica_bucket.bucket_name,
+                export_name=mappings[S3_REPLICA_BUCKET_EXPORTS[zone]]
+            )
\ No newline at end of file
@@ -0,0 +1,109 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import os
+from fnmatch import fnmatchcase
+from typing import Callable
+import aws_cdk as cdk
+from constructs import Construct
+
+from .profiling import synth_phase
+
+# CDK context key and environment variable with a comma-separated list of stack name patterns
+# to construct, e.g. cdk deploy -c stacks='Dev-*' 'Dev-*'
+STACK_SELECTION_CONTEXT_KEY = 'stacks'
+STACK_SELECTION_ENVIRONMENT_VARIABLE = 'STACKS'
+
+
+def get_stack_selection(scope: Construct, default_patterns: list = None) -> list:
+    """Returns the stack name patterns requested for this synth from CDK context or the environment
+
+    Parameters
+    ----------
+    scope
+        Construct used to read CDK context, usually the App
+    default_patterns: optional
+        Patterns to use when no selection is requested; defaults to all stacks
+
+    Returns
+    -------
+    list
+        Stack name patterns (fnmatch syntax), or None to select all stacks
+    """
+    selection = scope.node.try_get_context(STACK_SELECTION_CONTEXT_KEY)
+    if selection is None:
+        selection = os.environ.get(STACK_SELECTION_ENVIRONMENT_VARIABLE)
+    if selection is None:
+        return default_patterns
+
+    if isinstance(selection, str):
+        selection = selection.split(',')
+    patterns = [ pattern.strip() for pattern in selection if pattern.strip() ]
+    return patterns or default_patterns
+
+
+class StackRegistry:
+
+    def __init__(self, scope: Construct, default_patterns: list = None):
+        """Registry of lazily constructed stacks; only stacks matching the requested
+        selection are constructed when build() is called
+
+        Parameters
+        ----------
+        scope
+            Parent of the registered stacks, usually the App
+        default_patterns: optional
+            Stack name patterns to construct when no selection is requested; defaults to all stacks
+        """
+        self.scope = scope
+        self.patterns = get_stack_selection(scope, default_patterns)
+        self.factories = {}
+
+    def register(self, construct_id: str, factory: Callable[[Construct, str], cdk.Stack]):
+        """Registers a factory that constructs a stack; nothing is constructed until build()
+
+        Parameters
+        ----------
+        construct_id
+            The construct ID of the stack, which is matched against the selection patterns
+        factory
+            Callable accepting the scope and construct ID that constructs and returns the stack
+        """
+        if construct_id in self.factories:
+            raise AttributeError(f'Stack {construct_id} is already registered')
+        self.factories[construct_id] = factory
+
+    def is_selected(self, construct_id: str) -> bool:
+        """Checks if a stack matches the requested selection. Patterns that include a stage path
+        (e.g. Dev-*/Dev/*) select the top-level stack that contains the stage
+
+        Parameters
+        ----------
+        construct_id
+            The construct ID of the stack
+
+        Returns
+        -------
+        bool
+            True if the stack should be constructed
+        """
+        if self.patterns is None:
+            return True
+        return any(
+            fnmatchcase(construct_id, pattern.split('/')[0])
+            for pattern in self.patterns
+        )
+
+    def build(self) -> dict:
+        """Constructs all selected stacks in registration order
+
+        Returns
+        -------
+        dict
+            Constructed stacks keyed by construct ID
+        """
+        stacks = {}
+        for construct_id, factory in self.factories.items():
+            if self.is_selected(construct_id):
+                with synth_phase(construct_id):
+                    stacks[construct_id] = factory(self.scope, construct_id)
+        return stacks
\ No newline at end of file
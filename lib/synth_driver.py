@@ -0,0 +1,249 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+"""Parallel synth driver: synthesizes each stack selection group of app.py in its own process
+and output directory, then merges the cloud assemblies into a single output directory.
+
+Use directly, or as the CDK app command so that cdk deploy consumes the merged assembly:
+    python3 -m lib.synth_driver --outdir cdk.out
+    cdk synth --app 'python3 -m lib.synth_driver'
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import filecmp
+import shlex
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from .configuration import DEPLOYMENT, DEV, TEST, PROD
+from .stack_registry import STACK_SELECTION_CONTEXT_KEY, STACK_SELECTION_ENVIRONMENT_VARIABLE
+
+MANIFEST_FILE = 'manifest.json'
+TREE_FILE = 'tree.json'
+VALIDATION_REPORT_FILE = 'validation-report.json'
+
+
+def get_synth_groups(context: dict) -> list:
+    """Returns the stack selection patterns to synthesize, one process per pattern
+
+    Parameters
+    ----------
+    context
+        CDK context passed to the app
+
+    Returns
+    -------
+    list
+        Stack name patterns, each synthesized in a separate process
+    """
+    selection = context.get(STACK_SELECTION_CONTEXT_KEY, os.environ.get(STACK_SELECTION_ENVIRONMENT_VARIABLE))
+    if selection:
+        if isinstance(selection, str):
+            selection = selection.split(',')
+        return [ pattern.strip() for pattern in selection if pattern.strip() ]
+
+    # Match the legacy ENV selection in app.py
+    if 'ENV' in os.environ:
+        return [ f'{os.environ["ENV"]}-*', f'{DEPLOYMENT}-*' ]
+
+    return [ f'{environment}-*' for environment in [ DEPLOYMENT, DEV, TEST, PROD ] ]
+
+
+def run_app(app_command: list, context: dict, outdir: str, unset_variables: list = None):
+    """Runs the CDK app in a separate process with the given context and output directory
+
+    Parameters
+    ----------
+    app_command
+        Command and arguments that run the CDK app
+    context
+        CDK context passed to the app
+    outdir
+        Cloud assembly output directory
+    unset_variables: optional
+        Environment variables to remove so they do not override the context
+
+    Raises
+    ------
+    RuntimeError
+        If the CDK app exits with an error
+    """
+    app_environment = dict(os.environ)
+    for variable in unset_variables or []:
+        app_environment.pop(variable, None)
+    app_environment['CDK_OUTDIR'] = outdir
+    app_environment['CDK_CONTEXT_JSON'] = json.dumps(context)
+
+    result = subprocess.run(app_command, env=app_environment, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'Synth with context {context} failed with exit code '
+            f'{result.returncode}:\n{result.stderr}')
+
+
+def synth_group(app_command: list, pattern: str, context: dict, outdir: str):
+    """Synthesizes the stacks matching one selection pattern into its own output directory
+
+    Parameters
+    ----------
+    app_command
+        Command and arguments that run the CDK app
+    pattern
+        Stack selection pattern passed to the app through CDK context
+    context
+        CDK context passed to the app
+    outdir
+        Cloud assembly output directory for this group
+
+    Raises
+    ------
+    RuntimeError
+        If the CDK app exits with an error
+    """
+    run_app(
+        app_command,
+        { **context, STACK_SELECTION_CONTEXT_KEY: pattern },
+        outdir,
+        unset_variables=[ STACK_SELECTION_ENVIRONMENT_VARIABLE ],
+    )
+
+
+def merge_manifest(merged: dict, manifest: dict):
+    """Merges a cloud assembly manifest into the merged manifest in place
+
+    Raises
+    ------
+    RuntimeError
+        If two assemblies define the same artifact differently
+    """
+    for key, value in manifest.items():
+        if key == 'artifacts':
+            merged_artifacts = merged.setdefault('artifacts', {})
+            for artifact_id, artifact in value.items():
+                if artifact_id in merged_artifacts and artifact_id != 'Tree' \
+                        and merged_artifacts[artifact_id] != artifact:
+                    raise RuntimeError(f'Artifact {artifact_id} differs between synth groups')
+                merged_artifacts[artifact_id] = artifact
+        elif key == 'missing':
+            merged_missing = merged.setdefault('missing', [])
+            for missing_context in value:
+                if missing_context not in merged_missing:
+                    merged_missing.append(missing_context)
+        else:
+            merged.setdefault(key, value)
+
+
+def merge_tree(merged: dict, tree: dict):
+    """Merges the top-level construct children of a construct tree into the merged tree in place
+    """
+    if not merged:
+        merged.update(tree)
+        return
+    merged['tree'].setdefault('children', {}).update(tree['tree'].get('children', {}))
+
+
+def merge_validation_report(merged: dict, report: dict):
+    """Merges policy validation plugin reports into the merged report in place
+    """
+    if not merged:
+        merged.update(report)
+        return
+    merged_plugins = { plugin['pluginName']: plugin for plugin in merged.get('pluginReports', []) }
+    for plugin in report.get('pluginReports', []):
+        if plugin['pluginName'] not in merged_plugins:
+            merged.setdefault('pluginReports', []).append(plugin)
+            merged_plugins[plugin['pluginName']] = plugin
+            continue
+        merged_plugin = merged_plugins[plugin['pluginName']]
+        for key in [ 'violations', 'suppressedViolations' ]:
+            merged_plugin.setdefault(key, []).extend(plugin.get(key, []))
+        if plugin.get('conclusion') != 'success':
+            merged_plugin['conclusion'] = plugin.get('conclusion')
+
+
+def merge_assemblies(assembly_dirs: list, outdir: str):
+    """Merges multiple cloud assembly directories into a single cloud assembly
+
+    Parameters
+    ----------
+    assembly_dirs
+        Cloud assembly directories to merge
+    outdir
+        Output directory for the merged cloud assembly
+
+    Raises
+    ------
+    RuntimeError
+        If two assemblies contain the same file with different content
+    """
+    json_mergers = {
+        MANIFEST_FILE: merge_manifest,
+        TREE_FILE: merge_tree,
+        VALIDATION_REPORT_FILE: merge_validation_report,
+    }
+    merged_json = { file_name: {} for file_name in json_mergers }
+
+    os.makedirs(outdir, exist_ok=True)
+    copied_files = set()
+    for assembly_dir in assembly_dirs:
+        for root, _, files in os.walk(assembly_dir):
+            relative_root = os.path.relpath(root, assembly_dir)
+            for file_name in files:
+                source_path = os.path.join(root, file_name)
+                relative_path = os.path.normpath(os.path.join(relative_root, file_name))
+                if relative_path in json_mergers:
+                    with open(source_path, encoding='utf-8') as json_file:
+                        json_mergers[relative_path](merged_json[relative_path], json.load(json_file))
+                    continue
+
+                target_path = os.path.join(outdir, relative_path)
+                if relative_path in copied_files:
+                    if not filecmp.cmp(source_path, target_path, shallow=False):
+                        raise RuntimeError(f'Cloud assembly file {relative_path} differs between synth groups')
+                    continue
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+                shutil.copy2(source_path, target_path)
+                copied_files.add(relative_path)
+
+    # Write the manifest last so a partially merged directory is never a valid assembly
+    for file_name in [ TREE_FILE, VALIDATION_REPORT_FILE, MANIFEST_FILE ]:
+        if merged_json[file_name]:
+            with open(os.path.join(outdir, file_name), 'w', encoding='utf-8') as json_file:
+                json.dump(merged_json[file_name], json_file, indent=2)
+
+
+def main(argv: list = None):
+    """Synthesizes all stack selection groups in parallel and merges the cloud assemblies
+    """
+    parser = argparse.ArgumentParser(description='Synthesize app.py stacks in parallel processes')
+    parser.add_argument('--outdir', default=os.environ.get('CDK_OUTDIR', 'cdk.out'),
+        help='Merged cloud assembly output directory (default: CDK_OUTDIR or cdk.out)')
+    parser.add_argument('--app', default=f'{sys.executable} app.py',
+        help='Command that runs the CDK app (default: current Python interpreter with app.py)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count(),
+        help='Maximum number of concurrent synth processes (default: number of CPUs)')
+    args = parser.parse_args(argv)
+
+    context = json.loads(os.environ.get('CDK_CONTEXT_JSON', '{}'))
+    groups = get_synth_groups(context)
+
+    with tempfile.TemporaryDirectory(prefix='synth-driver-') as work_dir:
+        group_outdirs = [ os.path.join(work_dir, str(group_number)) for group_number in range(len(groups)) ]
+        with ThreadPoolExecutor(max_workers=args.max_workers) as executor:
+            futures = [
+                executor.submit(synth_group, shlex.split(args.app), pattern, context, group_outdir)
+                for pattern, group_outdir in zip(groups, group_outdirs)
+            ]
+            for future in futures:
+                future.result()
+
+        merge_assemblies(
+            [ group_outdir for group_outdir in group_outdirs if os.path.isdir(group_outdir) ],
+            args.outdir
+        )
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
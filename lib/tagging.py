@@ -1,7 +1,10 @@
 # Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
 # SPDX-License-Identifier: MIT-0
+from types import MappingProxyType
+from typing import Mapping
 import aws_cdk as cdk
 
+from .profiling import is_profiling_enabled, profiled_aspect
 from .configuration import (
     get_logical_id_prefix, get_resource_name_prefix, get_all_configurations
 )
@@ -12,64 +15,138 @@ TAG_ENVIRONMENT = 'TAG_ENVIRONMENT'
 TEAM = 'TEAM'
 APPLICATION = 'APPLICATION'
 
+# Frozen tag tables keyed by target environment, built once per configuration snapshot;
+# configuration.clear_configuration_cache() also clears them
+_tag_table_cache = {}
+# Extra tags registered by callers: tag name -> (key suffix, value, target environment or None for all)
+_registered_tags = {}
+
+
+def clear_tag_cache():
+    """Invalidates the precomputed tag tables so they are rebuilt on next use
+    """
+    _tag_table_cache.clear()
+
+
+def clear_registered_tags():
+    """Removes all tags added with register_tag and invalidates the precomputed tag tables
+    """
+    _registered_tags.clear()
+    clear_tag_cache()
+
+
+def register_tag(tag_name: str, key_suffix: str, value: str, target_environment: str = None):
+    """Adds or overrides a tag applied by tag(), e.g. cost center or data classification
+
+    tag_name
+        The name of the tag in the tag table (existing names are overridden)
+    key_suffix
+        The tag key to append to the resource name prefix, e.g. data-classification
+    value
+        The tag value
+    target_environment: optional
+        Only apply the tag to stacks in this environment; defaults to all environments
+    """
+    _registered_tags[(tag_name, target_environment)] = (key_suffix, value)
+    clear_tag_cache()
+
 
 def tag(stack: cdk.Stack, target_environment: str):
-    """Adds a tag to all constructs in the stack
+    """Adds all tags in the precomputed tag table to all constructs in the stack. Each tag is a
+    separate CDK Tag aspect; these run entirely in the JSII runtime, which is cheaper than a
+    single Python aspect that would need a JSII callback for every construct in the stack
 
     stack
         CDK stack construct to tag
     target_environment
         The environment the stack is deployed to (for tag values)
     """
-    cdk.Tags.of(stack).add(*get_tag(COST_CENTER, target_environment))
-    cdk.Tags.of(stack).add(*get_tag(TAG_ENVIRONMENT, target_environment))
-    cdk.Tags.of(stack).add(*get_tag(TEAM, target_environment))
-    cdk.Tags.of(stack).add(*get_tag(APPLICATION, target_environment))
+    stack_tags = cdk.Tags.of(stack)
+    for tag_key, tag_value in get_tag_table(target_environment).values():
+        if is_profiling_enabled():
+            # Same aspect and priority that Tags.add() uses, wrapped to time its visits
+            cdk.Aspects.of(stack).add(
+                profiled_aspect(cdk.Tag(tag_key, tag_value), 'tagging'),
+                priority=cdk.AspectPriority.MUTATING,
+            )
+        else:
+            stack_tags.add(tag_key, tag_value)
+
+
+def get_tag_table(target_environment: str) -> Mapping:
+    """Get the frozen tag table for a target environment, building it only on first use
+
+    target_environment
+        The environment the tags are applied to (for tag values)
+
+    Raises
+    ------
+    AttributeError
+        If target environment is not present in the environment configurations
+
+    Returns
+    -------
+    Mapping
+        Read-only mapping of tag name to key, value pair
+    """
+    if target_environment not in _tag_table_cache:
+        mapping = get_all_configurations()
+        if target_environment not in mapping:
+            raise AttributeError(f'Target environment {target_environment} not found in environment configurations')
+
+        logical_id_prefix = get_logical_id_prefix()
+        resource_name_prefix = get_resource_name_prefix()
+        tag_map = {
+            COST_CENTER: (
+                f'{resource_name_prefix}:cost-center',
+                f'{logical_id_prefix}Infrastructure',
+            ),
+            TAG_ENVIRONMENT: (
+                f'{resource_name_prefix}:environment',
+                target_environment,
+            ),
+            TEAM: (
+                f'{resource_name_prefix}:team',
+                f'{logical_id_prefix}Admin',
+            ),
+            APPLICATION: (
+                f'{resource_name_prefix}:application',
+                f'{logical_id_prefix}Infrastructure',
+            ),
+        }
+
+        # Environment-specific registrations take precedence over global ones
+        for (tag_name, tag_environment), (key_suffix, value) in sorted(
+            _registered_tags.items(), key=lambda registration: registration[0][1] is not None
+        ):
+            if tag_environment in (None, target_environment):
+                tag_map[tag_name] = (f'{resource_name_prefix}:{key_suffix}', value)
+
+        _tag_table_cache[target_environment] = MappingProxyType(tag_map)
+
+    return _tag_table_cache[target_environment]
 
 
-def get_tag(tag_name: str, target_environment: str) -> dict:
+def get_tag(tag_name: str, target_environment: str) -> tuple:
     """Get a tag for a given parameter and target environment.
 
     tag_name
-        The name of the tag (must exist in tag_map)
+        The name of the tag (must exist in the tag table)
     target_environment
         The environment the tag is applied to (for tag values)
 
     Raises
     ------
     AttributeError
-        If target environment or tag name is not present in the tag_map below
+        If target environment or tag name is not present in the tag table
 
     Returns
     -------
-    dict
-        key, value pair for each tag and tag value
+    tuple
+        key, value pair for the tag
     """
-    mapping = get_all_configurations()
-    if target_environment not in mapping:
-        raise AttributeError(f'Target environment {target_environment} not found in environment configurations')
-
-    logical_id_prefix = get_logical_id_prefix()
-    resource_name_prefix = get_resource_name_prefix()
-    tag_map = {
-        COST_CENTER: [
-            f'{resource_name_prefix}:cost-center',
-            f'{logical_id_prefix}Infrastructure',
-        ],
-        TAG_ENVIRONMENT: [
-            f'{resource_name_prefix}:environment',
-            target_environment,
-        ],
-        TEAM: [
-            f'{resource_name_prefix}:team',
-            f'{logical_id_prefix}Admin',
-        ],
-        APPLICATION: [
-            f'{resource_name_prefix}:application',
-            f'{logical_id_prefix}Infrastructure',
-        ],
-    }
-    if tag_name not in tag_map:
+    tag_table = get_tag_table(target_environment)
+    if tag_name not in tag_table:
         raise AttributeError(f'Tag map does not contain a key/value for {tag_name}')
 
-    return tag_map[tag_name]
\ No newline at end of file
+    return tag_table[tag_name]
\ No newline at end of file
@@ -0,0 +1,210 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+"""Template fingerprints: detect which synthesized stacks changed since their last deployment.
+
+Compare the stacks in a cloud assembly with the fingerprints recorded after the last deployment
+(prints true if any selected stack changed), and record fingerprints after a successful deployment:
+    python3 -m lib.template_fingerprint check --store fingerprints/Dev.json --stacks 'Dev-*/Dev/*'
+    python3 -m lib.template_fingerprint record --store fingerprints/Dev.json --stacks 'Dev-*/Dev/*'
+
+The store is a JSON file on the local file system or an s3:// URI. S3 access uses the AWS CLI,
+so set AWS_ENDPOINT_URL_S3 to use a local S3 stand-in. Only the standard library is used so the
+module runs in CodeBuild without installing the application requirements.
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+import subprocess
+from fnmatch import fnmatchcase
+
+MANIFEST_FILE = 'manifest.json'
+ASSET_MANIFEST_TYPES = [ 'files', 'dockerImages' ]
+
+
+def read_manifest(assembly_dir: str) -> dict:
+    """Returns the manifest of a cloud assembly directory
+    """
+    with open(os.path.join(assembly_dir, MANIFEST_FILE), encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def get_stack_artifacts(assembly_dir: str) -> dict:
+    """Returns all stack artifacts in a cloud assembly, including nested Stage assemblies
+
+    Parameters
+    ----------
+    assembly_dir
+        Cloud assembly directory
+
+    Returns
+    -------
+    dict
+        Tuple of assembly directory and artifact keyed by stack display name (construct path)
+    """
+    stack_artifacts = {}
+    for artifact_id, artifact in read_manifest(assembly_dir).get('artifacts', {}).items():
+        if artifact['type'] == 'aws:cloudformation:stack':
+            stack_artifacts[artifact.get('displayName', artifact_id)] = (assembly_dir, artifact)
+        elif artifact['type'] == 'cdk:cloud-assembly':
+            stack_artifacts.update(get_stack_artifacts(
+                os.path.join(assembly_dir, artifact['properties']['directoryName'])
+            ))
+
+    return stack_artifacts
+
+
+def get_stack_fingerprints(assembly_dir: str, patterns: list = None) -> dict:
+    """Returns a fingerprint of each stack in a cloud assembly that covers the template, the
+    deployment properties (parameters, tags, roles) and the assets the stack publishes
+
+    Parameters
+    ----------
+    assembly_dir
+        Cloud assembly directory
+    patterns: optional
+        Stack display name patterns (fnmatch syntax) to fingerprint; all stacks if not specified
+
+    Returns
+    -------
+    dict
+        SHA-256 fingerprint keyed by stack display name
+    """
+    manifests = {}
+    fingerprints = {}
+    for stack_name, (stack_assembly_dir, artifact) in get_stack_artifacts(assembly_dir).items():
+        if patterns and not any(fnmatchcase(stack_name, pattern) for pattern in patterns):
+            continue
+        if stack_assembly_dir not in manifests:
+            manifests[stack_assembly_dir] = read_manifest(stack_assembly_dir).get('artifacts', {})
+
+        fingerprint = hashlib.sha256()
+        with open(os.path.join(stack_assembly_dir, artifact['properties']['templateFile']), 'rb') as template:
+            fingerprint.update(template.read())
+        fingerprint.update(json.dumps(artifact['properties'], sort_keys=True).encode())
+
+        # Asset IDs are hashes of the asset source, so any change to asset content changes them
+        for dependency_id in sorted(artifact.get('dependencies', [])):
+            dependency = manifests[stack_assembly_dir].get(dependency_id, {})
+            if dependency.get('type') != 'cdk:asset-manifest':
+                continue
+            with open(os.path.join(stack_assembly_dir, dependency['properties']['file']), encoding='utf-8') \
+                    as asset_manifest_file:
+                asset_manifest = json.load(asset_manifest_file)
+            for asset_type in ASSET_MANIFEST_TYPES:
+                fingerprint.update(json.dumps(sorted(asset_manifest.get(asset_type, {}))).encode())
+
+        fingerprints[stack_name] = fingerprint.hexdigest()
+
+    return fingerprints
+
+
+def read_fingerprints(store: str) -> dict:
+    """Returns the recorded fingerprints from a local file or S3 URI; empty if nothing was recorded
+
+    Raises
+    ------
+    RuntimeError
+        If the S3 object exists but cannot be read
+    """
+    if store.startswith('s3://'):
+        result = subprocess.run([ 'aws', 's3', 'cp', store, '-' ], capture_output=True, text=True)
+        if result.returncode != 0:
+            if '(404)' in result.stderr or 'NoSuchKey' in result.stderr:
+                return {}
+            raise RuntimeError(f'Unable to read fingerprints from {store}:\n{result.stderr}')
+        return json.loads(result.stdout)
+
+    if not os.path.exists(store):
+        return {}
+    with open(store, encoding='utf-8') as store_file:
+        return json.load(store_file)
+
+
+def write_fingerprints(store: str, fingerprints: dict):
+    """Writes fingerprints to a local file or S3 URI
+
+    Raises
+    ------
+    RuntimeError
+        If the S3 object cannot be written
+    """
+    document = json.dumps(fingerprints, indent=2, sort_keys=True)
+    if store.startswith('s3://'):
+        result = subprocess.run([ 'aws', 's3', 'cp', '-', store ], input=document, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f'Unable to write fingerprints to {store}:\n{result.stderr}')
+        return
+
+    if os.path.dirname(store):
+        os.makedirs(os.path.dirname(store), exist_ok=True)
+    with open(store, 'w', encoding='utf-8') as store_file:
+        store_file.write(document)
+
+
+def get_changed_stacks(assembly_dir: str, store: str, patterns: list = None) -> list:
+    """Returns the selected stacks whose fingerprint differs from the recorded fingerprint
+
+    Parameters
+    ----------
+    assembly_dir
+        Cloud assembly directory
+    store
+        Local file path or S3 URI of the recorded fingerprints
+    patterns: optional
+        Stack display name patterns (fnmatch syntax) to compare; all stacks if not specified
+
+    Returns
+    -------
+    list
+        Display names of new and changed stacks
+    """
+    recorded_fingerprints = read_fingerprints(store)
+    return [
+        stack_name
+        for stack_name, fingerprint in get_stack_fingerprints(assembly_dir, patterns).items()
+        if recorded_fingerprints.get(stack_name) != fingerprint
+    ]
+
+
+def record_fingerprints(assembly_dir: str, store: str, patterns: list = None) -> dict:
+    """Records the fingerprints of the selected stacks, keeping recorded fingerprints of other stacks
+
+    Returns
+    -------
+    dict
+        All recorded fingerprints keyed by stack display name
+    """
+    fingerprints = { **read_fingerprints(store), **get_stack_fingerprints(assembly_dir, patterns) }
+    write_fingerprints(store, fingerprints)
+    return fingerprints
+
+
+def main(argv: list = None) -> int:
+    """Checks for changed stacks (prints true or false) or records fingerprints after a deployment
+    """
+    parser = argparse.ArgumentParser(description='Compare or record fingerprints of synthesized stacks')
+    parser.add_argument('command', choices=[ 'check', 'record' ])
+    parser.add_argument('--assembly', default=os.environ.get('CDK_OUTDIR', 'cdk.out'),
+        help='Cloud assembly directory (default: CDK_OUTDIR or cdk.out)')
+    parser.add_argument('--store', required=True,
+        help='Local file path or s3:// URI of the recorded fingerprints')
+    parser.add_argument('--stacks', action='append',
+        help='Stack display name pattern to include; repeat for multiple patterns (default: all stacks)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        record_fingerprints(args.assembly, args.store, args.stacks)
+        return 0
+
+    changed_stacks = get_changed_stacks(args.assembly, args.store, args.stacks)
+    for stack_name in changed_stacks:
+        print(f'Changed: {stack_name}', file=sys.stderr)
+    # Output is captured into a pipeline variable
+    print('true' if changed_stacks else 'false')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
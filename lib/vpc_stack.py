@@ -4,11 +4,21 @@ import aws_cdk as cdk
 from constructs import Construct
 import aws_cdk.aws_ec2 as ec2
 import aws_cdk.aws_logs as logs
+import aws_cdk.aws_iam as iam
+import aws_cdk.aws_route53profiles as route53profiles
+from cdk_nag import NagSuppressions
 
 from .configuration import (
-    AVAILABILITY_ZONE_1, AVAILABILITY_ZONE_2, AVAILABILITY_ZONE_3, ROUTE_TABLE_1, ROUTE_TABLE_2, ROUTE_TABLE_3,
-    SHARED_SECURITY_GROUP_ID, SUBNET_ID_1, SUBNET_ID_2, SUBNET_ID_3, VPC_CIDR, VPC_ID, PROD, TEST,
-    get_environment_configuration, get_logical_id_prefix
+    AVAILABILITY_ZONE_N, ROUTE_TABLE_N, SHARED_SECURITY_GROUP_ID, SUBNET_ID_N, VPC_CIDR, VPC_ID, PROD, TEST,
+    VPC_TOPOLOGY_AVAILABILITY_ZONES, VPC_TOPOLOGY_SUBNET_MASKS, VPC_TOPOLOGY_NAT, VPC_TOPOLOGY_NAT_INSTANCE_TYPE,
+    VPC_TOPOLOGY_DUAL_STACK, VPC_IPV6_CIDR, SUBNET_IPV6_CIDR_N,
+    VPC_SUBNET_TIER_PUBLIC, VPC_SUBNET_TIER_PRIVATE, VPC_SUBNET_TIER_ISOLATED,
+    VPC_NAT_SHARED, VPC_NAT_INSTANCE, VPC_NAT_NONE,
+    VPC_INTERFACE_ENDPOINTS, VPC_ENDPOINT_POLICIES, VPC_GATEWAY_ENDPOINTS, DEFAULT_VPC_INTERFACE_ENDPOINTS,
+    S3_INTERFACE_ENDPOINT, S3_INTERFACE_ENDPOINT_CLIENT_CIDRS, S3_INTERFACE_ENDPOINT_ID,
+    S3_INTERFACE_ENDPOINT_DNS_NAME, S3_INTERFACE_ENDPOINT_DNS_ENTRIES, DEPLOYMENT, ENDPOINT_HUB_VPC_CIDR,
+    ENDPOINT_HUB_TRANSIT_GATEWAY_ID, ENDPOINT_HUB_ROUTE53_PROFILE_ID,
+    get_environment_configuration, get_logical_id_prefix, get_vpc_topology
 )
 
 
@@ -38,20 +48,24 @@ class VpcStack(cdk.Stack):
         Raises
         ------
         RuntimeError
-            If environment settings cause less than 3 AZs to be created with the VPC
+            If environment settings cause less than the configured number of AZs to be created with the VPC
         """
         super().__init__(scope, construct_id, env=env, **kwargs)
 
         # Reference: https://docs.aws.amazon.com/cdk/api/v2/docs/aws-cdk-lib.aws_ec2.Vpc.html#maxazs
         if env.account is None or env.region is None:
             raise RuntimeError(f'Supplied env parameter {env} does not contain account or region; '
-                'stack requires explicit account and region so that VPC is created with 3 availability '
-                'zones which are expected by the ETL resource stacks (imported values)')
+                'stack requires explicit account and region so that VPC is created with the configured '
+                'number of availability zones which are expected by the ETL resource stacks (imported values)')
 
         self.target_environment = target_environment
         self.mappings = get_environment_configuration(target_environment)
         self.logical_id_prefix = get_logical_id_prefix()
         vpc_cidr = self.mappings[VPC_CIDR]
+        self.vpc_topology = get_vpc_topology(self.mappings)
+        availability_zones = self.vpc_topology[VPC_TOPOLOGY_AVAILABILITY_ZONES]
+        self.dual_stack = self.vpc_topology[VPC_TOPOLOGY_DUAL_STACK]
+        nat_settings = self.get_nat_settings()
         if (target_environment == PROD or target_environment == TEST):
             self.removal_policy = cdk.RemovalPolicy.RETAIN
             self.log_retention = logs.RetentionDays.SIX_MONTHS
@@ -64,11 +78,18 @@ class VpcStack(cdk.Stack):
             f'{self.logical_id_prefix}Vpc',
             vpc_name=f'{target_environment}{self.logical_id_prefix}Vpc',
             ip_addresses=ec2.IpAddresses.cidr(vpc_cidr),
-            max_azs=3,
+            max_azs=availability_zones,
+            subnet_configuration=self.get_subnet_configuration(),
+            # Dual stack adds an Amazon-provided /56 IPv6 CIDR, a /64 per subnet, and an egress-only
+            # internet gateway for IPv6 traffic from private subnets
+            ip_protocol=ec2.IpProtocol.DUAL_STACK if self.dual_stack else ec2.IpProtocol.IPV4_ONLY,
+            **nat_settings,
         )
-        if len(self.vpc.availability_zones) < 3:
-            raise RuntimeError(f'Selected region {env.region} provides less than 3 availability zones '
-                'for the VPC, which are expected by the ETL resource stacks (imported values)')
+        if len(self.vpc.availability_zones) < availability_zones:
+            raise RuntimeError(f'Selected region {env.region} provides less than {availability_zones} '
+                'availability zones for the VPC, which are expected by the ETL resource stacks (imported values)')
+        if 'nat_gateway_provider' in nat_settings:
+            self.configure_nat_instances(nat_settings['nat_gateway_provider'])
 
         cloudwatch_flow_log_group = logs.LogGroup(
             self,
@@ -90,6 +111,7 @@ class VpcStack(cdk.Stack):
             vpc=self.vpc,
             description='Shared Security Group for Data Lake resources with self-referencing ingress rule.',
             allow_all_outbound=True,    # Change to False to explicityly allow outbound traffic
+            allow_all_ipv6_outbound=self.dual_stack,
         )
         self.shared_security_group.add_ingress_rule(
             peer=self.shared_security_group,
@@ -97,30 +119,226 @@ class VpcStack(cdk.Stack):
             description='Self-referencing ingress rule',
         )
 
+        self.is_spoke = bool(self.mappings.get(ENDPOINT_HUB_TRANSIT_GATEWAY_ID))
         self.add_vpc_endpoints()
+        if self.is_spoke:
+            self.add_endpoint_hub_attachment()
         self.add_cloudformation_exports()
 
 
+    def get_subnet_configuration(self) -> list:
+        """Returns the subnet tiers of the VPC topology: public and private subnets with NAT, or
+        isolated subnets only without NAT, plus isolated subnets if the topology specifies their mask
+
+        Returns
+        -------
+        list
+            Subnet configurations to create in each availability zone
+        """
+        subnet_masks = self.vpc_topology[VPC_TOPOLOGY_SUBNET_MASKS]
+        subnet_tiers = {}
+        if self.vpc_topology[VPC_TOPOLOGY_NAT] != VPC_NAT_NONE:
+            subnet_tiers[VPC_SUBNET_TIER_PUBLIC] = ec2.SubnetType.PUBLIC
+            subnet_tiers[VPC_SUBNET_TIER_PRIVATE] = ec2.SubnetType.PRIVATE_WITH_EGRESS
+        if self.vpc_topology[VPC_TOPOLOGY_NAT] == VPC_NAT_NONE or VPC_SUBNET_TIER_ISOLATED in subnet_masks:
+            subnet_tiers[VPC_SUBNET_TIER_ISOLATED] = ec2.SubnetType.PRIVATE_ISOLATED
+
+        # Subnet names match the CDK default subnet configuration so that default topologies
+        # keep their logical IDs
+        subnet_names = {
+            VPC_SUBNET_TIER_PUBLIC: 'Public',
+            VPC_SUBNET_TIER_PRIVATE: 'Private',
+            VPC_SUBNET_TIER_ISOLATED: 'Isolated',
+        }
+        return [
+            ec2.SubnetConfiguration(
+                name=subnet_names[tier],
+                subnet_type=subnet_type,
+                cidr_mask=subnet_masks.get(tier),
+            )
+            for tier, subnet_type in subnet_tiers.items()
+        ]
+
+
+    def get_nat_settings(self) -> dict:
+        """Returns the NAT gateway count and provider for the NAT strategy of the VPC topology;
+        CDK defaults to a NAT gateway per availability zone
+
+        Returns
+        -------
+        dict
+            Keyword arguments for the VPC construct
+        """
+        nat_strategy = self.vpc_topology[VPC_TOPOLOGY_NAT]
+        if nat_strategy == VPC_NAT_SHARED:
+            return { 'nat_gateways': 1 }
+        if nat_strategy == VPC_NAT_NONE:
+            return { 'nat_gateways': 0 }
+        if nat_strategy == VPC_NAT_INSTANCE:
+            return {
+                'nat_gateway_provider': ec2.NatProvider.instance_v2(
+                    instance_type=ec2.InstanceType(self.vpc_topology[VPC_TOPOLOGY_NAT_INSTANCE_TYPE]),
+                    default_allowed_traffic=ec2.NatTrafficDirection.OUTBOUND_ONLY,
+                ),
+            }
+        return {}
+
+
+    def configure_nat_instances(self, nat_instance_provider: ec2.NatInstanceProviderV2):
+        """Enables detailed monitoring and root volume encryption for NAT instances
+
+        Parameters
+        ----------
+        nat_instance_provider
+            NAT instance provider used by the VPC
+        """
+        for nat_instance in nat_instance_provider.gateway_instances:
+            cfn_instance = nat_instance.node.default_child
+            cfn_instance.monitoring = True
+            # Root device name of the default Amazon Linux 2023 NAT instance image
+            cfn_instance.block_device_mappings = [
+                ec2.CfnInstance.BlockDeviceMappingProperty(
+                    device_name='/dev/xvda',
+                    ebs=ec2.CfnInstance.EbsProperty(encrypted=True, volume_type='gp3'),
+                ),
+            ]
+            NagSuppressions.add_resource_suppressions(nat_instance, [
+                {
+                    'id': 'AwsSolutions-EC29',
+                    'reason': 'NAT instances are stateless and replaced by the VPC stack; termination '
+                        'protection would block environment teardown',
+                },
+            ], apply_to_children=True)
+
+
+    def add_endpoint_hub_attachment(self):
+        """Attaches the VPC to the endpoint hub Transit Gateway, routes endpoint hub traffic from the
+        workload subnets through it, and associates the endpoint hub Route 53 Profile so that service
+        names resolve to the hub interface endpoints
+        """
+        hub_cidr = get_environment_configuration(DEPLOYMENT)[ENDPOINT_HUB_VPC_CIDR]
+        workload_subnets = self.get_workload_subnets()
+        hub_attachment = ec2.CfnTransitGatewayAttachment(
+            self,
+            f'{self.target_environment}{self.logical_id_prefix}EndpointHubAttachment',
+            transit_gateway_id=self.mappings[ENDPOINT_HUB_TRANSIT_GATEWAY_ID],
+            vpc_id=self.vpc.vpc_id,
+            subnet_ids=[ subnet.subnet_id for subnet in workload_subnets ],
+        )
+        for subnet_number, subnet in enumerate(workload_subnets, start=1):
+            route = ec2.CfnRoute(
+                self,
+                f'{self.target_environment}{self.logical_id_prefix}EndpointHubRoute{subnet_number}',
+                route_table_id=subnet.route_table.route_table_id,
+                destination_cidr_block=hub_cidr,
+                transit_gateway_id=self.mappings[ENDPOINT_HUB_TRANSIT_GATEWAY_ID],
+            )
+            route.add_dependency(hub_attachment)
+
+        route53profiles.CfnProfileAssociation(
+            self,
+            f'{self.target_environment}{self.logical_id_prefix}EndpointHubProfileAssociation',
+            name=f'{self.target_environment}{self.logical_id_prefix}EndpointHub',
+            profile_id=self.mappings[ENDPOINT_HUB_ROUTE53_PROFILE_ID],
+            resource_id=self.vpc.vpc_id,
+        )
+
+
+    def get_workload_subnets(self) -> list:
+        """Returns the subnets for data lake resources, one per availability zone: private subnets
+        with NAT, otherwise isolated subnets
+        """
+        return self.vpc.private_subnets or self.vpc.isolated_subnets
+
+
     def add_vpc_endpoints(self):
-        """Adds VPC Gateway and Interface endpoints to VPC
+        """Adds VPC Gateway endpoints and the configured Interface endpoints to VPC, with optional
+        endpoint policies; spoke VPCs use the endpoint hub interface endpoints unless interface
+        endpoints are explicitly configured
+
+        Raises
+        ------
+        AttributeError
+            If an interface endpoint or endpoint policy refers to an unsupported service
         """
-        for service_name in [ 'S3', 'DYNAMODB' ]:
+        interface_endpoints = self.mappings.get(
+            VPC_INTERFACE_ENDPOINTS, [] if self.is_spoke else DEFAULT_VPC_INTERFACE_ENDPOINTS)
+        endpoint_policies = self.mappings.get(VPC_ENDPOINT_POLICIES, {})
+        for service_name in interface_endpoints:
+            if service_name in VPC_GATEWAY_ENDPOINTS:
+                raise AttributeError(f'Interface endpoint service {service_name} already has a gateway endpoint; '
+                    f'use {S3_INTERFACE_ENDPOINT} to add an S3 interface endpoint')
+            if not hasattr(ec2.InterfaceVpcEndpointAwsService, service_name):
+                raise AttributeError(f'Interface endpoint service {service_name} is not an '
+                    'InterfaceVpcEndpointAwsService')
+        for service_name in endpoint_policies:
+            if service_name not in VPC_GATEWAY_ENDPOINTS and service_name not in interface_endpoints:
+                raise AttributeError(f'Endpoint policy for {service_name} does not match a VPC endpoint; '
+                    f'expected one of {VPC_GATEWAY_ENDPOINTS + list(interface_endpoints)}')
+
+        self.vpc_endpoints = {}
+        for service_name in VPC_GATEWAY_ENDPOINTS:
             service = getattr(ec2.GatewayVpcEndpointAwsService, service_name)
             pascal_service_name = service_name.title().replace('_', '')
-            self.vpc.add_gateway_endpoint(
+            self.vpc_endpoints[service_name] = self.vpc.add_gateway_endpoint(
                 f'{self.target_environment}{self.logical_id_prefix}{pascal_service_name}Endpoint',
                 service=service,
             )
 
-        for service_name in [ 'GLUE', 'KMS', 'SSM', 'SECRETS_MANAGER', 'STEP_FUNCTIONS' ]:
+        for service_name in interface_endpoints:
             service = getattr(ec2.InterfaceVpcEndpointAwsService, service_name)
             pascal_service_name = service_name.title().replace('_', '')
-            self.vpc.add_interface_endpoint(
+            self.vpc_endpoints[service_name] = self.vpc.add_interface_endpoint(
                 f'{self.target_environment}{self.logical_id_prefix}{pascal_service_name}Endpoint',
                 service=service,
                 security_groups=[self.shared_security_group],
             )
 
+        for service_name, policy_statements in endpoint_policies.items():
+            for policy_statement in policy_statements:
+                self.vpc_endpoints[service_name].add_to_policy(iam.PolicyStatement.from_json(policy_statement))
+
+        self.s3_interface_endpoint = None
+        if self.mappings.get(S3_INTERFACE_ENDPOINT, False):
+            self.add_s3_interface_endpoint()
+
+
+    def add_s3_interface_endpoint(self):
+        """Adds an S3 interface endpoint with private DNS for clients outside the VPC (on-premises
+        through a Route 53 inbound resolver endpoint, or peered VPCs), and a security group that
+        allows HTTPS from the shared security group and the configured client CIDRs
+        """
+        s3_endpoint_security_group = ec2.SecurityGroup(
+            self,
+            f'{self.target_environment}{self.logical_id_prefix}S3InterfaceEndpointSecurityGroup',
+            vpc=self.vpc,
+            description='S3 interface endpoint access from the shared security group and ingestion clients.',
+            allow_all_outbound=False,
+        )
+        s3_endpoint_security_group.add_ingress_rule(
+            peer=self.shared_security_group,
+            connection=ec2.Port.tcp(443),
+            description='HTTPS from shared security group',
+        )
+        for client_cidr in self.mappings.get(S3_INTERFACE_ENDPOINT_CLIENT_CIDRS, []):
+            s3_endpoint_security_group.add_ingress_rule(
+                peer=ec2.Peer.ipv4(client_cidr),
+                connection=ec2.Port.tcp(443),
+                description=f'HTTPS from ingestion clients in {client_cidr}',
+            )
+
+        # Private DNS for an S3 interface endpoint requires the S3 gateway endpoint and only applies
+        # to queries through inbound resolver endpoints; in-VPC traffic stays on the gateway endpoint
+        self.s3_interface_endpoint = self.vpc.add_interface_endpoint(
+            f'{self.target_environment}{self.logical_id_prefix}S3InterfaceEndpoint',
+            service=ec2.InterfaceVpcEndpointAwsService.S3,
+            security_groups=[s3_endpoint_security_group],
+            private_dns_enabled=True,
+            private_dns_only_for_inbound_resolver_endpoint=\
+                ec2.VpcEndpointPrivateDnsOnlyForInboundResolverEndpoint.ONLY_INBOUND_RESOLVER,
+        )
+        self.s3_interface_endpoint.node.add_dependency(self.vpc_endpoints['S3'])
+
 
     def add_cloudformation_exports(self):
         """Add Cloudformation exports to VPC Stack
@@ -135,34 +353,41 @@ class VpcStack(cdk.Stack):
             export_name=self.mappings[VPC_ID],
         )
 
-        for az_number in range(3):
-            az_mapping_element = globals()[f'AVAILABILITY_ZONE_{az_number + 1}']
-            az_value = self.vpc.availability_zones[az_number]
+        for az_number, az_value in enumerate(self.vpc.availability_zones, start=1):
             cdk.CfnOutput(
                 self,
-                f'{self.target_environment}{self.logical_id_prefix}VpcAvailabilityZone{az_number + 1}',
+                f'{self.target_environment}{self.logical_id_prefix}VpcAvailabilityZone{az_number}',
                 value=az_value,
-                export_name=self.mappings[az_mapping_element],
+                export_name=self.mappings[AVAILABILITY_ZONE_N.format(az_number)],
             )
 
-        for subnet_number in range(3):
-            subnet_mapping_element = globals()[f'SUBNET_ID_{subnet_number + 1}']
-            subnet_value = self.vpc.private_subnets[subnet_number].subnet_id
+        for subnet_number, subnet in enumerate(self.get_workload_subnets(), start=1):
+            cdk.CfnOutput(
+                self,
+                f'{self.target_environment}{self.logical_id_prefix}VpcPrivateSubnet{subnet_number}',
+                value=subnet.subnet_id,
+                export_name=self.mappings[SUBNET_ID_N.format(subnet_number)],
+            )
             cdk.CfnOutput(
                 self,
-                f'{self.target_environment}{self.logical_id_prefix}VpcPrivateSubnet{subnet_number + 1}',
-                value=subnet_value,
-                export_name=self.mappings[subnet_mapping_element],
+                f'{self.target_environment}{self.logical_id_prefix}VpcRouteTable{subnet_number}',
+                value=subnet.route_table.route_table_id,
+                export_name=self.mappings[ROUTE_TABLE_N.format(subnet_number)],
             )
+            if self.dual_stack:
+                cdk.CfnOutput(
+                    self,
+                    f'{self.target_environment}{self.logical_id_prefix}VpcPrivateSubnetIpv6Cidr{subnet_number}',
+                    value=cdk.Fn.select(0, subnet.subnet_ipv6_cidr_blocks),
+                    export_name=self.mappings[SUBNET_IPV6_CIDR_N.format(subnet_number)],
+                )
 
-        for rt_number in range(3):
-            rt_mapping_element = globals()[f'ROUTE_TABLE_{rt_number + 1}']
-            rt_value = self.vpc.private_subnets[rt_number].route_table.route_table_id
+        if self.dual_stack:
             cdk.CfnOutput(
                 self,
-                f'{self.target_environment}{self.logical_id_prefix}VpcRouteTable{rt_number + 1}',
-                value=rt_value,
-                export_name=self.mappings[rt_mapping_element],
+                f'{self.target_environment}{self.logical_id_prefix}VpcIpv6Cidr',
+                value=cdk.Fn.select(0, self.vpc.vpc_ipv6_cidr_blocks),
+                export_name=self.mappings[VPC_IPV6_CIDR],
             )
 
         cdk.CfnOutput(
@@ -170,4 +395,29 @@ class VpcStack(cdk.Stack):
             f'{self.target_environment}{self.logical_id_prefix}SharedSecurityGroup',
             value=self.shared_security_group.security_group_id,
             export_name=self.mappings[SHARED_SECURITY_GROUP_ID]
-        )
\ No newline at end of file
+        )
+
+        if self.s3_interface_endpoint:
+            # DNS entries are hosted zone ID and DNS name pairs. The order is undocumented, but the first
+            # entry is the regional wildcard name, e.g. *.vpce-0123.s3.us-east-1.vpce.amazonaws.com;
+            # export it without the wildcard label, and export all entries for consumers that need AZ names
+            dns_entries = self.s3_interface_endpoint.vpc_endpoint_dns_entries
+            regional_dns_name = cdk.Fn.select(1, cdk.Fn.split(':', cdk.Fn.select(0, dns_entries)))
+            cdk.CfnOutput(
+                self,
+                f'{self.target_environment}{self.logical_id_prefix}S3InterfaceEndpoint',
+                value=self.s3_interface_endpoint.vpc_endpoint_id,
+                export_name=self.mappings[S3_INTERFACE_ENDPOINT_ID],
+            )
+            cdk.CfnOutput(
+                self,
+                f'{self.target_environment}{self.logical_id_prefix}S3InterfaceEndpointDnsName',
+                value=cdk.Fn.select(1, cdk.Fn.split('*.', regional_dns_name)),
+                export_name=self.mappings[S3_INTERFACE_ENDPOINT_DNS_NAME],
+            )
+            cdk.CfnOutput(
+                self,
+                f'{self.target_environment}{self.logical_id_prefix}S3InterfaceEndpointDnsEntries',
+                value=cdk.Fn.join(',', dns_entries),
+                export_name=self.mappings[S3_INTERFACE_ENDPOINT_DNS_ENTRIES],
+            )
\ No newline at end of file
@@ -15,7 +15,7 @@ setuptools.setup(
     author='Cory Visi <cvisi@amazon.com>, Ratnadeep Bardhan Roy <rdbroy@amazon.com>, Jose Guay <jrguay@amazon.com>, Isaiah Grant <igrant@2ndwatch.com>, Ravi Itha <itharav@amazon.com>, Zahid Muhammad Ali <zhidli@amazon.com>',
     packages=setuptools.find_packages(),
     install_requires=[
-        'aws-cdk-lib>=2.80.0',
+        'aws-cdk-lib>=2.191.0',
         'constructs>=10.1.0',
     ],
     python_requires='>=3.9',
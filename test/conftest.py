@@ -0,0 +1,61 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import os
+import json
+import pytest
+
+import lib.configuration as configuration
+import lib.tagging as tagging
+
+
+@pytest.fixture(autouse=True)
+def clear_configuration_and_tag_caches():
+	# Each test mocks boto3 and configuration differently, so never reuse a cached snapshot
+	configuration.clear_configuration_cache()
+	tagging.clear_registered_tags()
+	yield
+	configuration.clear_configuration_cache()
+	tagging.clear_registered_tags()
+
+
+def pytest_addoption(parser):
+	parser.addoption('--benchmark', action='store_true', default=False,
+		help='Run synth benchmarks and compare them with the stored baseline')
+	parser.addoption('--benchmark-update-baseline', action='store_true', default=False,
+		help='Run synth benchmarks and store the results as the new baseline')
+
+
+def pytest_collection_modifyitems(config, items):
+	if config.getoption('--benchmark') or config.getoption('--benchmark-update-baseline'):
+		return
+	skip_benchmark = pytest.mark.skip(reason='Synth benchmarks only run with --benchmark')
+	for item in items:
+		if 'benchmark' in item.keywords:
+			item.add_marker(skip_benchmark)
+
+
+benchmark_results_key = pytest.StashKey[dict]()
+
+
+@pytest.fixture
+def benchmark_results(request):
+	return request.config.stash.setdefault(benchmark_results_key, {})
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+	results = config.stash.get(benchmark_results_key, {})
+	if not results:
+		return
+
+	if config.getoption('--benchmark-update-baseline'):
+		from test_synth_benchmark import BASELINE_FILE
+		baseline = {}
+		if os.path.exists(BASELINE_FILE):
+			with open(BASELINE_FILE, encoding='utf-8') as baseline_file:
+				baseline = json.load(baseline_file)
+		with open(BASELINE_FILE, 'w', encoding='utf-8') as baseline_file:
+			json.dump({ **baseline, **results }, baseline_file, indent=4, sort_keys=True)
+
+	terminalreporter.write_sep('=', 'synth benchmark results')
+	for case_name, result in results.items():
+		terminalreporter.write_line(f'{case_name}: {json.dumps(result)}')
@@ -1,5 +1,6 @@
 # Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
 # SPDX-License-Identifier: MIT-0
+import json
 import pytest
 
 from boto_mocking_helper import *
@@ -9,7 +10,14 @@ from lib.configuration import (
 	ROUTE_TABLE_1, ROUTE_TABLE_2, ROUTE_TABLE_3,
     SHARED_SECURITY_GROUP_ID, SUBNET_ID_1, SUBNET_ID_2, SUBNET_ID_3, VPC_ID,
 	S3_KMS_KEY, S3_PURPOSE_BUILT_BUCKET, ACCOUNT_ID, REGION,
-	ENVIRONMENT, DEPLOYMENT, DEV, PROD, TEST, RESOURCE_NAME_PREFIX
+	ENVIRONMENT, DEPLOYMENT, DEV, PROD, TEST, RESOURCE_NAME_PREFIX,
+	CODEBUILD_BUILD_PROFILES, BUILD_PROFILE_DEFAULT, BUILD_PROFILE_SYNTH, BUILD_PROFILE_SELF_MUTATION,
+	BUILD_PROFILE_COMPUTE_TYPE, BUILD_PROFILE_ARM,
+	PIPELINE_TOPOLOGY, PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT, DEPLOY_WAVES,
+	BUCKET_TIERING, BUCKET_ZONE_CLEANSE, TIERING_TRANSITIONS, TIERING_STORAGE_CLASS, TIERING_DAYS,
+	TIERING_MINIMUM_OBJECT_SIZE, VPC_TOPOLOGY, VPC_TOPOLOGY_AVAILABILITY_ZONES, VPC_TOPOLOGY_SUBNET_MASKS,
+	VPC_TOPOLOGY_NAT, VPC_SUBNET_TIER_PRIVATE, VPC_NAT_PER_AZ,
+	ENDPOINT_HUB_VPC_CIDR, ENDPOINT_HUB_TRANSIT_GATEWAY_ID, ENDPOINT_HUB_ROUTE53_PROFILE_ID
 )
 
 
@@ -71,6 +79,155 @@ def test_get_local_configuration_catches_bad_environment(monkeypatch):
 		'Expected Attribute Error for invalid environment not raised'
 
 
+def test_get_local_configuration_catches_bad_deploy_waves(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+
+	for pipeline_settings, message in [
+		({ PIPELINE_TOPOLOGY: 'BadTopology' }, 'is not one of'),
+		({ PIPELINE_TOPOLOGY: PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT, DEPLOY_WAVES: [ [ DEV ], [ DEV ] ] }, 'at most once'),
+		({ PIPELINE_TOPOLOGY: PIPELINE_TOPOLOGY_MULTI_ENVIRONMENT, DEPLOY_WAVES: [ [ PROD ] ] }, 'at most once'),
+	]:
+		with pytest.raises(AttributeError) as e_info:
+			configuration.get_local_configuration(DEPLOYMENT, local_mapping={
+				DEPLOYMENT: {
+					ACCOUNT_ID: mock_account_id,
+					REGION: mock_region,
+					RESOURCE_NAME_PREFIX: 'testlake',
+					**pipeline_settings,
+				},
+				DEV: {
+					ACCOUNT_ID: mock_account_id,
+					REGION: mock_region,
+				},
+			})
+
+		assert e_info.match(message), \
+			f'Expected Attribute Error for invalid pipeline settings {pipeline_settings} not raised'
+
+
+def test_get_local_configuration_catches_incomplete_endpoint_hub_spoke(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+
+	local_mapping = configuration.get_embedded_local_mapping()
+	local_mapping[DEV][ENDPOINT_HUB_TRANSIT_GATEWAY_ID] = 'tgw-0123456789abcdef0'
+	local_mapping[DEV][ENDPOINT_HUB_ROUTE53_PROFILE_ID] = 'rp-0123456789abcdef'
+
+	with pytest.raises(AttributeError) as e_info:
+		configuration.get_local_configuration(DEV, local_mapping=local_mapping)
+
+	assert e_info.match(ENDPOINT_HUB_VPC_CIDR), \
+		'Expected Attribute Error for endpoint hub spoke without endpoint hub not raised'
+
+	local_mapping[DEPLOYMENT][ENDPOINT_HUB_VPC_CIDR] = '10.255.0.0/24'
+	del local_mapping[DEV][ENDPOINT_HUB_ROUTE53_PROFILE_ID]
+	with pytest.raises(AttributeError) as e_info:
+		configuration.get_local_configuration(DEV, local_mapping=local_mapping)
+
+	assert e_info.match(ENDPOINT_HUB_ROUTE53_PROFILE_ID), \
+		'Expected Attribute Error for endpoint hub spoke without Route 53 Profile not raised'
+
+
+def test_get_local_configuration_calls_sts_once(monkeypatch):
+	sts_calls = []
+	def mock_boto3_client_counting(client: str):
+		sts_calls.append(client)
+		return mock_boto3_client(client)
+
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client_counting)
+
+	for environment in [DEPLOYMENT, DEV, TEST, PROD]:
+		configuration.get_local_configuration(environment)
+	configuration.get_all_configurations()
+	configuration.get_logical_id_prefix()
+	configuration.get_resource_name_prefix()
+
+	assert len(sts_calls) == 1, 'Expected exactly one STS client for all configuration requests'
+
+	configuration.clear_configuration_cache()
+	configuration.get_local_configuration(DEV)
+	assert len(sts_calls) == 2, 'Expected STS to be called again after clearing the cache'
+
+
+def test_get_local_configuration_is_immutable(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+
+	local_config = configuration.get_local_configuration(DEV)
+	with pytest.raises(TypeError):
+		local_config[REGION] = 'changed-region'
+
+	assert configuration.get_local_configuration(DEV) is local_config, \
+		'Expected the same cached configuration snapshot to be returned'
+
+
+def test_get_local_configuration_override_bypasses_cache(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+
+	configuration.get_local_configuration(DEPLOYMENT)
+	local_config = configuration.get_local_configuration(DEPLOYMENT, local_mapping={
+		DEPLOYMENT: {
+			ACCOUNT_ID: 'overrideaccount',
+			REGION: mock_region,
+			RESOURCE_NAME_PREFIX: 'testlake'
+		}
+	})
+
+	assert local_config[ACCOUNT_ID] == 'overrideaccount'
+	assert configuration.get_local_configuration(DEPLOYMENT)[ACCOUNT_ID] == mock_account_id
+
+
+def mock_boto3_client_offline(client: str):
+	raise RuntimeError(f'boto3 client {client} requested while synthesizing offline')
+
+
+def test_get_local_configuration_offline_from_inline_manifest(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client_offline)
+	monkeypatch.setenv(configuration.ACCOUNT_MANIFEST_ENVIRONMENT_VARIABLE, json.dumps({
+		DEPLOYMENT: { ACCOUNT_ID: '111111111111' },
+		PROD: { ACCOUNT_ID: '333333333333', REGION: mock_region },
+	}))
+
+	assert configuration.get_local_configuration(DEPLOYMENT)[ACCOUNT_ID] == '111111111111'
+	# Environments without a manifest entry default to the Deploy account
+	assert configuration.get_local_configuration(DEV)[ACCOUNT_ID] == '111111111111'
+	assert configuration.get_local_configuration(PROD)[ACCOUNT_ID] == '333333333333'
+	assert configuration.get_local_configuration(PROD)[REGION] == mock_region
+
+
+def test_get_local_configuration_offline_from_manifest_file(monkeypatch, tmp_path):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client_offline)
+	manifest_path = tmp_path / 'accounts.json'
+	manifest_path.write_text(json.dumps({ DEPLOYMENT: { ACCOUNT_ID: '111111111111' } }))
+	monkeypatch.setenv(configuration.ACCOUNT_MANIFEST_ENVIRONMENT_VARIABLE, str(manifest_path))
+
+	all_config = configuration.get_all_configurations()
+	for environment in [DEPLOYMENT, DEV, TEST, PROD]:
+		assert all_config[environment][ACCOUNT_ID] == '111111111111'
+
+
+def test_get_local_configuration_catches_bad_manifest(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client_offline)
+	monkeypatch.setenv(configuration.ACCOUNT_MANIFEST_ENVIRONMENT_VARIABLE, json.dumps({
+		DEV: { ACCOUNT_ID: '222222222222' },
+	}))
+
+	with pytest.raises(AttributeError) as e_info:
+		configuration.get_local_configuration(DEV)
+
+	assert e_info.match(f'must specify {ACCOUNT_ID} for the {DEPLOYMENT}'), \
+		'Expected Attribute Error for manifest without Deploy account not raised'
+
+	configuration.clear_configuration_cache()
+	monkeypatch.setenv(configuration.ACCOUNT_MANIFEST_ENVIRONMENT_VARIABLE, json.dumps({
+		DEPLOYMENT: { ACCOUNT_ID: '111111111111', RESOURCE_NAME_PREFIX: 'notallowed' },
+	}))
+
+	with pytest.raises(AttributeError) as e_info:
+		configuration.get_local_configuration(DEV)
+
+	assert e_info.match('may only contain'), \
+		'Expected Attribute Error for unsupported manifest keys not raised'
+
+
 def test_get_environment_configuration_has_outputs_and_environment(monkeypatch):
 	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
 
@@ -111,4 +268,63 @@ def test_get_resource_name_prefix_returns_string(monkeypatch):
 
 	test_resource_name_prefix = configuration.get_resource_name_prefix()
 	assert isinstance(test_resource_name_prefix, str)
-	assert len(test_resource_name_prefix) > 0
\ No newline at end of file
+	assert len(test_resource_name_prefix) > 0
+
+
+def test_get_build_profile_merges_default_and_action_profiles():
+	environment_configuration = {
+		CODEBUILD_BUILD_PROFILES: {
+			BUILD_PROFILE_DEFAULT: { BUILD_PROFILE_ARM: True },
+			BUILD_PROFILE_SYNTH: { BUILD_PROFILE_COMPUTE_TYPE: 'LARGE' },
+		}
+	}
+
+	assert configuration.get_build_profile(environment_configuration, BUILD_PROFILE_SYNTH) == \
+		{ BUILD_PROFILE_COMPUTE_TYPE: 'LARGE', BUILD_PROFILE_ARM: True }
+	assert configuration.get_build_profile(environment_configuration, BUILD_PROFILE_SELF_MUTATION) == \
+		{ BUILD_PROFILE_COMPUTE_TYPE: None, BUILD_PROFILE_ARM: True }
+	assert configuration.get_build_profile({}, BUILD_PROFILE_SYNTH) == \
+		{ BUILD_PROFILE_COMPUTE_TYPE: None, BUILD_PROFILE_ARM: False }
+
+
+def test_get_build_profile_catches_unsupported_profiles():
+	for build_profiles in [
+		{ 'unknown_action': {} },
+		{ BUILD_PROFILE_SYNTH: { 'image': 'STANDARD_7_0' } },
+		{ BUILD_PROFILE_SYNTH: { BUILD_PROFILE_COMPUTE_TYPE: 'HUGE' } },
+		# Synth needs Python, which Lambda compute images do not provide
+		{ BUILD_PROFILE_SYNTH: { BUILD_PROFILE_COMPUTE_TYPE: 'LAMBDA_2GB' } },
+	]:
+		with pytest.raises(AttributeError):
+			configuration.get_build_profile({ CODEBUILD_BUILD_PROFILES: build_profiles }, BUILD_PROFILE_SYNTH)
+
+
+def test_get_bucket_tiering_catches_unsupported_policies():
+	assert configuration.get_bucket_tiering({}, BUCKET_ZONE_CLEANSE)[TIERING_MINIMUM_OBJECT_SIZE] == 131072, \
+		'Expected default minimum object size for transitions'
+
+	for bucket_tiering in [
+		{ 'unknown_zone': {} },
+		{ BUCKET_ZONE_CLEANSE: { 'expiration': 30 } },
+		{ BUCKET_ZONE_CLEANSE: { TIERING_TRANSITIONS: [ { TIERING_STORAGE_CLASS: 'TAPE', TIERING_DAYS: 30 } ] } },
+		{ BUCKET_ZONE_CLEANSE: { TIERING_TRANSITIONS: [ { TIERING_STORAGE_CLASS: 'GLACIER' } ] } },
+	]:
+		with pytest.raises(AttributeError):
+			configuration.get_bucket_tiering({ BUCKET_TIERING: bucket_tiering }, BUCKET_ZONE_CLEANSE)
+
+
+def test_get_vpc_topology_catches_unsupported_settings():
+	vpc_topology = configuration.get_vpc_topology({})
+	assert vpc_topology[VPC_TOPOLOGY_AVAILABILITY_ZONES] == 3 and vpc_topology[VPC_TOPOLOGY_NAT] == VPC_NAT_PER_AZ, \
+		'Expected default VPC topology with 3 availability zones and a NAT gateway per availability zone'
+
+	for topology in [
+		{ 'max_azs': 3 },
+		{ VPC_TOPOLOGY_AVAILABILITY_ZONES: 0 },
+		{ VPC_TOPOLOGY_AVAILABILITY_ZONES: 2 },
+		{ VPC_TOPOLOGY_NAT: 'transit' },
+		{ VPC_TOPOLOGY_SUBNET_MASKS: { 'reserved': 24 } },
+		{ VPC_TOPOLOGY_SUBNET_MASKS: { VPC_SUBNET_TIER_PRIVATE: 30 } },
+	]:
+		with pytest.raises(AttributeError):
+			configuration.get_vpc_topology({ VPC_TOPOLOGY: topology })
\ No newline at end of file
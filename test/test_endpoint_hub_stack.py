@@ -0,0 +1,115 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import pytest
+import aws_cdk as cdk
+from aws_cdk.assertions import Template
+
+from boto_mocking_helper import *
+from lib.endpoint_hub_stack import EndpointHubStack
+
+import lib.configuration as configuration
+from lib.configuration import (
+    DEPLOYMENT, ACCOUNT_ID, REGION, VPC_CIDR, RESOURCE_NAME_PREFIX, LOGICAL_ID_PREFIX,
+    ENDPOINT_HUB_VPC_CIDR, VPC_INTERFACE_ENDPOINTS
+)
+
+mock_spoke_account_id = 'notrealspokeaccountid'
+
+def mock_get_local_configuration_with_endpoint_hub(environment, local_mapping = None):
+    return {
+        # Spoke environments are in a different account than the endpoint hub
+        ACCOUNT_ID: mock_account_id if environment == DEPLOYMENT else mock_spoke_account_id,
+        REGION: mock_region,
+        VPC_CIDR: '10.0.0.0/24',
+        ENDPOINT_HUB_VPC_CIDR: '10.255.0.0/24',
+        VPC_INTERFACE_ENDPOINTS: [ 'GLUE', 'ECR_DOCKER' ],
+        # Mix Deploy environment variables so we can return one dict for all environments
+        LOGICAL_ID_PREFIX: 'TestLake',
+        RESOURCE_NAME_PREFIX: 'testlake',
+    }
+
+def mock_get_local_configuration_with_overlapping_hub(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_endpoint_hub(environment, local_mapping),
+        ENDPOINT_HUB_VPC_CIDR: '10.0.0.0/16',
+    }
+
+
+def test_resource_types_and_counts(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_endpoint_hub)
+
+    app = cdk.App()
+    endpoint_hub_stack = EndpointHubStack(
+        app,
+        'Deploy-EndpointHubStackForTests',
+        target_environment=DEPLOYMENT,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(endpoint_hub_stack)
+    template.resource_count_is('AWS::EC2::VPC', 1)
+    template.resource_count_is('AWS::EC2::NatGateway', 0)
+    template.resource_count_is('AWS::EC2::VPCEndpoint', 2)
+    template.resource_count_is('AWS::Route53::HostedZone', 2)
+    template.resource_count_is('AWS::Route53::RecordSet', 4)
+    template.resource_count_is('AWS::Route53Profiles::Profile', 1)
+    template.resource_count_is('AWS::Route53Profiles::ProfileResourceAssociation', 2)
+    template.resource_count_is('AWS::EC2::TransitGateway', 1)
+    template.resource_count_is('AWS::EC2::TransitGatewayAttachment', 1)
+    # All environments share the same mock VPC CIDR, so one route per hub subnet
+    template.resource_count_is('AWS::EC2::Route', 3)
+
+    template.all_resources_properties('AWS::EC2::VPCEndpoint', { 'PrivateDnsEnabled': False })
+    template.has_resource_properties('AWS::Route53::HostedZone', {
+        'Name': { 'Fn::Join': [ '', [ f'dkr.ecr.{mock_region}.', { 'Ref': 'AWS::URLSuffix' }, '.' ] ] },
+    })
+    template.has_resource_properties('AWS::RAM::ResourceShare', {
+        'AllowExternalPrincipals': False,
+        'Principals': [ mock_spoke_account_id ],
+    })
+
+
+def test_stack_has_correct_outputs(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_endpoint_hub)
+
+    app = cdk.App()
+    endpoint_hub_stack = EndpointHubStack(
+        app,
+        'Deploy-EndpointHubStackForTests',
+        target_environment=DEPLOYMENT,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(endpoint_hub_stack)
+    export_names = [ output['Export']['Name'] for output in template.find_outputs('*').values() ]
+    for export_name in [ 'EndpointHubTransitGatewayId', 'EndpointHubRoute53ProfileId' ]:
+        assert f'{DEPLOYMENT}{export_name}' in export_names, f'Missing CF output {export_name}'
+
+
+def test_error_when_spoke_cidr_overlaps_hub(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_overlapping_hub)
+
+    app = cdk.App()
+
+    with pytest.raises(AttributeError) as e_info:
+        EndpointHubStack(
+            app,
+            'Deploy-EndpointHubStackForTests',
+            target_environment=DEPLOYMENT,
+            env=cdk.Environment(
+                account=mock_account_id,
+                region=mock_region
+            )
+        )
+
+    assert e_info.match('overlaps'), \
+        'Expected Attribute Error for overlapping endpoint hub CIDR not raised'
\ No newline at end of file
@@ -0,0 +1,116 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import json
+from pathlib import Path
+import aws_cdk as cdk
+import aws_cdk.aws_s3 as s3
+
+import lib.nag_runner as nag_runner
+from lib.nag_runner import NAG_STACKS_CONTEXT_KEY, NAG_STACKS_ENVIRONMENT_VARIABLE
+from lib.stack_registry import STACK_SELECTION_CONTEXT_KEY
+from lib.configuration import DEV, TEST
+
+
+def create_test_app(outdir: str = None, context: dict = None) -> cdk.App:
+	app = cdk.App(outdir=outdir, context=context)
+	for environment in [ DEV, TEST ]:
+		stack = cdk.Stack(app, f'{environment}-TestStack')
+		# Bucket without server access logs is reported by AwsSolutions-S1
+		s3.Bucket(stack, 'TestBucket', enforce_ssl=True)
+	return app
+
+
+def write_mock_assembly(assembly_dir, templates: dict, findings: dict = None):
+	assembly_dir.mkdir(parents=True, exist_ok=True)
+	artifacts = {}
+	for stack_name, template in templates.items():
+		(assembly_dir / f'{stack_name}.template.json').write_text(json.dumps(template))
+		artifacts[stack_name] = {
+			'type': 'aws:cloudformation:stack',
+			'displayName': stack_name,
+			'properties': { 'templateFile': f'{stack_name}.template.json' },
+			'metadata': {
+				f'/{stack_name}/TestBucket/Resource': [
+					{ 'type': 'aws:cdk:error', 'data': message }
+					for message in (findings or {}).get(stack_name, [])
+				],
+			},
+		}
+	(assembly_dir / 'manifest.json').write_text(json.dumps({ 'version': '1.0.0', 'artifacts': artifacts }))
+
+
+def test_nag_checks_all_stacks_without_selection(monkeypatch):
+	monkeypatch.delenv(NAG_STACKS_ENVIRONMENT_VARIABLE, raising=False)
+
+	app = create_test_app()
+	selected_stacks = nag_runner.apply_nag_checks(app)
+
+	assert [ stack.stack_name for stack in selected_stacks ] == [ f'{DEV}-TestStack', f'{TEST}-TestStack' ]
+
+
+def test_nag_checks_selected_stacks(monkeypatch):
+	monkeypatch.setenv(NAG_STACKS_ENVIRONMENT_VARIABLE, f'{TEST}-*')
+
+	app = create_test_app()
+	selected_stacks = nag_runner.apply_nag_checks(app)
+
+	assert [ stack.stack_name for stack in selected_stacks ] == [ f'{TEST}-TestStack' ]
+
+
+def test_nag_checks_disabled_with_empty_selection(monkeypatch):
+	monkeypatch.setenv(NAG_STACKS_ENVIRONMENT_VARIABLE, f'{TEST}-*')
+
+	# Context takes precedence over the environment
+	app = create_test_app(context={ NAG_STACKS_CONTEXT_KEY: '' })
+
+	assert nag_runner.apply_nag_checks(app) == []
+
+
+def test_nag_findings_read_from_assembly(monkeypatch, tmp_path):
+	monkeypatch.delenv(NAG_STACKS_ENVIRONMENT_VARIABLE, raising=False)
+
+	app = create_test_app(outdir=str(tmp_path), context={ NAG_STACKS_CONTEXT_KEY: f'{DEV}-*' })
+	nag_runner.apply_nag_checks(app)
+	app.synth()
+
+	findings = nag_runner.get_nag_findings(str(tmp_path))
+
+	assert findings[f'{TEST}-TestStack'] == []
+	assert any(
+		finding['level'] == 'error' and finding['message'].startswith('AwsSolutions-S1')
+		for finding in findings[f'{DEV}-TestStack']
+	), 'Missing AwsSolutions-S1 finding for bucket without access logs'
+
+
+def test_cached_nag_only_checks_changed_stacks(monkeypatch, tmp_path):
+	templates = {
+		f'{DEV}-TestStack': { 'Resources': { 'Bucket': { 'Type': 'AWS::S3::Bucket' } } },
+		f'{TEST}-TestStack': { 'Resources': {} },
+	}
+	nag_selections = []
+	def mock_run_app(app_command, context, outdir, unset_variables=None):
+		selection = context[NAG_STACKS_CONTEXT_KEY]
+		nag_selections.append(selection)
+		if selection:
+			assert context[STACK_SELECTION_CONTEXT_KEY] == selection, 'Only changed stacks should be constructed'
+		write_mock_assembly(Path(outdir), templates,
+			{ stack_name: [ 'AwsSolutions-S1: Test finding' ] for stack_name in selection.split(',') if stack_name })
+	monkeypatch.setattr(nag_runner, 'run_app', mock_run_app)
+
+	cache_path = str(tmp_path / 'nag-cache.json')
+	outdir = str(tmp_path / 'cdk.out')
+	findings = nag_runner.run_cached_nag([ 'app' ], {}, outdir, cache_path)
+
+	assert nag_selections == [ '', f'{DEV}-TestStack,{TEST}-TestStack' ]
+	assert findings[f'{DEV}-TestStack'][0]['message'] == 'AwsSolutions-S1: Test finding'
+
+	# Unchanged templates are served from the cache without a CDK Nag synth
+	nag_selections.clear()
+	assert nag_runner.run_cached_nag([ 'app' ], {}, outdir, cache_path) == findings
+	assert nag_selections == [ '' ]
+
+	templates[f'{TEST}-TestStack'] = { 'Resources': { 'Topic': { 'Type': 'AWS::SNS::Topic' } } }
+	nag_selections.clear()
+	nag_runner.run_cached_nag([ 'app' ], {}, outdir, cache_path)
+	assert nag_selections == [ '', f'{TEST}-TestStack' ]
+	assert len(json.loads(open(cache_path).read())) == 2, 'Cache must not keep results for old templates'
\ No newline at end of file
@@ -0,0 +1,106 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import pytest
+import aws_cdk as cdk
+
+from boto_mocking_helper import *
+from lib.pipeline_deploy_stage import PipelineDeployStage
+
+import lib.configuration as configuration
+from lib.configuration import (
+    DEV, ACCOUNT_ID, REGION, VPC_CIDR, RESOURCE_NAME_PREFIX, LOGICAL_ID_PREFIX,
+    STACK_DEPENDENCIES, MAX_STACK_PARALLELISM, DEPLOY_STACK_VPC, DEPLOY_STACK_S3_BUCKET_ZONES,
+    DEPLOY_STACK_S3_REPLICA, REPLICA_REGION,
+)
+
+mock_configuration_base = {
+    ACCOUNT_ID: mock_account_id,
+    REGION: mock_region,
+    VPC_CIDR: '10.0.0.0/24',
+    # Mix Deploy environment variables so we can return one dict for all environments
+    LOGICAL_ID_PREFIX: 'TestLake',
+    RESOURCE_NAME_PREFIX: 'testlake',
+}
+
+
+def create_deploy_stage(monkeypatch, configuration_overrides: dict) -> PipelineDeployStage:
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration',
+        lambda environment, local_mapping = None: mock_configuration_base | configuration_overrides)
+
+    app = cdk.App()
+    return PipelineDeployStage(
+        app,
+        DEV,
+        target_environment=DEV,
+        deployment_account_id=mock_account_id,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        ),
+    )
+
+
+def test_stacks_are_independent_by_default(monkeypatch):
+    deploy_stage = create_deploy_stage(monkeypatch, {})
+
+    assert list(deploy_stage.deploy_stacks) == [ DEPLOY_STACK_VPC, DEPLOY_STACK_S3_BUCKET_ZONES ]
+    for stack in deploy_stage.deploy_stacks.values():
+        assert stack.dependencies == [], f'Unexpected dependency for {stack.stack_name}'
+
+
+def test_configured_stack_dependencies(monkeypatch):
+    deploy_stage = create_deploy_stage(monkeypatch, {
+        STACK_DEPENDENCIES: { DEPLOY_STACK_VPC: [ DEPLOY_STACK_S3_BUCKET_ZONES ] },
+    })
+
+    assert deploy_stage.deploy_stacks[DEPLOY_STACK_VPC].dependencies == \
+        [ deploy_stage.deploy_stacks[DEPLOY_STACK_S3_BUCKET_ZONES] ]
+    assert deploy_stage.deploy_stacks[DEPLOY_STACK_S3_BUCKET_ZONES].dependencies == []
+
+
+def test_max_stack_parallelism_chains_stacks(monkeypatch):
+    deploy_stage = create_deploy_stage(monkeypatch, { MAX_STACK_PARALLELISM: 1 })
+
+    assert deploy_stage.deploy_stacks[DEPLOY_STACK_S3_BUCKET_ZONES].dependencies == \
+        [ deploy_stage.deploy_stacks[DEPLOY_STACK_VPC] ]
+
+
+def test_max_stack_parallelism_follows_dependency_order(monkeypatch):
+    deploy_stage = create_deploy_stage(monkeypatch, {
+        STACK_DEPENDENCIES: { DEPLOY_STACK_VPC: [ DEPLOY_STACK_S3_BUCKET_ZONES ] },
+        MAX_STACK_PARALLELISM: 1,
+    })
+
+    # Chaining in creation order would create a cycle
+    assert deploy_stage.deploy_stacks[DEPLOY_STACK_S3_BUCKET_ZONES].dependencies == []
+
+
+def test_invalid_max_stack_parallelism_raises(monkeypatch):
+    for max_parallelism in [ 0, -1, 1.5, '2', True ]:
+        configuration.clear_configuration_cache()
+        with pytest.raises(AttributeError, match='must be a positive integer'):
+            create_deploy_stage(monkeypatch, { MAX_STACK_PARALLELISM: max_parallelism })
+
+
+def test_unknown_stack_dependency_raises(monkeypatch):
+    with pytest.raises(AttributeError):
+        create_deploy_stage(monkeypatch, { STACK_DEPENDENCIES: { DEPLOY_STACK_VPC: [ 'DataLakeStack' ] } })
+
+
+def test_stack_dependency_cycle_raises(monkeypatch):
+    deploy_stage = create_deploy_stage(monkeypatch, {})
+
+    with pytest.raises(AttributeError):
+        deploy_stage.add_stack_dependencies({
+            DEPLOY_STACK_VPC: [ DEPLOY_STACK_S3_BUCKET_ZONES ],
+            DEPLOY_STACK_S3_BUCKET_ZONES: [ DEPLOY_STACK_VPC ],
+        })
+
+
+def test_replica_stack_deploys_before_bucket_stack(monkeypatch):
+    deploy_stage = create_deploy_stage(monkeypatch, { REPLICA_REGION: 'us-west-2' })
+
+    replica_stack = deploy_stage.deploy_stacks[DEPLOY_STACK_S3_REPLICA]
+    assert replica_stack.region == 'us-west-2'
+    assert deploy_stage.deploy_stacks[DEPLOY_STACK_S3_BUCKET_ZONES].dependencies == [ replica_stack ]
\ No newline at end of file
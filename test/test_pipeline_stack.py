@@ -9,9 +9,14 @@ from lib.pipeline_stack import PipelineStack
 
 import lib.configuration as configuration
 from lib.configuration import (
-    DEV, PROD, TEST, ACCOUNT_ID, REGION, RESOURCE_NAME_PREFIX, LOGICAL_ID_PREFIX,
+    DEPLOYMENT, DEV, PROD, TEST, ACCOUNT_ID, REGION, RESOURCE_NAME_PREFIX, LOGICAL_ID_PREFIX,
     CODECOMMIT_MIRROR_REPOSITORY_NAME, GITHUB_REPOSITORY_NAME, GITHUB_REPOSITORY_OWNER_NAME,
     CODESTAR_REPOSITORY_NAME, CODESTAR_REPOSITORY_OWNER_NAME, CODESTAR_CONNECTION_ARN,
+    TEMPLATE_FINGERPRINT, CODEBUILD_CACHE, CODEBUILD_CACHE_S3, CDK_CLI_VERSION,
+    CODEBUILD_BUILD_PROFILES, BUILD_PROFILE_SYNTH, BUILD_PROFILE_SELF_MUTATION,
+    BUILD_PROFILE_COMPUTE_TYPE, BUILD_PROFILE_ARM,
+    SOURCE_TRIGGER_FILE_PATHS, SOURCE_TRIGGER_EXCLUDED_FILE_PATHS, SOURCE_TRIGGER_TAGS,
+    PIPELINE_TYPE, PIPELINE_TYPE_V1, PIPELINE_EXECUTION_MODE, PIPELINE_VARIABLES,
 )
 
 mock_configuration_base = {
@@ -49,6 +54,55 @@ def mock_get_local_configuration_with_codestar(environment, local_mapping = None
             CODESTAR_CONNECTION_ARN: 'arn:aws:codestar-connections:::',
         }
 
+def mock_get_local_configuration_with_codestar_trigger_filter(environment, local_mapping = None):
+    return mock_get_local_configuration_with_codestar(environment, local_mapping) | \
+        {
+            SOURCE_TRIGGER_FILE_PATHS: [ 'lib/**' ],
+            SOURCE_TRIGGER_EXCLUDED_FILE_PATHS: [ '**/*.md' ],
+            SOURCE_TRIGGER_TAGS: [ 'release-*' ],
+        }
+
+def mock_get_local_configuration_with_codecommit_trigger_filter(environment, local_mapping = None):
+    return mock_get_local_configuration_with_codecommit(environment, local_mapping) | \
+        {
+            SOURCE_TRIGGER_FILE_PATHS: [ 'lib/**' ],
+        }
+
+def mock_get_local_configuration_with_queued_execution(environment, local_mapping = None):
+    return mock_get_local_configuration_with_codecommit(environment, local_mapping) | \
+        {
+            PIPELINE_EXECUTION_MODE: 'QUEUED',
+            PIPELINE_VARIABLES: { 'NAG_STACKS': '*' },
+        }
+
+def mock_get_local_configuration_with_v1_queued_execution(environment, local_mapping = None):
+    return mock_get_local_configuration_with_queued_execution(environment, local_mapping) | \
+        {
+            PIPELINE_TYPE: PIPELINE_TYPE_V1,
+        }
+
+def mock_get_local_configuration_with_template_fingerprint(environment, local_mapping = None):
+    return mock_get_local_configuration_with_codecommit(environment, local_mapping) | \
+        {
+            TEMPLATE_FINGERPRINT: True,
+        }
+
+def mock_get_local_configuration_with_synth_cache(environment, local_mapping = None):
+    return mock_get_local_configuration_with_codecommit(environment, local_mapping) | \
+        {
+            CODEBUILD_CACHE: CODEBUILD_CACHE_S3,
+            CDK_CLI_VERSION: '2.1000.0',
+        }
+
+def mock_get_local_configuration_with_build_profiles(environment, local_mapping = None):
+    return mock_get_local_configuration_with_codecommit(environment, local_mapping) | \
+        {
+            CODEBUILD_BUILD_PROFILES: {
+                BUILD_PROFILE_SYNTH: { BUILD_PROFILE_COMPUTE_TYPE: 'LARGE', BUILD_PROFILE_ARM: True },
+                BUILD_PROFILE_SELF_MUTATION: { BUILD_PROFILE_COMPUTE_TYPE: 'LAMBDA_2GB' },
+            },
+        }
+
 
 def test_resource_types_and_counts(monkeypatch):
     monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
@@ -311,7 +365,9 @@ def test_pipeline_pulls_source_from_github(monkeypatch):
                                     "Provider": "GitHub",
                                     "Version": "1"
                                 },
-                                "Configuration": Match.any_value(),
+                                "Configuration": Match.object_like({
+                                    "PollForSourceChanges": False,
+                                }),
                                 "Name": Match.any_value(),
                                 "OutputArtifacts": Match.any_value(),
                                 "RunOrder": 1,
@@ -322,4 +378,363 @@ def test_pipeline_pulls_source_from_github(monkeypatch):
                 ])
             }
         )
+    )
+
+    # Pipeline is started by a webhook instead of polling
+    template.resource_count_is('AWS::CodePipeline::Webhook', 1)
+
+
+def test_pipeline_triggers_on_infrastructure_file_changes(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration',
+        mock_get_local_configuration_with_codestar_trigger_filter)
+
+    app = cdk.App()
+
+    pipeline_stack = PipelineStack(
+        app,
+        'Dev-PipelineStackForTests',
+        target_environment=DEV,
+        target_branch='main',
+        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        ),
+    )
+
+    template = Template.from_stack(pipeline_stack)
+    template.has_resource_properties(
+        'AWS::CodePipeline::Pipeline',
+        Match.object_like(
+            {
+                "PipelineType": "V2",
+                "Triggers": [
+                    {
+                        "GitConfiguration": {
+                            "Push": [
+                                {
+                                    "Branches": { "Includes": [ "main" ] },
+                                    "FilePaths": { "Includes": [ "lib/**" ], "Excludes": [ "**/*.md" ] },
+                                },
+                                {
+                                    "Tags": { "Includes": [ "release-*" ] },
+                                },
+                            ],
+                            "SourceActionName": Match.any_value(),
+                        },
+                        "ProviderType": "CodeStarSourceConnection",
+                    },
+                ],
+            }
+        )
+    )
+
+
+def test_trigger_file_paths_require_connection_source(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration',
+        mock_get_local_configuration_with_codecommit_trigger_filter)
+
+    app = cdk.App()
+
+    with pytest.raises(AttributeError) as e_info:
+        PipelineStack(
+            app,
+            'Dev-PipelineStackForTests',
+            target_environment=DEV,
+            target_branch='main',
+            target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+            env=cdk.Environment(
+                account=mock_account_id,
+                region=mock_region
+            ),
+        )
+
+    assert e_info.match('only supported with a Codestar connection'), \
+        'Expected Attribute Error for trigger file paths with a CodeCommit source not raised'
+
+
+def test_pipeline_queues_executions_with_variables(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_queued_execution)
+
+    app = cdk.App()
+
+    pipeline_stack = PipelineStack(
+        app,
+        'Dev-PipelineStackForTests',
+        target_environment=DEV,
+        target_branch='main',
+        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        ),
+    )
+
+    template = Template.from_stack(pipeline_stack)
+    template.has_resource_properties(
+        'AWS::CodePipeline::Pipeline',
+        Match.object_like(
+            {
+                "PipelineType": "V2",
+                "ExecutionMode": "QUEUED",
+                "Variables": [
+                    Match.object_like({ "Name": "NAG_STACKS", "DefaultValue": "*" }),
+                ],
+                "Stages": Match.array_with([
+                    Match.object_like({
+                        "Name": "Build",
+                        "Actions": [
+                            Match.object_like({
+                                "Configuration": Match.object_like({
+                                    "EnvironmentVariables": Match.string_like_regexp(
+                                        r'"name":"NAG_STACKS","type":"PLAINTEXT","value":"#\{variables.NAG_STACKS\}"'),
+                                }),
+                            }),
+                        ],
+                    }),
+                ]),
+            }
+        )
+    )
+
+
+def test_v1_pipeline_type_with_v2_settings_raises(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_v1_queued_execution)
+
+    app = cdk.App()
+
+    with pytest.raises(AttributeError) as e_info:
+        PipelineStack(
+            app,
+            'Dev-PipelineStackForTests',
+            target_environment=DEV,
+            target_branch='main',
+            target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+            env=cdk.Environment(
+                account=mock_account_id,
+                region=mock_region
+            ),
+        )
+
+    assert e_info.match(f'{PIPELINE_TYPE_V1} does not support'), \
+        'Expected Attribute Error for V2 settings with a V1 pipeline not raised'
+
+
+def test_pipeline_skips_unchanged_stage_with_template_fingerprint(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration',
+        mock_get_local_configuration_with_template_fingerprint)
+
+    app = cdk.App()
+
+    pipeline_stack = PipelineStack(
+        app,
+        'Dev-PipelineStackForTests',
+        target_environment=DEV,
+        target_branch='main',
+        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        ),
+    )
+
+    template = Template.from_stack(pipeline_stack)
+    # Project for cdk synth, pipeline update/self-mutate, fingerprint check and record
+    template.resource_count_is('AWS::CodeBuild::Project', 4)
+    template.has_resource_properties(
+        'AWS::CodePipeline::Pipeline',
+        Match.object_like(
+            {
+                "PipelineType": "V2",
+                "Stages": Match.array_with([
+                    Match.object_like({
+                        "Actions": [
+                            Match.object_like({
+                                "Name": "FingerprintCheck",
+                                "Namespace": Match.any_value(),
+                            }),
+                        ],
+                        "Name": f"{DEV}Fingerprint",
+                    }),
+                    Match.object_like({
+                        "Name": DEV,
+                        "BeforeEntry": {
+                            "Conditions": [
+                                {
+                                    "Result": "SKIP",
+                                    "Rules": [
+                                        Match.object_like({
+                                            "RuleTypeId": Match.object_like({ "Provider": "VariableCheck" }),
+                                            "Configuration": {
+                                                "Variable": Match.string_like_regexp(r'#\{.+\.CHANGED\}'),
+                                                "Value": "true",
+                                                "Operator": "EQ",
+                                            },
+                                        }),
+                                    ],
+                                },
+                            ],
+                        },
+                    }),
+                ])
+            }
+        )
+    )
+
+
+def test_multi_environment_pipeline_deploys_waves(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_codecommit)
+
+    app = cdk.App()
+
+    pipeline_stack = PipelineStack(
+        app,
+        'Deploy-PipelineStackForTests',
+        target_environment=DEPLOYMENT,
+        target_branch='main',
+        target_aws_env=None,
+        deploy_waves=[ [ DEV, TEST ], [ PROD ] ],
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        ),
+    )
+
+    template = Template.from_stack(pipeline_stack)
+    template.resource_count_is('AWS::CodePipeline::Pipeline', 1)
+    template.has_resource_properties(
+        'AWS::CodePipeline::Pipeline',
+        Match.object_like(
+            {
+                "Stages": Match.array_with([
+                    Match.object_like({ "Name": f"{DEV}{TEST}" }),
+                    Match.object_like({ "Name": PROD }),
+                ])
+            }
+        )
+    )
+
+
+def test_synth_caches_dependencies_with_pinned_cli(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_synth_cache)
+
+    app = cdk.App()
+
+    pipeline_stack = PipelineStack(
+        app,
+        'Dev-PipelineStackForTests',
+        target_environment=DEV,
+        target_branch='main',
+        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        ),
+    )
+
+    template = Template.from_stack(pipeline_stack)
+    # Artifact bucket and Synth cache bucket
+    template.resource_count_is('AWS::S3::Bucket', 2)
+    template.has_resource_properties(
+        'AWS::CodeBuild::Project',
+        Match.object_like(
+            {
+                "Cache": Match.object_like({ "Type": "S3" }),
+                "Source": {
+                    "BuildSpec": Match.serialized_json(
+                        Match.object_like({
+                            "cache": {
+                                "paths": Match.array_with([ '/root/.cache/pip/**/*' ])
+                            },
+                            "phases": {
+                                "build": {
+                                    "commands": Match.array_with([ 'npm install -g aws-cdk@2.1000.0', 'cdk synth' ])
+                                }
+                            },
+                        })
+                    ),
+                    "Type": Match.any_value(),
+                }
+            }
+        )
+    )
+
+
+def test_unsupported_synth_cache_type_raises(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration',
+        lambda environment, local_mapping = None:
+            mock_get_local_configuration_with_codecommit(environment) | { CODEBUILD_CACHE: 'docker' })
+
+    app = cdk.App()
+
+    with pytest.raises(AttributeError):
+        PipelineStack(
+            app,
+            'Dev-PipelineStackForTests',
+            target_environment=DEV,
+            target_branch='main',
+            target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+            env=cdk.Environment(
+                account=mock_account_id,
+                region=mock_region
+            ),
+        )
+
+
+def test_build_actions_use_build_profiles(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_build_profiles)
+
+    app = cdk.App()
+
+    pipeline_stack = PipelineStack(
+        app,
+        'Dev-PipelineStackForTests',
+        target_environment=DEV,
+        target_branch='main',
+        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        ),
+    )
+
+    template = Template.from_stack(pipeline_stack)
+    # Synth
+    template.has_resource_properties(
+        'AWS::CodeBuild::Project',
+        Match.object_like(
+            {
+                "Environment": Match.object_like({
+                    "ComputeType": "BUILD_GENERAL1_LARGE",
+                    "Type": "ARM_CONTAINER",
+                }),
+                "Source": Match.object_like({
+                    "BuildSpec": Match.string_like_regexp('cdk synth'),
+                }),
+            }
+        )
+    )
+    # Self-mutation
+    template.has_resource_properties(
+        'AWS::CodeBuild::Project',
+        Match.object_like(
+            {
+                "Environment": Match.object_like({
+                    "ComputeType": "BUILD_LAMBDA_2GB",
+                    "Type": "LINUX_LAMBDA_CONTAINER",
+                }),
+                "Source": Match.object_like({
+                    "BuildSpec": Match.string_like_regexp('cdk -a . deploy'),
+                }),
+            }
+        )
     )
\ No newline at end of file
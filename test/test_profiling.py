@@ -0,0 +1,102 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import json
+import pytest
+import aws_cdk as cdk
+import aws_cdk.aws_s3 as s3
+from aws_cdk.assertions import Template
+
+import lib.profiling as profiling
+from lib.profiling import (
+	SYNTH_PROFILE_CONTEXT_KEY, SYNTH_PROFILE_ENVIRONMENT_VARIABLE,
+	SYNTH_PROFILE_REPORT_FILE, SYNTH_PROFILE_FOLDED_FILE
+)
+
+
+@pytest.fixture(autouse=True)
+def stop_profiling():
+	yield
+	profiling.stop_profiling()
+
+
+def test_profiling_disabled_by_default(monkeypatch, tmp_path):
+	monkeypatch.delenv(SYNTH_PROFILE_ENVIRONMENT_VARIABLE, raising=False)
+
+	assert not profiling.start_profiling(cdk.App())
+	with profiling.synth_phase('configuration'):
+		pass
+
+	aspect = cdk.Tag('key', 'value')
+	assert profiling.profiled_aspect(aspect, 'tagging') is aspect
+	assert profiling.write_profile_report(str(tmp_path / 'cdk.out')) == []
+
+
+def test_profiling_records_nested_phases(monkeypatch, tmp_path):
+	monkeypatch.delenv(SYNTH_PROFILE_ENVIRONMENT_VARIABLE, raising=False)
+
+	app = cdk.App(context={ SYNTH_PROFILE_CONTEXT_KEY: 'true' })
+	assert profiling.start_profiling(app)
+
+	with profiling.synth_phase('StackForTests'):
+		stack = cdk.Stack(app, 'StackForTests')
+		with profiling.synth_phase('bucket'):
+			s3.Bucket(stack, 'BucketForTests')
+	cdk.Aspects.of(stack).add(profiling.profiled_aspect(cdk.Tag('key', 'value'), 'tagging'))
+	with profiling.synth_phase('synth'):
+		Template.from_stack(stack)
+
+	report_files = profiling.write_profile_report(str(tmp_path / 'cdk.out'))
+	assert report_files == [
+		str(tmp_path / SYNTH_PROFILE_REPORT_FILE), str(tmp_path / SYNTH_PROFILE_FOLDED_FILE) ]
+
+	report = json.loads((tmp_path / SYNTH_PROFILE_REPORT_FILE).read_text())
+	phases = { ';'.join(phase['phase']): phase for phase in report['phases'] }
+	assert set(phases) == { 'StackForTests', 'StackForTests;bucket', 'synth;tagging', 'synth' }
+	assert phases['StackForTests;bucket']['jsii_calls'] > 0, 'Expected JSII calls to be counted'
+	assert phases['synth;tagging']['calls'] > 1, 'Expected one tagging phase call per visited construct'
+	assert report['total_jsii_calls'] >= phases['StackForTests']['jsii_calls']
+
+	folded_lines = (tmp_path / SYNTH_PROFILE_FOLDED_FILE).read_text().splitlines()
+	assert len(folded_lines) == len(phases)
+	for line in folded_lines:
+		phase_path, microseconds = line.rsplit(' ', 1)
+		assert phase_path in phases
+		assert int(microseconds) >= 0
+
+
+def test_count_jsii_calls():
+	with profiling.count_jsii_calls() as jsii_calls:
+		app = cdk.App()
+		cdk.Stack(app, 'StackForTests')
+
+	assert jsii_calls[0] > 0, 'Expected JSII calls to be counted'
+
+
+def test_stop_profiling_restores_jsii_send(monkeypatch):
+	monkeypatch.delenv(SYNTH_PROFILE_ENVIRONMENT_VARIABLE, raising=False)
+	node_process_class = profiling._get_node_process_class()
+	original_send = node_process_class.send
+
+	assert profiling.start_profiling(cdk.App(context={ SYNTH_PROFILE_CONTEXT_KEY: 'true' }))
+	assert node_process_class.send is not original_send
+
+	profiling.stop_profiling()
+	assert node_process_class.send is original_send
+
+
+def test_profiling_without_jsii_call_counting(monkeypatch, tmp_path):
+	monkeypatch.delenv(SYNTH_PROFILE_ENVIRONMENT_VARIABLE, raising=False)
+	monkeypatch.setattr(profiling, '_get_node_process_class', lambda: None)
+
+	app = cdk.App(context={ SYNTH_PROFILE_CONTEXT_KEY: 'true' })
+	assert profiling.start_profiling(app)
+	with profiling.synth_phase('StackForTests'):
+		cdk.Stack(app, 'StackForTests')
+	with profiling.count_jsii_calls() as jsii_calls:
+		cdk.Stack(app, 'OtherStackForTests')
+
+	assert jsii_calls[0] == 0
+	profiling.write_profile_report(str(tmp_path / 'cdk.out'))
+	report = json.loads((tmp_path / SYNTH_PROFILE_REPORT_FILE).read_text())
+	assert report['total_jsii_calls'] == 0
+	assert report['phases'][0]['seconds'] > 0
\ No newline at end of file
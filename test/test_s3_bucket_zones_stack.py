@@ -2,16 +2,37 @@
 # SPDX-License-Identifier: MIT-0
 import pytest
 import aws_cdk as cdk
-from aws_cdk.assertions import Template
+from aws_cdk.assertions import Template, Match
 
 from boto_mocking_helper import *
 from lib.s3_bucket_zones_stack import S3BucketZonesStack
 
 import lib.configuration as configuration
 from lib.configuration import (
-    DEV, PROD, TEST
+    DEV, PROD, TEST, ACCOUNT_ID, REGION, LOGICAL_ID_PREFIX, RESOURCE_NAME_PREFIX,
+    BUCKET_ZONE_CLEANSE, S3_EXPRESS_ZONES, S3_EXPRESS_AVAILABILITY_ZONE_ID,
+	BUCKET_TIERING, TIERING_INTELLIGENT_TIERING, TIERING_TRANSITIONS, TIERING_STORAGE_CLASS_ANALYSIS,
+	TIERING_ARCHIVE_DAYS, TIERING_STORAGE_CLASS, TIERING_DAYS, TIERING_PREFIX, TIERING_TAGS,
+	COLLECT_TRANSFER_ACCELERATION, COLLECT_MULTI_REGION_ACCESS_POINT, REPLICA_REGION,
+	S3_INVENTORY_FREQUENCY, S3_REQUEST_METRICS_PREFIXES
 )
 
+mock_configuration_base = {
+	ACCOUNT_ID: mock_account_id,
+	REGION: mock_region,
+	# Mix Deploy environment variables so we can return one dict for all environments
+	LOGICAL_ID_PREFIX: 'TestLake',
+	RESOURCE_NAME_PREFIX: 'testlake',
+}
+
+
+def mock_get_local_configuration_with_express_bucket(environment, local_mapping = None):
+	return mock_configuration_base | \
+		{
+			S3_EXPRESS_ZONES: [ BUCKET_ZONE_CLEANSE ],
+			S3_EXPRESS_AVAILABILITY_ZONE_ID: 'use1-az4',
+		}
+
 
 def test_resource_types_and_counts(monkeypatch):
 	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
@@ -72,4 +93,267 @@ def test_stack_has_correct_outputs(monkeypatch):
 	assert cleanse_bucket_output, 'Missing CF output for cleanse bucket'
 	assert consume_bucket_output, 'Missing CF output for consume bucket'
 	assert access_logs_bucket_output, 'Missing CF output for access logs bucket'
-	assert s3_kms_key_output, 'Missing CF output for s3 kms key'
\ No newline at end of file
+	assert s3_kms_key_output, 'Missing CF output for s3 kms key'
+
+def mock_get_local_configuration_with_bucket_tiering(environment, local_mapping = None):
+	return mock_configuration_base | \
+		{
+			BUCKET_TIERING: {
+				BUCKET_ZONE_CLEANSE: {
+					TIERING_INTELLIGENT_TIERING: [ { TIERING_ARCHIVE_DAYS: 90 } ],
+					TIERING_TRANSITIONS: [
+						{ TIERING_STORAGE_CLASS: 'GLACIER', TIERING_DAYS: 365, TIERING_TAGS: { 'retention': 'archive' } },
+					],
+					TIERING_STORAGE_CLASS_ANALYSIS: [ { TIERING_PREFIX: 'claims/' } ],
+				},
+			},
+		}
+
+def mock_get_local_configuration_with_collect_acceleration(environment, local_mapping = None):
+	return mock_configuration_base | \
+		{
+			COLLECT_TRANSFER_ACCELERATION: True,
+			COLLECT_MULTI_REGION_ACCESS_POINT: True,
+		}
+
+
+def test_express_bucket_created_for_configured_zone(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_express_bucket)
+
+	app = cdk.App()
+
+	bucket_stack = S3BucketZonesStack(
+		app,
+		'Dev-BucketsStackForTests',
+		target_environment=DEV,
+		deployment_account_id=mock_account_id,
+		env=cdk.Environment(
+			account=mock_account_id,
+			region=mock_region
+		),
+	)
+
+	template = Template.from_stack(bucket_stack)
+	template.resource_count_is('AWS::S3Express::DirectoryBucket', 1)
+	template.has_resource_properties(
+		'AWS::S3Express::DirectoryBucket',
+		Match.object_like({
+			'BucketName': Match.string_like_regexp(r'-cleanse--use1-az4--x-s3$'),
+			'DataRedundancy': 'SingleAvailabilityZone',
+			'LocationName': 'use1-az4',
+			'BucketEncryption': {
+				'ServerSideEncryptionConfiguration': [
+					Match.object_like({
+						'ServerSideEncryptionByDefault': Match.object_like({ 'SSEAlgorithm': 'aws:kms' }),
+					})
+				]
+			},
+		})
+	)
+	template.has_output('*', { 'Export': { 'Name': f'{DEV}CleanseExpressBucketName' } })
+
+
+def test_express_bucket_requires_availability_zone_id(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration',
+		lambda environment, local_mapping = None: mock_configuration_base | { S3_EXPRESS_ZONES: [ BUCKET_ZONE_CLEANSE ] })
+
+	app = cdk.App()
+
+	with pytest.raises(AttributeError) as e_info:
+		S3BucketZonesStack(
+			app,
+			'Dev-BucketsStackForTests',
+			target_environment=DEV,
+			deployment_account_id=mock_account_id,
+		)
+
+	assert e_info.match(f'{S3_EXPRESS_AVAILABILITY_ZONE_ID} is required'), \
+		'Expected Attribute Error for missing S3 Express availability zone ID not raised'
+
+
+def test_express_bucket_availability_zone_id_must_be_in_stack_region(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+
+	for availability_zone_id, message in [
+		('us-east-1a', 'is not an availability zone ID'),
+		('use2-az1', f'is not in region {mock_region}'),
+	]:
+		monkeypatch.setattr(configuration, 'get_local_configuration',
+			lambda environment, local_mapping = None: mock_configuration_base | {
+				S3_EXPRESS_ZONES: [ BUCKET_ZONE_CLEANSE ],
+				S3_EXPRESS_AVAILABILITY_ZONE_ID: availability_zone_id,
+			})
+		configuration.clear_configuration_cache()
+
+		app = cdk.App()
+
+		with pytest.raises(AttributeError) as e_info:
+			S3BucketZonesStack(
+				app,
+				'Dev-BucketsStackForTests',
+				target_environment=DEV,
+				deployment_account_id=mock_account_id,
+				env=cdk.Environment(
+					account=mock_account_id,
+					region=mock_region
+				),
+			)
+
+		assert e_info.match(message), \
+			f'Expected Attribute Error for S3 Express availability zone ID {availability_zone_id} not raised'
+
+
+def test_bucket_tiering_applied_to_configured_zone(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_bucket_tiering)
+
+	app = cdk.App()
+
+	bucket_stack = S3BucketZonesStack(
+		app,
+		'Dev-BucketsStackForTests',
+		target_environment=DEV,
+		deployment_account_id=mock_account_id,
+	)
+
+	template = Template.from_stack(bucket_stack)
+	template.has_resource_properties(
+		'AWS::S3::Bucket',
+		Match.object_like({
+			'AnalyticsConfigurations': [
+				Match.object_like({
+					'Prefix': 'claims/',
+					'StorageClassAnalysis': Match.object_like({
+						'DataExport': Match.object_like({ 'OutputSchemaVersion': 'V_1' }),
+					}),
+				})
+			],
+			'IntelligentTieringConfigurations': [
+				Match.object_like({
+					'Status': 'Enabled',
+					'Tierings': [ { 'AccessTier': 'ARCHIVE_ACCESS', 'Days': 90 } ],
+				})
+			],
+			'LifecycleConfiguration': {
+				'Rules': Match.array_with([
+					Match.object_like({
+						'ObjectSizeGreaterThan': 131072,
+						'TagFilters': [ { 'Key': 'retention', 'Value': 'archive' } ],
+						'Transitions': [ { 'StorageClass': 'GLACIER', 'TransitionInDays': 365 } ],
+					})
+				])
+			},
+		})
+	)
+	# Only the Cleanse bucket is analyzed
+	assert len(template.find_resources('AWS::S3::Bucket', {
+		'Properties': { 'AnalyticsConfigurations': Match.any_value() }
+	})) == 1
+
+
+def test_collect_bucket_accelerated_with_multi_region_access_point(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_collect_acceleration)
+
+	app = cdk.App()
+
+	bucket_stack = S3BucketZonesStack(
+		app,
+		'Dev-BucketsStackForTests',
+		target_environment=DEV,
+		deployment_account_id=mock_account_id,
+	)
+
+	template = Template.from_stack(bucket_stack)
+	# Only the Collect bucket is accelerated
+	assert len(template.find_resources('AWS::S3::Bucket', {
+		'Properties': { 'AccelerateConfiguration': { 'AccelerationStatus': 'Enabled' } }
+	})) == 1
+	template.resource_count_is('AWS::S3::MultiRegionAccessPoint', 1)
+	template.has_resource_properties(
+		'AWS::S3::MultiRegionAccessPoint',
+		Match.object_like({
+			'Name': 'dev-testlake-collect',
+			'PublicAccessBlockConfiguration': Match.object_like({ 'BlockPublicPolicy': True }),
+		})
+	)
+	template.has_output('*', { 'Export': { 'Name': f'{DEV}CollectBucketAcceleratedEndpoint' } })
+	template.has_output('*', { 'Export': { 'Name': f'{DEV}CollectMultiRegionAccessPointArn' } })
+
+
+def test_consume_bucket_replicates_to_replica_region(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration',
+		lambda environment, local_mapping = None: mock_configuration_base | { REPLICA_REGION: 'us-west-2' })
+
+	app = cdk.App()
+
+	bucket_stack = S3BucketZonesStack(
+		app,
+		'Dev-BucketsStackForTests',
+		target_environment=DEV,
+		deployment_account_id=mock_account_id,
+		env=cdk.Environment(
+			account=mock_account_id,
+			region=mock_region
+		),
+	)
+
+	template = Template.from_stack(bucket_stack)
+	replicated_buckets = template.find_resources('AWS::S3::Bucket', {
+		'Properties': { 'ReplicationConfiguration': Match.any_value() }
+	})
+	assert len(replicated_buckets) == 1, 'Expected only the Consume bucket to be replicated'
+	template.has_resource_properties(
+		'AWS::S3::Bucket',
+		Match.object_like({
+			'BucketName': f'dev-testlake-{mock_account_id}-{mock_region}-consume',
+			'ReplicationConfiguration': Match.object_like({
+				'Rules': [
+					Match.object_like({
+						'Destination': Match.object_like({
+							'ReplicationTime': { 'Status': 'Enabled', 'Time': { 'Minutes': 15 } },
+							'EncryptionConfiguration': Match.any_value(),
+						}),
+					})
+				]
+			}),
+		})
+	)
+
+
+def test_zone_buckets_report_inventory_and_request_metrics(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration',
+		lambda environment, local_mapping = None: mock_configuration_base | {
+			S3_INVENTORY_FREQUENCY: 'WEEKLY',
+			S3_REQUEST_METRICS_PREFIXES: [ '', 'claims/' ],
+		})
+
+	app = cdk.App()
+
+	bucket_stack = S3BucketZonesStack(
+		app,
+		'Dev-BucketsStackForTests',
+		target_environment=DEV,
+		deployment_account_id=mock_account_id,
+	)
+
+	template = Template.from_stack(bucket_stack)
+	reported_buckets = template.find_resources('AWS::S3::Bucket', {
+		'Properties': {
+			'InventoryConfigurations': [
+				Match.object_like({
+					'Destination': Match.object_like({ 'Format': 'Parquet', 'Prefix': 'inventory' }),
+					'ScheduleFrequency': 'Weekly',
+				})
+			],
+			'MetricsConfigurations': [
+				{ 'Id': 'RequestMetrics1' },
+				{ 'Id': 'RequestMetrics2', 'Prefix': 'claims/' },
+			],
+		}
+	})
+	assert len(reported_buckets) == 3, 'Expected inventory and request metrics on Collect, Cleanse and Consume buckets'
\ No newline at end of file
@@ -0,0 +1,98 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import pytest
+import aws_cdk as cdk
+from aws_cdk.assertions import Template
+
+from boto_mocking_helper import *
+from lib.s3_replica_stack import S3ReplicaStack
+
+import lib.configuration as configuration
+from lib.configuration import (
+	DEV, ACCOUNT_ID, REGION, LOGICAL_ID_PREFIX, RESOURCE_NAME_PREFIX,
+	BUCKET_ZONE_COLLECT, BUCKET_ZONE_CLEANSE, BUCKET_ZONE_CONSUME, REPLICA_REGION, REPLICATION_ZONES
+)
+
+mock_replica_region = 'us-west-2'
+
+mock_configuration_base = {
+	ACCOUNT_ID: mock_account_id,
+	REGION: mock_region,
+	# Mix Deploy environment variables so we can return one dict for all environments
+	LOGICAL_ID_PREFIX: 'TestLake',
+	RESOURCE_NAME_PREFIX: 'testlake',
+	REPLICA_REGION: mock_replica_region,
+}
+
+
+def mock_get_local_configuration_with_cleanse_replica(environment, local_mapping = None):
+	return mock_configuration_base | \
+		{
+			REPLICATION_ZONES: [ BUCKET_ZONE_CLEANSE, BUCKET_ZONE_CONSUME ],
+		}
+
+
+def test_resource_types_and_counts(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration',
+		lambda environment, local_mapping = None: mock_configuration_base)
+
+	app = cdk.App()
+
+	replica_stack = S3ReplicaStack(
+		app,
+		'Dev-ReplicaStackForTests',
+		target_environment=DEV,
+		env=cdk.Environment(account=mock_account_id, region=mock_replica_region),
+	)
+
+	template = Template.from_stack(replica_stack)
+	# Access logs bucket and Consume replica bucket
+	template.resource_count_is('AWS::S3::Bucket', 2)
+	template.resource_count_is('AWS::KMS::Key', 1)
+	template.has_resource_properties('AWS::KMS::Alias', {
+		'AliasName': 'alias/dev-testlake-replica-kms-key',
+	})
+	template.has_resource_properties('AWS::S3::Bucket', {
+		'BucketName': f'dev-testlake-{mock_account_id}-{mock_replica_region}-consume',
+	})
+
+
+def test_stack_has_correct_outputs(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_cleanse_replica)
+
+	app = cdk.App()
+
+	replica_stack = S3ReplicaStack(
+		app,
+		'Dev-ReplicaStackForTests',
+		target_environment=DEV,
+		env=cdk.Environment(account=mock_account_id, region=mock_replica_region),
+	)
+
+	template = Template.from_stack(replica_stack)
+	output_names = [ output['Export']['Name'] for output in template.find_outputs('*').values() ]
+
+	assert f'{DEV}ReplicaS3KmsKeyArn' in output_names, 'Missing CF output for replica kms key'
+	assert f'{DEV}ReplicaCleanseBucketName' in output_names, 'Missing CF output for cleanse replica bucket'
+	assert f'{DEV}ReplicaConsumeBucketName' in output_names, 'Missing CF output for consume replica bucket'
+
+
+def test_collect_zone_cannot_be_replicated(monkeypatch):
+	monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+	monkeypatch.setattr(configuration, 'get_local_configuration',
+		lambda environment, local_mapping = None: mock_configuration_base | { REPLICATION_ZONES: [ BUCKET_ZONE_COLLECT ] })
+
+	app = cdk.App()
+
+	with pytest.raises(AttributeError) as e_info:
+		S3ReplicaStack(
+			app,
+			'Dev-ReplicaStackForTests',
+			target_environment=DEV,
+			env=cdk.Environment(account=mock_account_id, region=mock_replica_region),
+		)
+
+	assert e_info.match('Replication zone collect'), \
+		'Expected Attribute Error for unsupported replication zone not raised'
\ No newline at end of file
@@ -0,0 +1,83 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import pytest
+import aws_cdk as cdk
+
+from lib.stack_registry import (
+	StackRegistry, STACK_SELECTION_CONTEXT_KEY, STACK_SELECTION_ENVIRONMENT_VARIABLE
+)
+from lib.configuration import DEPLOYMENT, DEV, PROD, TEST
+
+test_stack_ids = [ f'{DEPLOYMENT}-TestMirrorRepository' ] + \
+	[ f'{environment}-TestPipeline' for environment in [DEV, TEST, PROD] ]
+
+
+def register_test_stacks(stack_registry: StackRegistry) -> list:
+	constructed_stack_ids = []
+	def mock_stack_factory(scope, construct_id):
+		constructed_stack_ids.append(construct_id)
+		return cdk.Stack(scope, construct_id)
+
+	for stack_id in test_stack_ids:
+		stack_registry.register(stack_id, mock_stack_factory)
+
+	return constructed_stack_ids
+
+
+def test_all_stacks_built_without_selection(monkeypatch):
+	monkeypatch.delenv(STACK_SELECTION_ENVIRONMENT_VARIABLE, raising=False)
+
+	app = cdk.App()
+	stack_registry = StackRegistry(app)
+	constructed_stack_ids = register_test_stacks(stack_registry)
+	stacks = stack_registry.build()
+
+	assert constructed_stack_ids == test_stack_ids
+	assert len(app.node.children) == len(test_stack_ids), 'Unexpected number of stacks'
+	assert list(stacks.keys()) == test_stack_ids
+
+
+def test_only_selected_stacks_built_from_context(monkeypatch):
+	monkeypatch.delenv(STACK_SELECTION_ENVIRONMENT_VARIABLE, raising=False)
+
+	app = cdk.App(context={ STACK_SELECTION_CONTEXT_KEY: f'{DEV}-*/{DEV}/*, {DEPLOYMENT}-*' })
+	stack_registry = StackRegistry(app)
+	constructed_stack_ids = register_test_stacks(stack_registry)
+	stack_registry.build()
+
+	assert constructed_stack_ids == [ f'{DEPLOYMENT}-TestMirrorRepository', f'{DEV}-TestPipeline' ]
+	assert len(app.node.children) == 2, 'Unexpected number of stacks'
+
+
+def test_selection_from_environment_overrides_default(monkeypatch):
+	monkeypatch.setenv(STACK_SELECTION_ENVIRONMENT_VARIABLE, f'{PROD}-TestPipeline')
+
+	app = cdk.App()
+	stack_registry = StackRegistry(app, default_patterns=[ f'{TEST}-*' ])
+	constructed_stack_ids = register_test_stacks(stack_registry)
+	stack_registry.build()
+
+	assert constructed_stack_ids == [ f'{PROD}-TestPipeline' ]
+
+
+def test_default_patterns_used_without_selection(monkeypatch):
+	monkeypatch.delenv(STACK_SELECTION_ENVIRONMENT_VARIABLE, raising=False)
+
+	app = cdk.App()
+	stack_registry = StackRegistry(app, default_patterns=[ f'{TEST}-*' ])
+	constructed_stack_ids = register_test_stacks(stack_registry)
+	stack_registry.build()
+
+	assert constructed_stack_ids == [ f'{TEST}-TestPipeline' ]
+
+
+def test_duplicate_registration_error():
+	app = cdk.App()
+	stack_registry = StackRegistry(app)
+	stack_registry.register(f'{DEV}-TestPipeline', lambda scope, construct_id: None)
+
+	with pytest.raises(AttributeError) as e_info:
+		stack_registry.register(f'{DEV}-TestPipeline', lambda scope, construct_id: None)
+
+	assert e_info.match('already registered'), \
+		'Expected Attribute Error for duplicate stack registration not raised'
\ No newline at end of file
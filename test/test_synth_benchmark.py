@@ -0,0 +1,207 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+# Synth benchmarks are skipped unless pytest is run with --benchmark; use --benchmark-update-baseline
+# to record new baseline values in benchmark_baseline.json after an intentional change
+import os
+import sys
+import time
+import json
+import runpy
+import subprocess
+import pytest
+import aws_cdk as cdk
+from aws_cdk.assertions import Template
+
+from boto_mocking_helper import *
+from lib.vpc_stack import VpcStack
+from lib.s3_bucket_zones_stack import S3BucketZonesStack
+from lib.pipeline_deploy_stage import PipelineDeployStage
+from lib.pipeline_stack import PipelineStack
+from lib.profiling import count_jsii_calls
+
+import lib.configuration as configuration
+from lib.configuration import (
+    DEV, ACCOUNT_ID, REGION, VPC_CIDR, RESOURCE_NAME_PREFIX, LOGICAL_ID_PREFIX,
+    CODECOMMIT_MIRROR_REPOSITORY_NAME, GITHUB_REPOSITORY_NAME, CODESTAR_REPOSITORY_NAME,
+)
+
+pytestmark = pytest.mark.benchmark
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+# Allowed regression over baseline for each metric as (factor, absolute slack); wall time is
+# noisy across build agents, JSII call counts are deterministic for a given CDK version
+REGRESSION_TOLERANCE = {
+    'seconds': (1.5, 0.5),
+    'jsii_calls': (1.1, 0),
+    'peak_rss_mb': (1.2, 32),
+}
+# Node JIT keeps speeding up synth for the first few runs of a case in a fresh process, so warm up
+# each case enough times that its results do not depend on which cases ran before it
+WARMUP_RUNS = 3
+# Command line flag for cases run in a fresh process that synthesize with the embedded local
+# configuration instead of the mocked one
+EMBEDDED_CONFIGURATION_FLAG = '--embedded-configuration'
+
+mock_environment = cdk.Environment(account=mock_account_id, region=mock_region)
+
+def mock_get_local_configuration_with_vpc(environment, local_mapping = None):
+    return {
+        ACCOUNT_ID: mock_account_id,
+        REGION: mock_region,
+        VPC_CIDR: '10.0.0.0/24',
+        LOGICAL_ID_PREFIX: 'TestLake',
+        RESOURCE_NAME_PREFIX: 'testlake',
+        CODECOMMIT_MIRROR_REPOSITORY_NAME: 'mock-codecommit-repository',
+        GITHUB_REPOSITORY_NAME: '',
+        CODESTAR_REPOSITORY_NAME: '',
+    }
+
+
+def synth_vpc_stack():
+    app = cdk.App()
+    Template.from_stack(VpcStack(app, 'Dev-VpcStackForBenchmark', target_environment=DEV, env=mock_environment))
+
+
+def synth_s3_bucket_zones_stack():
+    app = cdk.App()
+    Template.from_stack(S3BucketZonesStack(
+        app, 'Dev-BucketsStackForBenchmark',
+        target_environment=DEV, deployment_account_id=mock_account_id, env=mock_environment))
+
+
+def synth_pipeline_deploy_stage():
+    app = cdk.App()
+    stage = PipelineDeployStage(
+        app, DEV, target_environment=DEV, deployment_account_id=mock_account_id, env=mock_environment)
+    stage.synth()
+
+
+def synth_pipeline_stack():
+    app = cdk.App()
+    Template.from_stack(PipelineStack(
+        app, 'Dev-PipelineStackForBenchmark',
+        target_environment=DEV, target_branch='main',
+        target_aws_env={ 'account': mock_account_id, 'region': mock_region },
+        env=mock_environment))
+
+
+def synth_app():
+    app_path = os.path.join(os.path.dirname(__file__), '..', 'app.py')
+    runpy.run_path(app_path, run_name='__main__')
+
+
+def get_peak_rss_mb(case_function, embedded_configuration: bool) -> float:
+    """Runs a benchmark case once in a fresh Python process and returns the peak RSS of that
+    process and its JSII node process, which holds the construct tree; returns None on platforms
+    without wait4
+    """
+    if not hasattr(os, 'wait4'):
+        return None
+
+    repository_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [ sys.executable, os.path.abspath(__file__), case_function.__name__ ]
+    if embedded_configuration:
+        command.append(EMBEDDED_CONFIGURATION_FLAG)
+    process = subprocess.Popen(
+        command,
+        cwd=repository_path,
+        env={ **os.environ, 'PYTHONPATH': repository_path },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    # wait4 returns the usage of this child only; ru_maxrss includes the node process, which
+    # JSII waits for when the child exits, unlike RUSAGE_CHILDREN of this long-lived process
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    assert process.returncode == 0, f'{case_function.__name__} failed in a fresh process'
+
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    peak_rss_bytes = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    return round(peak_rss_bytes / 1024 / 1024, 1)
+
+
+@pytest.fixture
+def measure(request, benchmark_results):
+    """Runs a benchmark case WARMUP_RUNS times to warm up the JSII runtime (module loading and
+    JIT), then runs it again to record wall time and JSII calls, and once more in a fresh process
+    to record its peak RSS without the memory retained by earlier cases
+    """
+    def run_measured(case_function, embedded_configuration: bool = False):
+        for _ in range(WARMUP_RUNS):
+            case_function()
+
+        with count_jsii_calls() as jsii_calls:
+            start_time = time.perf_counter()
+            case_function()
+            seconds = time.perf_counter() - start_time
+
+        result = {
+            'seconds': round(seconds, 2),
+            'jsii_calls': jsii_calls[0],
+        }
+        peak_rss_mb = get_peak_rss_mb(case_function, embedded_configuration)
+        if peak_rss_mb is not None:
+            result['peak_rss_mb'] = peak_rss_mb
+        benchmark_results[request.node.name] = result
+        check_baseline(request, request.node.name, result)
+
+    return run_measured
+
+
+def check_baseline(request, case_name: str, result: dict):
+    """Fails the benchmark if any metric regresses beyond the tolerance of the stored baseline
+    """
+    if request.config.getoption('--benchmark-update-baseline') or not os.path.exists(BASELINE_FILE):
+        return
+
+    with open(BASELINE_FILE, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file).get(case_name)
+    if baseline is None:
+        return
+
+    regressions = [
+        f'{metric} {result[metric]} exceeds baseline {baseline[metric]} x {factor} + {slack}'
+        for metric, (factor, slack) in REGRESSION_TOLERANCE.items()
+        if metric in baseline and metric in result and result[metric] > baseline[metric] * factor + slack
+    ]
+    assert not regressions, f'{case_name} regressed: ' + '; '.join(regressions)
+
+
+@pytest.fixture
+def mock_configuration(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_vpc)
+
+
+def test_benchmark_vpc_stack(measure, mock_configuration):
+    measure(synth_vpc_stack)
+
+
+def test_benchmark_s3_bucket_zones_stack(measure, mock_configuration):
+    measure(synth_s3_bucket_zones_stack)
+
+
+def test_benchmark_pipeline_deploy_stage(measure, mock_configuration):
+    measure(synth_pipeline_deploy_stage)
+
+
+def test_benchmark_pipeline_stack(measure, mock_configuration):
+    measure(synth_pipeline_stack)
+
+
+def test_benchmark_app_synth(measure, monkeypatch, tmp_path):
+    # Use the embedded local mapping with mocked STS
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setenv('CDK_OUTDIR', str(tmp_path))
+    for variable in [ 'ENV', 'STACKS', 'IS_BOOTSTRAP', 'CDK_CONTEXT_JSON' ]:
+        monkeypatch.delenv(variable, raising=False)
+
+    measure(synth_app, embedded_configuration=True)
+
+
+if __name__ == '__main__':
+    # Runs a single case with the same mocks as its test, so get_peak_rss_mb can measure it alone
+    configuration.boto3.client = mock_boto3_client
+    if EMBEDDED_CONFIGURATION_FLAG not in sys.argv[2:]:
+        configuration.get_local_configuration = mock_get_local_configuration_with_vpc
+    globals()[sys.argv[1]]()
\ No newline at end of file
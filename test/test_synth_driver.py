@@ -0,0 +1,72 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import json
+import pytest
+
+import lib.synth_driver as synth_driver
+from lib.stack_registry import STACK_SELECTION_CONTEXT_KEY, STACK_SELECTION_ENVIRONMENT_VARIABLE
+from lib.configuration import DEPLOYMENT, DEV, PROD, TEST
+
+
+def write_mock_assembly(assembly_dir, stack_name: str, template: dict = None):
+	assembly_dir.mkdir(parents=True)
+	(assembly_dir / 'cdk.out').write_text('{"version":"1.0.0"}')
+	(assembly_dir / f'{stack_name}.template.json').write_text(json.dumps(template or { 'Resources': {} }))
+	(assembly_dir / f'assembly-{stack_name}').mkdir()
+	(assembly_dir / f'assembly-{stack_name}' / 'manifest.json').write_text('{}')
+	(assembly_dir / 'manifest.json').write_text(json.dumps({
+		'version': '1.0.0',
+		'artifacts': {
+			stack_name: { 'type': 'aws:cloudformation:stack', 'properties': {
+				'templateFile': f'{stack_name}.template.json' } },
+			'Tree': { 'type': 'cdk:tree', 'properties': { 'file': 'tree.json' } },
+		},
+	}))
+	(assembly_dir / 'tree.json').write_text(json.dumps({
+		'version': 'tree-0.1',
+		'tree': { 'id': 'App', 'path': '', 'children': { stack_name: { 'id': stack_name } } },
+	}))
+
+
+def test_get_synth_groups_defaults_to_one_group_per_environment(monkeypatch):
+	monkeypatch.delenv(STACK_SELECTION_ENVIRONMENT_VARIABLE, raising=False)
+	monkeypatch.delenv('ENV', raising=False)
+
+	assert synth_driver.get_synth_groups({}) == \
+		[ f'{environment}-*' for environment in [DEPLOYMENT, DEV, TEST, PROD] ]
+
+
+def test_get_synth_groups_uses_selection(monkeypatch):
+	monkeypatch.delenv(STACK_SELECTION_ENVIRONMENT_VARIABLE, raising=False)
+
+	assert synth_driver.get_synth_groups({ STACK_SELECTION_CONTEXT_KEY: f'{DEV}-*, {PROD}-*' }) == \
+		[ f'{DEV}-*', f'{PROD}-*' ]
+
+
+def test_merge_assemblies_combines_artifacts(tmp_path):
+	write_mock_assembly(tmp_path / 'dev', f'{DEV}-TestPipeline')
+	write_mock_assembly(tmp_path / 'test', f'{TEST}-TestPipeline')
+
+	outdir = tmp_path / 'merged'
+	synth_driver.merge_assemblies([ str(tmp_path / 'dev'), str(tmp_path / 'test') ], str(outdir))
+
+	manifest = json.loads((outdir / 'manifest.json').read_text())
+	tree = json.loads((outdir / 'tree.json').read_text())
+	for stack_name in [ f'{DEV}-TestPipeline', f'{TEST}-TestPipeline' ]:
+		assert stack_name in manifest['artifacts'], f'Missing {stack_name} artifact from merged manifest'
+		assert stack_name in tree['tree']['children'], f'Missing {stack_name} from merged construct tree'
+		assert (outdir / f'{stack_name}.template.json').exists()
+		assert (outdir / f'assembly-{stack_name}' / 'manifest.json').exists()
+	assert (outdir / 'cdk.out').exists()
+
+
+def test_merge_assemblies_catches_conflicting_files(tmp_path):
+	write_mock_assembly(tmp_path / 'first', f'{DEV}-TestPipeline')
+	write_mock_assembly(tmp_path / 'second', f'{DEV}-TestPipeline', template={ 'Resources': { 'Changed': {} } })
+
+	with pytest.raises(RuntimeError) as e_info:
+		synth_driver.merge_assemblies(
+			[ str(tmp_path / 'first'), str(tmp_path / 'second') ], str(tmp_path / 'merged'))
+
+	assert e_info.match('differs between synth groups'), \
+		'Expected Runtime Error for conflicting cloud assembly files not raised'
\ No newline at end of file
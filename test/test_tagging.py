@@ -6,6 +6,7 @@ import aws_cdk.aws_s3 as s3
 from aws_cdk.assertions import Template, Match
 
 import lib.tagging as tagging
+import lib.configuration as configuration
 from lib.tagging import (
 	COST_CENTER, TAG_ENVIRONMENT, TEAM, APPLICATION
 )
@@ -89,4 +90,73 @@ def test_tagging_stack_resource(monkeypatch):
 				]
 			}
 		)
+	)
+
+def test_tag_table_is_built_once(monkeypatch):
+	configuration_calls = []
+	def mock_get_all_configurations_counting():
+		configuration_calls.append(test_environment)
+		return mock_get_all_configurations()
+
+	monkeypatch.setattr(tagging, 'get_all_configurations', mock_get_all_configurations_counting)
+	monkeypatch.setattr(tagging, 'get_logical_id_prefix', mock_get_logical_id_prefix)
+	monkeypatch.setattr(tagging, 'get_resource_name_prefix', mock_get_resource_name_prefix)
+
+	app = cdk.App()
+	for stack_number in range(3):
+		tagging.tag(cdk.Stack(app, f'StackForTests{stack_number}'), test_environment)
+	tagging.get_tag(TEAM, test_environment)
+
+	assert len(configuration_calls) == 1, 'Expected tag table to be built once per environment'
+
+	with pytest.raises(TypeError):
+		tagging.get_tag_table(test_environment)[TEAM] = ('key', 'value')
+
+
+def test_tag_table_is_rebuilt_after_configuration_reload(monkeypatch):
+	monkeypatch.setattr(tagging, 'get_all_configurations', mock_get_all_configurations)
+	monkeypatch.setattr(tagging, 'get_logical_id_prefix', mock_get_logical_id_prefix)
+	monkeypatch.setattr(tagging, 'get_resource_name_prefix', mock_get_resource_name_prefix)
+	assert tagging.get_tag(TEAM, test_environment) == (f'{test_resource_prefix}:team', f'{test_id_prefix}Admin')
+
+	monkeypatch.setattr(tagging, 'get_resource_name_prefix', lambda: 'reloadedprefix')
+	configuration.clear_configuration_cache()
+
+	assert tagging.get_tag(TEAM, test_environment)[0] == 'reloadedprefix:team', \
+		'Expected tag table to be rebuilt after the configuration cache is cleared'
+
+
+def test_registered_tag_is_applied(monkeypatch):
+	monkeypatch.setattr(tagging, 'get_all_configurations', mock_get_all_configurations)
+	monkeypatch.setattr(tagging, 'get_logical_id_prefix', mock_get_logical_id_prefix)
+	monkeypatch.setattr(tagging, 'get_resource_name_prefix', mock_get_resource_name_prefix)
+
+	# Build the table first to verify registration invalidates it
+	tagging.get_tag_table(test_environment)
+	tagging.register_tag('DATA_CLASSIFICATION', 'data-classification', 'confidential')
+	tagging.register_tag(COST_CENTER, 'cost-center', 'GlobalCostCenter')
+	tagging.register_tag(COST_CENTER, 'cost-center', 'DeployCostCenter', target_environment=test_environment)
+
+	app = cdk.App()
+	stack = cdk.Stack(app, 'StackForTests')
+	s3.Bucket(stack, 'BucketForTests')
+	tagging.tag(stack, test_environment)
+
+	template = Template.from_stack(stack)
+	template.has_resource_properties(
+		'AWS::S3::Bucket',
+		Match.object_like(
+			{
+				"Tags": Match.array_with([
+					{
+						"Key": f"{test_resource_prefix}:cost-center",
+						"Value": "DeployCostCenter"
+					},
+					{
+						"Key": f"{test_resource_prefix}:data-classification",
+						"Value": "confidential"
+					},
+				])
+			}
+		)
 	)
\ No newline at end of file
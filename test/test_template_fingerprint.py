@@ -0,0 +1,108 @@
+# Copyright Amazon.com and its affiliates; all rights reserved. This file is Amazon Web Services Content and may not be duplicated or distributed without permission.
+# SPDX-License-Identifier: MIT-0
+import json
+import subprocess
+import pytest
+
+import lib.template_fingerprint as template_fingerprint
+from lib.configuration import DEV, TEST
+
+dev_stack_name = f'{DEV}-TestPipeline/{DEV}/TestStack'
+test_stack_name = f'{TEST}-TestPipeline/{TEST}/TestStack'
+
+
+def write_mock_stage_assembly(assembly_dir, stack_name: str, template: dict, asset_hash: str):
+	stage_dir_name = f'assembly-{stack_name.rsplit("/", 1)[0].replace("/", "-")}'
+	stage_dir = assembly_dir / stage_dir_name
+	stage_dir.mkdir(parents=True)
+	(stage_dir / 'TestStack.template.json').write_text(json.dumps(template))
+	(stage_dir / 'TestStack.assets.json').write_text(json.dumps({
+		'version': '1.0.0',
+		'files': { asset_hash: { 'source': { 'path': f'asset.{asset_hash}' } } },
+	}))
+	(stage_dir / 'manifest.json').write_text(json.dumps({
+		'version': '1.0.0',
+		'artifacts': {
+			'TestStack.assets': { 'type': 'cdk:asset-manifest', 'properties': { 'file': 'TestStack.assets.json' } },
+			'TestStack': {
+				'type': 'aws:cloudformation:stack',
+				'displayName': stack_name,
+				'properties': { 'templateFile': 'TestStack.template.json' },
+				'dependencies': [ 'TestStack.assets' ],
+			},
+		},
+	}))
+
+	manifest_path = assembly_dir / 'manifest.json'
+	manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else { 'artifacts': {} }
+	manifest['artifacts'][stage_dir_name] = {
+		'type': 'cdk:cloud-assembly', 'properties': { 'directoryName': stage_dir_name } }
+	manifest_path.write_text(json.dumps(manifest))
+
+
+@pytest.fixture
+def assembly_dir(tmp_path):
+	assembly_dir = tmp_path / 'cdk.out'
+	assembly_dir.mkdir()
+	write_mock_stage_assembly(assembly_dir, dev_stack_name, { 'Resources': {} }, 'devassethash')
+	write_mock_stage_assembly(assembly_dir, test_stack_name, { 'Resources': {} }, 'testassethash')
+	return assembly_dir
+
+
+def test_fingerprints_include_nested_assemblies_and_filter_stacks(assembly_dir):
+	fingerprints = template_fingerprint.get_stack_fingerprints(str(assembly_dir))
+	assert set(fingerprints) == { dev_stack_name, test_stack_name }
+	# Same template, different assets
+	assert fingerprints[dev_stack_name] != fingerprints[test_stack_name]
+
+	assert list(template_fingerprint.get_stack_fingerprints(str(assembly_dir), [ f'{DEV}-*/{DEV}/*' ])) \
+		== [ dev_stack_name ]
+
+
+def test_fingerprint_changes_with_template(assembly_dir):
+	fingerprint = template_fingerprint.get_stack_fingerprints(str(assembly_dir))[dev_stack_name]
+
+	template_path = assembly_dir / f'assembly-{DEV}-TestPipeline-{DEV}' / 'TestStack.template.json'
+	template_path.write_text(json.dumps({ 'Resources': { 'Bucket': { 'Type': 'AWS::S3::Bucket' } } }))
+
+	assert template_fingerprint.get_stack_fingerprints(str(assembly_dir))[dev_stack_name] != fingerprint
+
+
+def test_only_changed_stacks_reported_after_record(assembly_dir, tmp_path):
+	store = str(tmp_path / 'fingerprints' / f'{DEV}.json')
+
+	assert template_fingerprint.get_changed_stacks(str(assembly_dir), store) == [ dev_stack_name, test_stack_name ]
+
+	template_fingerprint.record_fingerprints(str(assembly_dir), store, [ f'{DEV}-*' ])
+	assert template_fingerprint.get_changed_stacks(str(assembly_dir), store) == [ test_stack_name ]
+	assert template_fingerprint.get_changed_stacks(str(assembly_dir), store, [ f'{DEV}-*' ]) == []
+
+
+def test_main_prints_changed_result(assembly_dir, tmp_path, capsys):
+	arguments = [ '--assembly', str(assembly_dir), '--store', str(tmp_path / 'store.json'), '--stacks', f'{DEV}-*' ]
+
+	assert template_fingerprint.main([ 'check' ] + arguments) == 0
+	assert capsys.readouterr().out == 'true\n'
+
+	template_fingerprint.main([ 'record' ] + arguments)
+	template_fingerprint.main([ 'check' ] + arguments)
+	assert capsys.readouterr().out == 'false\n'
+
+
+def test_s3_store_missing_object_is_empty(monkeypatch):
+	def mock_run(command, **kwargs):
+		return subprocess.CompletedProcess(command, 1, stdout='',
+			stderr='fatal error: An error occurred (404) when calling the HeadObject operation: Key not found')
+	monkeypatch.setattr(template_fingerprint.subprocess, 'run', mock_run)
+
+	assert template_fingerprint.read_fingerprints('s3://mock-bucket/fingerprints/Dev.json') == {}
+
+
+def test_s3_store_access_denied_raises(monkeypatch):
+	def mock_run(command, **kwargs):
+		return subprocess.CompletedProcess(command, 1, stdout='',
+			stderr='fatal error: An error occurred (403) when calling the HeadObject operation: Forbidden')
+	monkeypatch.setattr(template_fingerprint.subprocess, 'run', mock_run)
+
+	with pytest.raises(RuntimeError):
+		template_fingerprint.read_fingerprints('s3://mock-bucket/fingerprints/Dev.json')
\ No newline at end of file
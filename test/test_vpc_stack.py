@@ -2,14 +2,20 @@
 # SPDX-License-Identifier: MIT-0
 import pytest
 import aws_cdk as cdk
-from aws_cdk.assertions import Template
+from aws_cdk.assertions import Template, Match
 
 from boto_mocking_helper import *
 from lib.vpc_stack import VpcStack
 
 import lib.configuration as configuration
 from lib.configuration import (
-    DEV, PROD, TEST, ACCOUNT_ID, REGION, VPC_CIDR, RESOURCE_NAME_PREFIX, LOGICAL_ID_PREFIX
+    DEV, PROD, TEST, ACCOUNT_ID, REGION, VPC_CIDR, RESOURCE_NAME_PREFIX, LOGICAL_ID_PREFIX,
+    VPC_TOPOLOGY, VPC_TOPOLOGY_AVAILABILITY_ZONES, VPC_TOPOLOGY_SUBNET_MASKS, VPC_TOPOLOGY_NAT,
+    VPC_SUBNET_TIER_PUBLIC, VPC_SUBNET_TIER_PRIVATE, VPC_NAT_SHARED, VPC_NAT_INSTANCE, VPC_NAT_NONE,
+    VPC_INTERFACE_ENDPOINTS, VPC_ENDPOINT_POLICIES, VPC_ETL_INTERFACE_ENDPOINTS,
+    S3_INTERFACE_ENDPOINT, S3_INTERFACE_ENDPOINT_CLIENT_CIDRS,
+    ENDPOINT_HUB_VPC_CIDR, ENDPOINT_HUB_TRANSIT_GATEWAY_ID, ENDPOINT_HUB_ROUTE53_PROFILE_ID,
+    VPC_TOPOLOGY_DUAL_STACK
 )
 
 def mock_get_local_configuration_with_vpc(environment, local_mapping = None):
@@ -22,6 +28,81 @@ def mock_get_local_configuration_with_vpc(environment, local_mapping = None):
         RESOURCE_NAME_PREFIX: 'testlake',
     }
 
+def mock_get_local_configuration_with_shared_nat(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        VPC_CIDR: '10.0.0.0/16',
+        VPC_TOPOLOGY: {
+            VPC_TOPOLOGY_SUBNET_MASKS: { VPC_SUBNET_TIER_PUBLIC: 28, VPC_SUBNET_TIER_PRIVATE: 20 },
+            VPC_TOPOLOGY_NAT: VPC_NAT_SHARED,
+        },
+    }
+
+def mock_get_local_configuration_with_nat_instances(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        VPC_TOPOLOGY: { VPC_TOPOLOGY_NAT: VPC_NAT_INSTANCE },
+    }
+
+def mock_get_local_configuration_with_isolated_subnets(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        VPC_TOPOLOGY: { VPC_TOPOLOGY_NAT: VPC_NAT_NONE },
+    }
+
+def mock_get_local_configuration_with_four_azs(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        VPC_TOPOLOGY: { VPC_TOPOLOGY_AVAILABILITY_ZONES: 4 },
+    }
+
+def mock_get_local_configuration_with_endpoint_catalog(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        VPC_INTERFACE_ENDPOINTS: VPC_ETL_INTERFACE_ENDPOINTS,
+        VPC_ENDPOINT_POLICIES: {
+            'S3': [ {
+                'Effect': 'Allow',
+                'Principal': { 'AWS': '*' },
+                'Action': [ 's3:GetObject' ],
+                'Resource': [ 'arn:aws:s3:::testlake-*/*' ],
+            } ],
+            'SQS': [ {
+                'Effect': 'Allow',
+                'Principal': { 'AWS': '*' },
+                'Action': [ 'sqs:SendMessage' ],
+                'Resource': [ '*' ],
+            } ],
+        },
+    }
+
+def mock_get_local_configuration_with_bad_endpoint_policy(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        VPC_ENDPOINT_POLICIES: { 'SQS': [] },
+    }
+
+def mock_get_local_configuration_with_s3_interface_endpoint(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        S3_INTERFACE_ENDPOINT: True,
+        S3_INTERFACE_ENDPOINT_CLIENT_CIDRS: [ '192.168.0.0/16' ],
+    }
+
+def mock_get_local_configuration_with_endpoint_hub_spoke(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        ENDPOINT_HUB_VPC_CIDR: '10.255.0.0/24',
+        ENDPOINT_HUB_TRANSIT_GATEWAY_ID: 'tgw-0123456789abcdef0',
+        ENDPOINT_HUB_ROUTE53_PROFILE_ID: 'rp-0123456789abcdef',
+    }
+
+def mock_get_local_configuration_with_dual_stack(environment, local_mapping = None):
+    return {
+        **mock_get_local_configuration_with_vpc(environment, local_mapping),
+        VPC_TOPOLOGY: { VPC_TOPOLOGY_DUAL_STACK: True },
+    }
+
 def test_resource_types_and_counts(monkeypatch):
     monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
     monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_vpc)
@@ -132,4 +213,256 @@ def test_vpc_has_three_availability_zones(monkeypatch):
     )
 
     assert len(vpc_stack.availability_zones) == 3, \
-        'Unexpected number of availability zones in the vpc'
\ No newline at end of file
+        'Unexpected number of availability zones in the vpc'
+
+
+def test_vpc_topology_shared_nat_gateway_and_subnet_masks(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_shared_nat)
+
+    app = cdk.App()
+    vpc_stack = VpcStack(
+        app,
+        'Dev-VpcStackForTests',
+        target_environment=DEV,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(vpc_stack)
+    template.resource_count_is('AWS::EC2::NatGateway', 1)
+    template.resource_count_is('AWS::EC2::Subnet', 6)
+    subnet_masks = sorted(
+        subnet['Properties']['CidrBlock'].split('/')[1]
+        for subnet in template.find_resources('AWS::EC2::Subnet').values()
+    )
+    assert subnet_masks == [ '20', '20', '20', '28', '28', '28' ], \
+        'Unexpected subnet masks for configured VPC topology'
+
+
+def test_vpc_topology_nat_instances(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_nat_instances)
+
+    app = cdk.App()
+    vpc_stack = VpcStack(
+        app,
+        'Dev-VpcStackForTests',
+        target_environment=DEV,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(vpc_stack)
+    template.resource_count_is('AWS::EC2::NatGateway', 0)
+    template.resource_count_is('AWS::EC2::Instance', 3)
+    template.all_resources_properties('AWS::EC2::Instance', {
+        'Monitoring': True,
+        'BlockDeviceMappings': [ { 'DeviceName': '/dev/xvda', 'Ebs': { 'Encrypted': True } } ],
+    })
+
+
+def test_vpc_topology_isolated_subnets_exports_all_azs(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_isolated_subnets)
+
+    app = cdk.App()
+    vpc_stack = VpcStack(
+        app,
+        'Dev-VpcStackForTests',
+        target_environment=DEV,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(vpc_stack)
+    template.resource_count_is('AWS::EC2::Subnet', 3)
+    template.resource_count_is('AWS::EC2::InternetGateway', 0)
+    template.resource_count_is('AWS::EC2::NatGateway', 0)
+
+    export_names = [ output['Export']['Name'] for output in template.find_outputs('*').values() ]
+    for output_name in [ 'AvailabilityZone', 'SubnetId', 'RouteTable' ]:
+        assert sorted(name for name in export_names if output_name in name) == \
+            [ f'{DEV}{output_name}1', f'{DEV}{output_name}2', f'{DEV}{output_name}3' ], \
+            f'Unexpected CF outputs for {output_name} with 3 availability zones'
+
+
+def test_error_when_region_has_less_azs_than_topology(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_four_azs)
+
+    app = cdk.App()
+
+    with pytest.raises(RuntimeError) as e_info:
+        VpcStack(
+            app,
+            'Dev-VpcStackForTests',
+            target_environment=DEV,
+            env=cdk.Environment(
+                account=mock_account_id,
+                region=mock_region
+            )
+        )
+
+    assert e_info.match('less than 4'), \
+        'Expected Runtime Error for too few availability zones not raised'
+
+
+def test_vpc_endpoint_catalog_and_policies(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_endpoint_catalog)
+
+    app = cdk.App()
+    vpc_stack = VpcStack(
+        app,
+        'Dev-VpcStackForTests',
+        target_environment=DEV,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(vpc_stack)
+    template.resource_count_is('AWS::EC2::VPCEndpoint', len(VPC_ETL_INTERFACE_ENDPOINTS) + 2)
+    for action in [ 's3:GetObject', 'sqs:SendMessage' ]:
+        template.has_resource_properties('AWS::EC2::VPCEndpoint', {
+            'PolicyDocument': {
+                'Statement': [ Match.object_like({ 'Action': action }) ],
+            },
+        })
+
+
+def test_error_when_endpoint_policy_has_no_endpoint(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_bad_endpoint_policy)
+
+    app = cdk.App()
+
+    with pytest.raises(AttributeError) as e_info:
+        VpcStack(
+            app,
+            'Dev-VpcStackForTests',
+            target_environment=DEV,
+            env=cdk.Environment(
+                account=mock_account_id,
+                region=mock_region
+            )
+        )
+
+    assert e_info.match('does not match a VPC endpoint'), \
+        'Expected Attribute Error for endpoint policy without endpoint not raised'
+
+
+def test_s3_interface_endpoint_with_private_dns(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration',
+        mock_get_local_configuration_with_s3_interface_endpoint)
+
+    app = cdk.App()
+    vpc_stack = VpcStack(
+        app,
+        'Dev-VpcStackForTests',
+        target_environment=DEV,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(vpc_stack)
+    template.resource_count_is('AWS::EC2::VPCEndpoint', 8)
+    template.has_resource_properties('AWS::EC2::VPCEndpoint', {
+        'VpcEndpointType': 'Interface',
+        'ServiceName': f'com.amazonaws.{mock_region}.s3',
+        'PrivateDnsEnabled': True,
+        'DnsOptions': { 'PrivateDnsOnlyForInboundResolverEndpoint': 'OnlyInboundResolver' },
+    })
+    template.has_resource_properties('AWS::EC2::SecurityGroup', {
+        'SecurityGroupIngress': Match.array_with([
+            Match.object_like({ 'CidrIp': '192.168.0.0/16', 'FromPort': 443 }),
+        ]),
+    })
+
+    export_names = [ output['Export']['Name'] for output in template.find_outputs('*').values() ]
+    for export_name in [ 'S3InterfaceEndpointId', 'S3InterfaceEndpointDnsName', 'S3InterfaceEndpointDnsEntries' ]:
+        assert f'{DEV}{export_name}' in export_names, f'Missing CF output {export_name}'
+
+    dns_name_output = [ output for output in template.find_outputs('*').values()
+        if output['Export']['Name'] == f'{DEV}S3InterfaceEndpointDnsName' ][0]
+    assert dns_name_output['Value']['Fn::Select'][0] == 1 \
+        and dns_name_output['Value']['Fn::Select'][1]['Fn::Split'][0] == '*.', \
+        'Expected the wildcard label to be removed from the S3 interface endpoint DNS name'
+
+
+def test_endpoint_hub_spoke_uses_hub_endpoints(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_endpoint_hub_spoke)
+
+    app = cdk.App()
+    vpc_stack = VpcStack(
+        app,
+        'Dev-VpcStackForTests',
+        target_environment=DEV,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(vpc_stack)
+    # Only the gateway endpoints remain in the spoke VPC
+    template.resource_count_is('AWS::EC2::VPCEndpoint', 2)
+    template.resource_count_is('AWS::EC2::TransitGatewayAttachment', 1)
+    template.resource_count_is('AWS::Route53Profiles::ProfileAssociation', 1)
+    template.has_resource_properties('AWS::EC2::Route', {
+        'DestinationCidrBlock': '10.255.0.0/24',
+        'TransitGatewayId': 'tgw-0123456789abcdef0',
+    })
+    assert len(template.find_resources('AWS::EC2::Route', {
+        'Properties': { 'TransitGatewayId': 'tgw-0123456789abcdef0' },
+    })) == 3, 'Expected a route to the endpoint hub from each private subnet'
+
+    export_names = [ output['Export']['Name'] for output in template.find_outputs('*').values() ]
+    for export_name in [ 'VpcId', 'SubnetId1', 'SubnetId3', 'SharedSecurityGroupId' ]:
+        assert f'{DEV}{export_name}' in export_names, f'Missing CF output {export_name} in spoke mode'
+
+
+def test_vpc_dual_stack_ipv6_egress_and_exports(monkeypatch):
+    monkeypatch.setattr(configuration.boto3, 'client', mock_boto3_client)
+    monkeypatch.setattr(configuration, 'get_local_configuration', mock_get_local_configuration_with_dual_stack)
+
+    app = cdk.App()
+    vpc_stack = VpcStack(
+        app,
+        'Dev-VpcStackForTests',
+        target_environment=DEV,
+        env=cdk.Environment(
+            account=mock_account_id,
+            region=mock_region
+        )
+    )
+
+    template = Template.from_stack(vpc_stack)
+    template.has_resource_properties('AWS::EC2::VPCCidrBlock', { 'AmazonProvidedIpv6CidrBlock': True })
+    template.resource_count_is('AWS::EC2::EgressOnlyInternetGateway', 1)
+    template.all_resources_properties('AWS::EC2::Subnet', { 'AssignIpv6AddressOnCreation': True })
+    assert len(template.find_resources('AWS::EC2::Route', {
+        'Properties': {
+            'DestinationIpv6CidrBlock': '::/0',
+            'EgressOnlyInternetGatewayId': Match.any_value(),
+        },
+    })) == 3, 'Expected an egress-only internet gateway route from each private subnet'
+    template.has_resource_properties('AWS::EC2::SecurityGroup', {
+        'SecurityGroupEgress': Match.array_with([ Match.object_like({ 'CidrIpv6': '::/0' }) ]),
+    })
+
+    export_names = [ output['Export']['Name'] for output in template.find_outputs('*').values() ]
+    for export_name in [ 'VpcIpv6Cidr', 'SubnetIpv6Cidr1', 'SubnetIpv6Cidr2', 'SubnetIpv6Cidr3' ]:
+        assert f'{DEV}{export_name}' in export_names, f'Missing CF output {export_name} for dual stack VPC'
\ No newline at end of file